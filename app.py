@@ -1,8 +1,30 @@
+import os
+import tempfile
+import time
+import uuid
+
+import pandas as pd
 import streamlit as st
 import plotly.express as px
 
-# Importar la función de procesamiento de datos desde el módulo src
-from src.data_processing import load_and_preprocess_data
+# Importar la carga de datos procesados (con caché persistente) desde el módulo src
+from src.aggregations import AggregateCache
+from src.artifacts import load_cube, load_dataset, load_histograms, read_manifest
+from src.cache import file_fingerprint, load_processed_data
+from src.charts import downsample_scatter, histogram_bins
+from src.config import load_config, preprocessing_options
+from src.data_processing import CONDITION_MAP
+from src.diagnostics import SessionProfile, cache_report, column_memory
+from src.export import EXPORT_FORMATS, write_export
+from src.filters import FilterIndex
+from src.instrumentation import JsonLinesHook, StageRecorder, combine_hooks, timed
+from src.pricing import PRICE_QUANTILES, PriceEstimator
+from src.sections import SectionCache
+from src.shared import shared_dataset
+from src.table import TableView
+from src.timeseries import TimeSeriesStore
+from src.warmup import (SNAPSHOT_FILE, BackgroundLoader, build_snapshot, failed_load, read_snapshot, summary_metrics,
+                        write_snapshot)
 
 # --- Configuración de la Página ---
 st.set_page_config(
@@ -35,14 +57,204 @@ st.markdown("""
     </style>
 """, unsafe_allow_html=True)
 
+# --- Configuración del Dashboard ---
+config = load_config()
+HISTOGRAM_BINS = config.getint('dashboard', 'histogram_bins', fallback=50)
+MAX_SCATTER_POINTS = config.getint('dashboard', 'max_scatter_points', fallback=5000)
+TABLE_PAGE_SIZE = config.getint('dashboard', 'table_page_size', fallback=50)
+# Anuncios comparables con los que se estima el precio en el modo "Estimación de Precio"
+PRICING_NEIGHBORS = config.getint('dashboard', 'pricing_neighbors', fallback=10)
+# En modo de sólo lectura los datos y agregados vienen de `vehicles-build`
+READ_ONLY = config.getboolean('dashboard', 'read_only', fallback=False)
+RAW_DATA_PATH = config.get('files', 'raw_data', fallback='data/raw/vehicles_us.csv')
+PROCESSED_DIR = config.get('files', 'processed_data', fallback='data/processed')
+ARTIFACTS_DIR = config.get('files', 'artifacts_dir', fallback='data/processed/artifacts')
+# Directorio donde se publican los datos para todos los procesos del servidor
+SHARED_DIR = config.get('files', 'shared_data', fallback='data/processed/shared')
+# Resumen que se muestra mientras los datos completos se cargan en segundo plano
+SNAPSHOT_PATH = os.path.join(SHARED_DIR, SNAPSHOT_FILE)
+LOADING_REFRESH_SECONDS = config.getfloat('dashboard', 'loading_refresh_seconds', fallback=0.5)
+PREPROCESSING_OPTIONS = preprocessing_options(config)
+# Panel con los tiempos y la memoria de cada etapa del preprocesamiento
+DEBUG_PIPELINE = config.getboolean('dashboard', 'debug_pipeline', fallback=False)
+# Panel de diagnóstico (memoria, tiempos de cada sección y cachés) y log estructurado
+DIAGNOSTICS = config.getboolean('dashboard', 'diagnostics', fallback=False)
+DIAGNOSTICS_LOG = config.get('dashboard', 'diagnostics_log', fallback='')
+
+# Fragmentos de Streamlit (>= 1.33): los controles de una sección sólo vuelven a
+# ejecutar esa sección; en versiones anteriores se ejecuta la página completa
+fragment = getattr(st, 'fragment', None) or getattr(st, 'experimental_fragment', None) or (lambda func: func)
+rerun = getattr(st, 'rerun', None) or st.experimental_rerun
+
+# Granularidades del modo "Tendencias Temporales" con el nombre de su periodo
+TEMPORAL_GRANULARITIES = {'month': 'Mes', 'week': 'Semana', 'day': 'Día'}
+
+# Etiquetas de los formatos de exportación
+EXPORT_LABELS = {
+    'csv': 'CSV',
+    'csv.gz': 'CSV comprimido (gzip)',
+    'xlsx': 'Excel',
+    'parquet': 'Parquet',
+}
+
 # --- Carga de Datos ---
-@st.cache_data(show_spinner=True)
-def cached_load_data():
-    with st.spinner('Cargando datos... Por favor espere.'):
-        file_path = "data/raw/vehicles_us.csv"
-        return load_and_preprocess_data(file_path)
+def load_data(hook=None):
+    if READ_ONLY:
+        return load_dataset(ARTIFACTS_DIR)
+    recorder = StageRecorder() if DEBUG_PIPELINE else None
+    data = load_processed_data(RAW_DATA_PATH, cache_dir=PROCESSED_DIR, hook=combine_hooks(hook, recorder),
+                               **PREPROCESSING_OPTIONS)
+    if recorder is not None:
+        data.attrs['pipeline_stages'] = recorder.events
+    return data
+
+def load_shared_data(hook=None):
+    # Una única copia de sólo lectura, mapeada desde el archivo compartido por todos los procesos
+    if READ_ONLY:
+        version = read_manifest(ARTIFACTS_DIR)['data_version']
+    else:
+        version = file_fingerprint(RAW_DATA_PATH, PREPROCESSING_OPTIONS)
+    return shared_dataset(SHARED_DIR, version, lambda: load_data(hook))
+
+def warm_aggregates(data):
+    # Cubo de agregados con los resúmenes de la vista completa ya calculados
+    if READ_ONLY:
+        aggregates = AggregateCache.from_cube(load_cube(ARTIFACTS_DIR), version=data.attrs.get('data_version'))
+    else:
+        aggregates = AggregateCache(data)
+    year_range = (int(data['model_year'].min()), int(data['model_year'].max()))
+    conditions = sorted(data['condition'].dropna().unique())
+    aggregates.manufacturer_stats(year_range, conditions)
+    return aggregates
+
+def save_snapshot(data):
+    return write_snapshot(build_snapshot(data, nbins=HISTOGRAM_BINS), SNAPSHOT_PATH)
+
+@st.cache_resource
+def cached_loader():
+    # Carga y calentamiento de las cachés en un hilo, una vez por proceso del servidor
+    return BackgroundLoader([
+        ('data', lambda results, hook: load_shared_data(hook)),
+        ('filter_index', lambda results, hook: FilterIndex(results['data'])),
+        ('aggregates', lambda results, hook: warm_aggregates(results['data'])),
+        ('timeseries', lambda results, hook: TimeSeriesStore(results['data'])),
+        ('table_view', lambda results, hook: TableView(results['data'])),
+        ('snapshot', lambda results, hook: save_snapshot(results['data'])),
+    ]).start()
+
+@st.cache_resource
+def cached_estimator(version, _data):
+    # Se construye la primera vez que se abre el modo "Estimación de Precio", una vez por versión
+    return PriceEstimator(_data, k=PRICING_NEIGHBORS, version=version)
+
+@st.cache_resource
+def cached_histograms(version):
+    # Histogramas del conjunto completo guardados por `vehicles-build`, por columna
+    return {column: bins.drop(columns='column').reset_index(drop=True)
+            for column, bins in load_histograms(ARTIFACTS_DIR).groupby('column')}
+
+@st.cache_resource
+def cached_sections():
+    # Resultados de cada sección, guardados por sus propias entradas y compartidos entre sesiones
+    return SectionCache()
+
+# Nombres de los pasos de la carga en la barra de progreso
+LOADING_STEPS = {
+    'data': 'Cargando y preprocesando los datos',
+    'filter_index': 'Construyendo el índice de filtros',
+    'aggregates': 'Calculando los agregados',
+    'timeseries': 'Calculando las series temporales',
+    'table_view': 'Preparando la tabla de datos',
+    'snapshot': 'Guardando el resumen',
+}
 
-car_data = cached_load_data()
+def render_metric_cards(metrics):
+    col_metrics = st.columns(4)
+    with col_metrics[0]:
+        st.markdown("""
+            <div class='metric-card'>
+                <h3 style='margin: 0; color: #1976D2;'>💰 Precio Promedio</h3>
+                <h2 style='margin: 0.5rem 0;'>${:,.0f}</h2>
+            </div>
+        """.format(metrics['price_mean']), unsafe_allow_html=True)
+
+    with col_metrics[1]:
+        st.markdown("""
+            <div class='metric-card'>
+                <h3 style='margin: 0; color: #388E3C;'>📏 Kilometraje Medio</h3>
+                <h2 style='margin: 0.5rem 0;'>{:,.0f} mi</h2>
+            </div>
+        """.format(metrics['odometer_mean']), unsafe_allow_html=True)
+
+    with col_metrics[2]:
+        st.markdown("""
+            <div class='metric-card'>
+                <h3 style='margin: 0; color: #E64A19;'>📅 Año Promedio</h3>
+                <h2 style='margin: 0.5rem 0;'>{:.1f}</h2>
+            </div>
+        """.format(metrics['model_year_mean']), unsafe_allow_html=True)
+
+    with col_metrics[3]:
+        st.markdown("""
+            <div class='metric-card'>
+                <h3 style='margin: 0; color: #7B1FA2;'>🚘 Condición Común</h3>
+                <h2 style='margin: 0.5rem 0;'>{}</h2>
+            </div>
+        """.format(metrics['condition'].title()), unsafe_allow_html=True)
+
+def render_loading(loader):
+    # Primera pintura: el resumen precalculado y el avance, sin esperar a los datos completos
+    st.title("🚗 Análisis del Mercado de Vehículos USA")
+    progress = loader.progress()
+    step = LOADING_STEPS.get(progress['current'], progress['current'] or 'Terminando')
+    st.progress(progress['fraction'], text="{} ({}/{} · {:.1f} s)".format(
+        step, progress['completed'], progress['total'], progress['elapsed']))
+    finished = [event for event in progress['events'] if event['stage'] != event['step']]
+    if finished:
+        st.caption(" · ".join("{} {:.2f} s".format(event['stage'], event['seconds']) for event in finished))
+
+    snapshot = read_snapshot(SNAPSHOT_PATH)
+    if snapshot is None:
+        st.info("Cargando los datos por primera vez; el resumen estará disponible en las siguientes visitas.")
+        return
+    st.caption("Resumen del conjunto completo calculado el {} · {:,} anuncios. "
+               "Los filtros estarán disponibles al terminar la carga.".format(
+                   snapshot['created_at'], snapshot['metrics']['rows']))
+    render_metric_cards(snapshot['metrics'])
+    col1, col2 = st.columns(2)
+    for column, container, color, label in [('odometer', col1, '#1976D2', "Kilometraje (millas)"),
+                                            ('price', col2, '#388E3C', "price")]:
+        bins = snapshot['histograms'].get(column)
+        if bins is None:
+            continue
+        fig = px.bar(bins, x="bin_center", y="count", labels={"bin_center": label},
+                     color_discrete_sequence=[color])
+        fig.update_traces(width=bins['bin_end'] - bins['bin_start'])
+        fig.update_layout(bargap=0, plot_bgcolor='white', paper_bgcolor='white',
+                          margin=dict(t=20, l=20, r=20, b=20))
+        container.plotly_chart(fig, use_container_width=True)
+
+loader = cached_loader()
+if not loader.done:
+    render_loading(loader)
+    time.sleep(LOADING_REFRESH_SECONDS)
+    rerun()
+# Un cargador fallido se descarta para que la siguiente ejecución vuelva a intentarlo
+load_error = failed_load(loader, cached_loader.clear)
+if load_error is not None:
+    st.error("No se pudieron cargar los datos: {}".format(load_error))
+    if st.button("🔄 Reintentar"):
+        rerun()
+    st.stop()
+
+car_data = loader.result('data')
+filter_index = loader.result('filter_index')
+table_view = loader.result('table_view')
+aggregates = loader.result('aggregates')
+timeseries = loader.result('timeseries')
+sections = cached_sections()
+# Reconstruir el cubo si la versión de los datos cambió
+aggregates.refresh(car_data)
 
 # --- Barra Lateral de Controles ---
 with st.sidebar:
@@ -53,7 +265,7 @@ with st.sidebar:
     # Agregar selector de modo de análisis
     analysis_mode = st.radio(
         "📊 Modo de Análisis",
-        ["General", "Por Fabricante", "Tendencias Temporales"]
+        ["General", "Por Fabricante", "Tendencias Temporales", "Estimación de Precio"]
     )
 
 # Filtro por año del modelo
@@ -98,13 +310,64 @@ show_odo_hist = st.sidebar.checkbox('Histograma de odómetro', value=True)
 show_price_hist = st.sidebar.checkbox('Histograma de precios')
 show_scatter = st.sidebar.checkbox('Dispersión: Precio vs Odómetro', value=True)
 
+if DEBUG_PIPELINE:
+    with st.sidebar.expander("⏱️ Etapas del preprocesamiento"):
+        stages = car_data.attrs.get('pipeline_stages')
+        if stages:
+            stage_table = pd.DataFrame(stages).set_index('stage')
+            stage_table['memory_delta'] = (stage_table['memory_delta'] / 2 ** 20).round(1)
+            st.dataframe(
+                stage_table[['seconds', 'rows_in', 'rows_out', 'memory_delta']].rename(columns={
+                    'seconds': 'Segundos', 'rows_in': 'Filas entrada',
+                    'rows_out': 'Filas salida', 'memory_delta': 'Δ memoria (MB)',
+                })
+            )
+        else:
+            st.caption("Sin etapas registradas (datos de los artefactos precalculados).")
+
+# Mediciones de esta ejecución; sin diagnóstico `timed(None, ...)` no mide nada
+def start_profile(**context):
+    # Cada ejecución de la página o de un fragmento tiene su propio perfil y número de ejecución
+    if not DIAGNOSTICS:
+        return None
+    if DIAGNOSTICS_LOG:
+        os.makedirs(os.path.dirname(DIAGNOSTICS_LOG) or '.', exist_ok=True)
+    st.session_state.setdefault('diagnostics_session', uuid.uuid4().hex)
+    st.session_state['diagnostics_run'] = st.session_state.get('diagnostics_run', 0) + 1
+    return SessionProfile(
+        JsonLinesHook(DIAGNOSTICS_LOG) if DIAGNOSTICS_LOG else None,
+        session=st.session_state['diagnostics_session'],
+        run=st.session_state['diagnostics_run'],
+        **context
+    )
+
+profile = start_profile(mode=analysis_mode)
+
 # --- Filtrado de Datos ---
-# Aplicar los filtros seleccionados en la barra lateral
-filtered_data = car_data[
-    (car_data['model_year'] >= selected_year_range[0]) &
-    (car_data['model_year'] <= selected_year_range[1]) &
-    (car_data['condition'].isin(selected_conditions))
-]
+# Aplicar los filtros seleccionados en la barra lateral usando el índice precalculado
+# La selección guarda posiciones y sólo consulta el índice si alguna sección la necesita;
+# cada gráfico extrae sólo las columnas que usa
+filtered_data = filter_index.selection(
+    car_data,
+    year_range=selected_year_range,
+    conditions=selected_conditions
+)
+# Entradas comunes de las secciones que dependen de los filtros de la barra lateral
+filter_inputs = (car_data.attrs.get('data_version'), tuple(selected_year_range), tuple(selected_conditions))
+
+with timed(profile, 'metrics', kind='filter'):
+    metrics = sections.get('metrics', filter_inputs, lambda: summary_metrics(filtered_data))
+
+def distribution_bins(column):
+    # Sin filtros, en modo de sólo lectura, se usan los histogramas precalculados de los artefactos
+    if READ_ONLY and metrics['rows'] == len(car_data):
+        bins = cached_histograms(car_data.attrs.get('data_version')).get(column)
+        if bins is not None and len(bins) == HISTOGRAM_BINS:
+            return bins
+    return sections.get(
+        '{}_histogram'.format(column), filter_inputs + (HISTOGRAM_BINS,),
+        lambda: histogram_bins(filtered_data.column(column), nbins=HISTOGRAM_BINS)
+    )
 
 # --- Página Principal ---
 st.title("🚗 Análisis del Mercado de Vehículos USA")
@@ -116,49 +379,23 @@ st.markdown("""
             según los filtros seleccionados
         </p>
     </div>
-""".format(len(filtered_data), len(car_data)), unsafe_allow_html=True)
+""".format(metrics['rows'], len(car_data)), unsafe_allow_html=True)
 
 # --- Métricas Clave ---
-col_metrics = st.columns(4)
-with col_metrics[0]:
-    st.markdown("""
-        <div class='metric-card'>
-            <h3 style='margin: 0; color: #1976D2;'>💰 Precio Promedio</h3>
-            <h2 style='margin: 0.5rem 0;'>${:,.0f}</h2>
-        </div>
-    """.format(filtered_data['price'].mean()), unsafe_allow_html=True)
-
-with col_metrics[1]:
-    st.markdown("""
-        <div class='metric-card'>
-            <h3 style='margin: 0; color: #388E3C;'>📏 Kilometraje Medio</h3>
-            <h2 style='margin: 0.5rem 0;'>{:,.0f} mi</h2>
-        </div>
-    """.format(filtered_data['odometer'].mean()), unsafe_allow_html=True)
-
-with col_metrics[2]:
-    st.markdown("""
-        <div class='metric-card'>
-            <h3 style='margin: 0; color: #E64A19;'>📅 Año Promedio</h3>
-            <h2 style='margin: 0.5rem 0;'>{:.1f}</h2>
-        </div>
-    """.format(filtered_data['model_year'].mean()), unsafe_allow_html=True)
-
-with col_metrics[3]:
-    most_common_condition = filtered_data['condition'].mode()[0]
-    st.markdown("""
-        <div class='metric-card'>
-            <h3 style='margin: 0; color: #7B1FA2;'>🚘 Condición Común</h3>
-            <h2 style='margin: 0.5rem 0;'>{}</h2>
-        </div>
-    """.format(most_common_condition.title()), unsafe_allow_html=True)
+render_metric_cards(metrics)
 
 st.markdown("---")
 
 # --- Visualizaciones ---
-tab1, tab2 = st.tabs(["📊 Distribuciones", "🔄 Correlaciones"])
+# Sólo se calcula y dibuja la sección elegida (a diferencia de `st.tabs`, que ejecuta todas)
+visual_section = st.radio(
+    "Sección",
+    ["📊 Distribuciones", "🔄 Correlaciones"],
+    horizontal=True,
+    label_visibility="collapsed"
+)
 
-with tab1:
+if visual_section == "📊 Distribuciones":
     col1, col2 = st.columns(2)
     
     with col1:
@@ -167,14 +404,20 @@ with tab1:
                 <div style='background-color: white; padding: 1rem; border-radius: 0.5rem; box-shadow: 0 2px 4px rgba(0,0,0,0.1);'>
                     <h3 style='color: #1976D2; margin-bottom: 1rem;'>📏 Distribución del Kilometraje</h3>
             """, unsafe_allow_html=True)
-            fig_odo = px.histogram(filtered_data, x="odometer", nbins=50,
-                                labels={"odometer": "Kilometraje (millas)"},
-                                color_discrete_sequence=['#1976D2'])
-            fig_odo.update_layout(
-                plot_bgcolor='white',
-                paper_bgcolor='white',
-                margin=dict(t=20, l=20, r=20, b=20)
-            )
+            # Los intervalos se calculan en el servidor; sólo se envían los conteos
+            with timed(profile, 'odometer_histogram', kind='aggregate'):
+                odo_bins = distribution_bins('odometer')
+            with timed(profile, 'fig_odo', kind='chart'):
+                fig_odo = px.bar(odo_bins, x="bin_center", y="count",
+                                    labels={"bin_center": "Kilometraje (millas)"},
+                                    color_discrete_sequence=['#1976D2'])
+                fig_odo.update_traces(width=odo_bins['bin_end'] - odo_bins['bin_start'])
+                fig_odo.update_layout(
+                    bargap=0,
+                    plot_bgcolor='white',
+                    paper_bgcolor='white',
+                    margin=dict(t=20, l=20, r=20, b=20)
+                )
             st.plotly_chart(fig_odo, use_container_width=True)
             st.markdown("</div>", unsafe_allow_html=True)
 
@@ -184,43 +427,61 @@ with tab1:
                 <div style='background-color: white; padding: 1rem; border-radius: 0.5rem; box-shadow: 0 2px 4px rgba(0,0,0,0.1);'>
                     <h3 style='color: #388E3C; margin-bottom: 1rem;'>💰 Distribución de Precios</h3>
             """, unsafe_allow_html=True)
-            fig_price = px.histogram(filtered_data, x="price", nbins=50,
-                                color_discrete_sequence=['#388E3C'])
-            fig_price.update_layout(
-                xaxis=dict(range=[0, 50000]),
-                plot_bgcolor='white',
-                paper_bgcolor='white',
-                margin=dict(t=20, l=20, r=20, b=20)
-            )
+            with timed(profile, 'price_histogram', kind='aggregate'):
+                price_bins = distribution_bins('price')
+            with timed(profile, 'fig_price', kind='chart'):
+                fig_price = px.bar(price_bins, x="bin_center", y="count",
+                                    labels={"bin_center": "price"},
+                                    color_discrete_sequence=['#388E3C'])
+                fig_price.update_traces(width=price_bins['bin_end'] - price_bins['bin_start'])
+                fig_price.update_layout(
+                    bargap=0,
+                    xaxis=dict(range=[0, 50000]),
+                    plot_bgcolor='white',
+                    paper_bgcolor='white',
+                    margin=dict(t=20, l=20, r=20, b=20)
+                )
             st.plotly_chart(fig_price, use_container_width=True)
             st.markdown("</div>", unsafe_allow_html=True)
 
-with tab2:
+else:
     if show_scatter:
         st.markdown("""
             <div style='background-color: white; padding: 1rem; border-radius: 0.5rem; box-shadow: 0 2px 4px rgba(0,0,0,0.1);'>
                 <h3 style='color: #7B1FA2; margin-bottom: 1rem;'>🔄 Relación Precio vs. Kilometraje</h3>
         """, unsafe_allow_html=True)
-        fig_scatter = px.scatter(filtered_data, 
-                             x="odometer", 
-                             y="price", 
-                             color="condition",
-                             labels={"odometer": "Kilometraje (millas)", 
-                                    "price": "Precio (USD)",
-                                    "condition": "Condición"},
-                             hover_data=["model", "model_year"])
-        fig_scatter.update_layout(
-            plot_bgcolor='white',
-            paper_bgcolor='white',
-            margin=dict(t=20, l=20, r=20, b=20),
-            legend=dict(
-                yanchor="top",
-                y=0.99,
-                xanchor="left",
-                x=0.01,
-                bgcolor='rgba(255, 255, 255, 0.8)'
+        # Reducir la nube de puntos al presupuesto conservando su densidad
+        with timed(profile, 'scatter', kind='aggregate'):
+            scatter_data = sections.get(
+                'scatter', filter_inputs + (MAX_SCATTER_POINTS,),
+                lambda: downsample_scatter(
+                    filtered_data.frame(["odometer", "price", "condition", "model", "model_year"]),
+                    x="odometer", y="price", max_points=MAX_SCATTER_POINTS
+                )
+            )
+        if len(scatter_data) < metrics['rows']:
+            st.caption(f"Mostrando una muestra representativa de {len(scatter_data):,} de {metrics['rows']:,} anuncios")
+        with timed(profile, 'fig_scatter', kind='chart'):
+            fig_scatter = px.scatter(scatter_data, 
+                                 x="odometer", 
+                                 y="price", 
+                                 color="condition",
+                                 labels={"odometer": "Kilometraje (millas)", 
+                                        "price": "Precio (USD)",
+                                        "condition": "Condición"},
+                                 hover_data=["model", "model_year"])
+            fig_scatter.update_layout(
+                plot_bgcolor='white',
+                paper_bgcolor='white',
+                margin=dict(t=20, l=20, r=20, b=20),
+                legend=dict(
+                    yanchor="top",
+                    y=0.99,
+                    xanchor="left",
+                    x=0.01,
+                    bgcolor='rgba(255, 255, 255, 0.8)'
+                )
             )
-        )
         st.plotly_chart(fig_scatter, use_container_width=True)
         st.markdown("</div>", unsafe_allow_html=True)
 
@@ -228,14 +489,9 @@ with tab2:
 if analysis_mode == "Por Fabricante":
     st.markdown("### 🏢 Análisis por Fabricante")
     
-    # Métricas por fabricante
-    manufacturer_stats = filtered_data.groupby('manufacturer').agg({
-        'price': ['mean', 'count'],
-        'condition_score': 'mean'
-    }).round(2)
-    
-    # Ordenar por cantidad de vehículos
-    manufacturer_stats = manufacturer_stats.sort_values(('price', 'count'), ascending=False)
+    # Métricas por fabricante (ordenadas por cantidad de vehículos) desde el cubo de agregados
+    with timed(profile, 'manufacturer_stats', kind='aggregate'):
+        manufacturer_stats = aggregates.manufacturer_stats(selected_year_range, selected_conditions)
     
     # Mostrar top fabricantes
     st.markdown("""
@@ -244,20 +500,21 @@ if analysis_mode == "Por Fabricante":
     """, unsafe_allow_html=True)
     
     # Gráfico de barras de cantidad por fabricante
-    fig_manufacturers = px.bar(
-        manufacturer_stats.head(10).reset_index(),
-        x='manufacturer',
-        y=('price', 'count'),
-        title="Top 10 Fabricantes por Cantidad de Vehículos",
-        labels={'manufacturer': 'Fabricante', 'value': 'Cantidad de Vehículos'},
-        color=('price', 'mean'),
-        color_continuous_scale='Viridis'
-    )
-    fig_manufacturers.update_layout(
-        plot_bgcolor='white',
-        paper_bgcolor='white',
-        margin=dict(t=50, l=20, r=20, b=20)
-    )
+    with timed(profile, 'fig_manufacturers', kind='chart'):
+        fig_manufacturers = px.bar(
+            manufacturer_stats.head(10).reset_index(),
+            x='manufacturer',
+            y=('price', 'count'),
+            title="Top 10 Fabricantes por Cantidad de Vehículos",
+            labels={'manufacturer': 'Fabricante', 'value': 'Cantidad de Vehículos'},
+            color=('price', 'mean'),
+            color_continuous_scale='Viridis'
+        )
+        fig_manufacturers.update_layout(
+            plot_bgcolor='white',
+            paper_bgcolor='white',
+            margin=dict(t=50, l=20, r=20, b=20)
+        )
     st.plotly_chart(fig_manufacturers, use_container_width=True)
     
     # Tabla de estadísticas por fabricante
@@ -268,17 +525,15 @@ if analysis_mode == "Por Fabricante":
 elif analysis_mode == "Tendencias Temporales":
     st.markdown("### 📅 Análisis Temporal")
     
-    # Preparar datos temporales
-    temporal_data = filtered_data.copy()
-    temporal_data['year_month'] = temporal_data['date_posted'].dt.to_period('M')
-    temporal_stats = temporal_data.groupby('year_month').agg({
-        'price': ['mean', 'count'],
-        'condition_score': 'mean'
-    }).reset_index()
-    temporal_stats['year_month'] = temporal_stats['year_month'].astype(str)
-    
-    # Renombrar columnas para facilitar el uso
-    temporal_stats.columns = ['year_month', 'price_mean', 'price_count', 'condition_score']
+    # Series precalculadas por día, semana y mes (period, price_mean, price_count, condition_score)
+    granularity = st.radio(
+        "Agrupar por:",
+        list(TEMPORAL_GRANULARITIES),
+        format_func=TEMPORAL_GRANULARITIES.get,
+        horizontal=True
+    )
+    with timed(profile, 'temporal_trend', kind='aggregate'):
+        temporal_stats = timeseries.trend(granularity, selected_year_range, selected_conditions)
     
     # Gráfico de línea temporal
     st.markdown("""
@@ -286,45 +541,122 @@ elif analysis_mode == "Tendencias Temporales":
             <h3 style='color: #1976D2; margin-bottom: 1rem;'>📈 Evolución Temporal</h3>
     """, unsafe_allow_html=True)
     
-    fig_temporal = px.line(
-        temporal_stats,
-        x='year_month',
-        y='price_mean',
-        title="Evolución del Precio Medio",
-        labels={
-            'year_month': 'Fecha',
-            'price_mean': 'Precio Medio ($)'
-        }
-    )
-    fig_temporal.update_layout(
-        plot_bgcolor='white',
-        paper_bgcolor='white',
-        margin=dict(t=50, l=20, r=20, b=20)
-    )
+    with timed(profile, 'fig_temporal', kind='chart'):
+        fig_temporal = px.line(
+            temporal_stats,
+            x='period',
+            y='price_mean',
+            title="Evolución del Precio Medio",
+            labels={
+                'period': 'Fecha',
+                'price_mean': 'Precio Medio ($)'
+            }
+        )
+        fig_temporal.update_layout(
+            plot_bgcolor='white',
+            paper_bgcolor='white',
+            margin=dict(t=50, l=20, r=20, b=20)
+        )
     st.plotly_chart(fig_temporal, use_container_width=True)
     
     # Gráfico de volumen de ventas
-    fig_volume = px.bar(
-        temporal_stats,
-        x='year_month',
-        y='price_count',
-        title="Volumen de Anuncios por Mes",
-        labels={
-            'year_month': 'Fecha',
-            'price_count': 'Cantidad de Anuncios'
-        }
+    with timed(profile, 'fig_volume', kind='chart'):
+        fig_volume = px.bar(
+            temporal_stats,
+            x='period',
+            y='price_count',
+            title="Volumen de Anuncios por {}".format(TEMPORAL_GRANULARITIES[granularity]),
+            labels={
+                'period': 'Fecha',
+                'price_count': 'Cantidad de Anuncios'
+            }
+        )
+        fig_volume.update_layout(
+            plot_bgcolor='white',
+            paper_bgcolor='white',
+            margin=dict(t=50, l=20, r=20, b=20)
+        )
+    st.plotly_chart(fig_volume, use_container_width=True)
+    st.markdown("</div>", unsafe_allow_html=True)
+
+elif analysis_mode == "Estimación de Precio":
+    st.markdown("### 💲 Estimación de Precio")
+    estimator = cached_estimator(car_data.attrs.get('data_version'), car_data)
+    
+    # Descripción del anuncio a valorar
+    st.markdown("""
+        <div style='background-color: white; padding: 1rem; border-radius: 0.5rem; box-shadow: 0 2px 4px rgba(0,0,0,0.1);'>
+            <h3 style='color: #1976D2; margin-bottom: 1rem;'>🚘 Datos del Vehículo</h3>
+    """, unsafe_allow_html=True)
+    col_listing1, col_listing2, col_listing3 = st.columns(3)
+    with col_listing1:
+        listing_manufacturer = st.selectbox("Fabricante", sorted(car_data['manufacturer'].dropna().unique()))
+        listing_type = st.selectbox("Tipo", sorted(car_data['type'].dropna().unique()))
+    with col_listing2:
+        listing_year = st.number_input("Año del modelo", min_value=min_year, max_value=max_year,
+                                       value=int(car_data['model_year'].median()), step=1)
+        listing_odometer = st.number_input("Kilometraje (millas)", min_value=0,
+                                           value=int(car_data['odometer'].median()), step=1000)
+    with col_listing3:
+        listing_condition = st.selectbox("Condición", list(CONDITION_MAP), index=list(CONDITION_MAP).index('good'))
+        listing_cylinders = st.selectbox("Cilindros", sorted(int(value) for value in car_data['cylinders'].unique()))
+        listing_4wd = st.checkbox("Tracción 4x4")
+    listing = {
+        'manufacturer': listing_manufacturer,
+        'type': listing_type,
+        'model_year': listing_year,
+        'odometer': listing_odometer,
+        'condition': listing_condition,
+        'cylinders': listing_cylinders,
+        'is_4wd': listing_4wd,
+    }
+    
+    # Precio estimado: mediana y rango intercuartílico del precio de los comparables
+    with timed(profile, 'price_estimate', kind='aggregate'):
+        estimate = estimator.predict(pd.DataFrame([listing])).iloc[0]
+    col_price1, col_price2, col_price3 = st.columns(3)
+    col_price1.metric("💰 Precio Estimado", "${:,.0f}".format(estimate['price_estimate']))
+    col_price2.metric("⬇️ Rango Bajo (P25)", "${:,.0f}".format(estimate['price_low']))
+    col_price3.metric("⬆️ Rango Alto (P75)", "${:,.0f}".format(estimate['price_high']))
+    
+    # Anuncios comparables (mismo fabricante y tipo, los más parecidos primero)
+    st.markdown("#### 🔎 Anuncios Comparables")
+    with timed(profile, 'comparables', kind='aggregate'):
+        positions, distances = estimator.similar(listing)
+    st.dataframe(
+        car_data.take(positions)[
+            ['model', 'model_year', 'odometer', 'condition', 'cylinders', 'is_4wd', 'type', 'price']
+        ].assign(distance=distances.round(3))
     )
-    fig_volume.update_layout(
-        plot_bgcolor='white',
-        paper_bgcolor='white',
-        margin=dict(t=50, l=20, r=20, b=20)
+    
+    # Valoración por lotes de un CSV con las mismas columnas
+    st.markdown("#### 📑 Valorar un Archivo de Anuncios")
+    uploaded_listings = st.file_uploader(
+        "CSV con manufacturer, type, model_year, odometer, condition, cylinders e is_4wd",
+        type=['csv']
     )
-    st.plotly_chart(fig_volume, use_container_width=True)
+    if uploaded_listings is not None:
+        listings = pd.read_csv(uploaded_listings)
+        # Un archivo ya valorado se vuelve a valorar: se sustituyen sus columnas de precio estimado
+        listings = listings.drop(columns=list(PRICE_QUANTILES), errors='ignore')
+        scored = listings.join(estimator.predict(listings).round(0))
+        st.dataframe(scored.head(TABLE_PAGE_SIZE))
+        st.caption("{:,} anuncios valorados".format(len(scored)))
+        st.download_button(
+            label="📥 Descargar valoración (CSV)",
+            data=scored.to_csv(index=False),
+            file_name="vehicles_priced.csv",
+            mime='text/csv'
+        )
     st.markdown("</div>", unsafe_allow_html=True)
 
 # --- Vista Previa de Datos Filtrados ---
-st.markdown("---")
-with st.expander("📋 Ver Datos Detallados"):
+# Sección perezosa: sólo se consulta, pagina y resume si está abierta. Es un fragmento,
+# así que la búsqueda, el precio, el orden y la página sólo vuelven a ejecutar esta sección
+@fragment
+def render_data_preview(year_range, conditions, price_bounds):
+    # El fragmento se puede volver a ejecutar sin la página, cuyo perfil ya está cerrado
+    preview_profile = start_profile(fragment='data_preview')
     st.markdown("""
         <div style='background-color: white; padding: 1rem; border-radius: 0.5rem; box-shadow: 0 2px 4px rgba(0,0,0,0.1);'>
             <h3 style='color: #1976D2; margin-bottom: 1rem;'>🔍 Datos Seleccionados</h3>
@@ -333,56 +665,137 @@ with st.expander("📋 Ver Datos Detallados"):
     # Agregar filtros de búsqueda
     search_col1, search_col2 = st.columns(2)
     with search_col1:
-        search_manufacturer = st.text_input("🔍 Buscar por fabricante")
+        search_text = st.text_input("🔍 Buscar por fabricante o modelo")
     with search_col2:
         price_range = st.slider(
             "💰 Rango de precios",
-            min_value=int(filtered_data['price'].min()),
-            max_value=int(filtered_data['price'].max()),
-            value=(int(filtered_data['price'].min()), int(filtered_data['price'].max()))
+            min_value=price_bounds[0],
+            max_value=price_bounds[1],
+            value=price_bounds
         )
     
-    # Aplicar filtros de búsqueda
-    display_data = filtered_data.copy()
-    if search_manufacturer:
-        display_data = display_data[display_data['manufacturer'].str.contains(search_manufacturer, case=False)]
-    display_data = display_data[
-        (display_data['price'] >= price_range[0]) &
-        (display_data['price'] <= price_range[1])
-    ]
+    # Aplicar filtros de búsqueda junto con los de la barra lateral en una sola consulta
+    display_filters = dict(
+        year_range=year_range,
+        conditions=conditions,
+        price_range=price_range,
+        search=search_text
+    )
+    with timed(preview_profile, 'preview_query', kind='filter'):
+        display_positions = filter_index.query(**display_filters)
+    # Clave de la consulta (con la versión de los datos) para la caché de resúmenes
+    display_key = (car_data.attrs.get('data_version'),) + tuple(
+        (name, tuple(value) if isinstance(value, (list, tuple)) else value)
+        for name, value in display_filters.items()
+    )
     
-    # Agregar botones de descarga
+    # Exportación bajo demanda: el archivo sólo se genera al pulsar el botón
     col_download1, col_download2 = st.columns(2)
     with col_download1:
-        csv = display_data.to_csv(index=False).encode('utf-8')
-        st.download_button(
-            label="📥 Descargar CSV",
-            data=csv,
-            file_name="vehicles_filtered.csv",
-            mime="text/csv"
+        export_format = st.selectbox(
+            "📦 Formato de exportación",
+            list(EXPORT_FORMATS),
+            format_func=lambda fmt: EXPORT_LABELS[fmt]
         )
     with col_download2:
-        # Crear un buffer de bytes para el archivo Excel
-        from io import BytesIO
-        excel_buffer = BytesIO()
-        display_data.to_excel(excel_buffer, index=False)
-        excel_buffer.seek(0)
-        
-        st.download_button(
-            label="📥 Descargar Excel",
-            data=excel_buffer,
-            file_name="vehicles_filtered.xlsx",
-            mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-        )
+        prepare_export = st.button("⚙️ Preparar descarga")
+    if prepare_export:
+        # Se escribe por bloques en un archivo temporal del disco, extrayendo las filas de cada
+        # bloque; `st.download_button` necesita el archivo completo en memoria para servirlo
+        try:
+            with tempfile.TemporaryFile() as export_file:
+                export_stats = write_export(car_data, export_format, export_file, positions=display_positions)
+                export_file.seek(0)
+                export_data = export_file.read()
+        except ValueError as error:
+            st.error(str(error))
+        else:
+            st.download_button(
+                label="📥 Descargar {}".format(EXPORT_LABELS[export_format]),
+                data=export_data,
+                file_name="vehicles_filtered.{}".format(EXPORT_FORMATS[export_format]['extension']),
+                mime=EXPORT_FORMATS[export_format]['mime']
+            )
+            st.caption("{:,} filas · {:,.1f} KB · {:,.1f} MB/s".format(
+                export_stats.rows,
+                export_stats.bytes_written / 1024,
+                export_stats.bytes_per_second / 1e6
+            ))
     
-    # Mostrar datos con formato mejorado
+    # Tabla paginada: sólo la página visible se ordena, colorea y envía al navegador
+    col_sort1, col_sort2, col_sort3 = st.columns(3)
+    with col_sort1:
+        sort_column = st.selectbox(
+            "↕️ Ordenar por",
+            ["(sin ordenar)"] + list(car_data.columns)
+        )
+    with col_sort2:
+        sort_ascending = st.radio("Sentido", ["Ascendente", "Descendente"], horizontal=True) == "Ascendente"
+    with col_sort3:
+        page_total = TableView.page_count(len(display_positions), TABLE_PAGE_SIZE)
+        page_number = st.number_input("📄 Página", min_value=1, max_value=page_total, value=1, step=1)
+    with timed(preview_profile, 'table_page', kind='table'):
+        page_data = table_view.page(
+            display_positions,
+            number=int(page_number) - 1,
+            page_size=TABLE_PAGE_SIZE,
+            sort_by=None if sort_column == "(sin ordenar)" else sort_column,
+            ascending=sort_ascending
+        )
+    # El degradado usa el rango de precios de toda la selección para que no cambie entre páginas
     st.dataframe(
-        display_data.style.background_gradient(subset=['price'], cmap='Greens'),
+        page_data.style.background_gradient(
+            subset=['price'], cmap='Greens', vmin=price_range[0], vmax=price_range[1]
+        ),
         height=300
     )
+    st.caption("Página {} de {} · {:,} filas".format(int(page_number), page_total, len(display_positions)))
     
-    # Agregar resumen estadístico
-    with st.expander("📊 Resumen Estadístico"):
-        st.dataframe(display_data.describe())
+    # Resumen estadístico a partir de los órdenes precalculados (en caché por consulta),
+    # calculado sólo si se muestra
+    if st.checkbox("📊 Resumen Estadístico"):
+        with timed(preview_profile, 'describe', kind='aggregate'):
+            summary = table_view.describe(display_positions, key=display_key)
+        st.dataframe(summary)
     
-    st.markdown("</div>", unsafe_allow_html=True)
\ No newline at end of file
+    if preview_profile is not None:
+        st.caption("🩺 " + " · ".join(
+            "{} {:.1f} ms".format(event['stage'], event['seconds'] * 1e3) for event in preview_profile.events
+        ))
+        preview_profile.finish(rows=len(display_positions))
+    st.markdown("</div>", unsafe_allow_html=True)
+
+st.markdown("---")
+if st.checkbox("📋 Ver Datos Detallados"):
+    render_data_preview(selected_year_range, selected_conditions,
+                        (metrics['price_min'], metrics['price_max']))
+
+# --- Diagnóstico ---
+# Al final del script, para incluir los tiempos de todas las secciones de esta ejecución
+if profile is not None:
+    with st.sidebar.expander("🩺 Diagnóstico"):
+        memory = sections.get('column_memory', (car_data.attrs.get('data_version'),),
+                              lambda: column_memory(car_data))
+        caches = {
+            'aggregates': aggregates.cache_info(),
+            'table_view': table_view.cache_info(),
+            'name_search': filter_index.search.cache_info(),
+            'sections': sections.cache_info(),
+        }
+        totals = profile.totals()
+        st.caption("{:,.1f} MB en memoria · filtrado {:.0f} ms · agregación {:.0f} ms · "
+                   "gráficos {:.0f} ms · tabla {:.0f} ms".format(
+                       memory['bytes'].sum() / 2 ** 20, totals['filter'] * 1e3, totals['aggregate'] * 1e3,
+                       totals['chart'] * 1e3, totals['table'] * 1e3
+                   ))
+        st.markdown("**Tiempos de esta ejecución**")
+        st.dataframe(profile.to_frame().assign(ms=lambda frame: (frame['seconds'] * 1e3).round(2))
+                     .drop(columns='seconds').set_index('stage'))
+        st.markdown("**Memoria por columna de `car_data`**")
+        st.dataframe(memory.assign(MB=(memory['bytes'] / 2 ** 20).round(2), share=memory['share'].round(3))
+                     .drop(columns='bytes'))
+        st.markdown("**Cachés**")
+        st.dataframe(cache_report(caches).round(3))
+        st.markdown("**Carga de los datos**")
+        st.dataframe(pd.DataFrame(loader.progress()['events'], columns=['stage', 'seconds']).set_index('stage'))
+    profile.finish(rows=int(metrics['rows']), memory=memory['bytes'].to_dict(), caches=caches)
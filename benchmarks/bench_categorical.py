@@ -0,0 +1,79 @@
+"""
+Benchmark de las columnas de texto como categóricas frente a cadenas Python.
+
+Procesa un CSV sintético con `load_and_preprocess_data` (texto categórico)
+y compara memoria y latencia de los filtros con la misma tabla convertida
+a columnas `object`, que es lo que producía el pipeline anterior.
+
+Uso:
+    python -m benchmarks.bench_categorical --rows 1000000
+"""
+import argparse
+import os
+import tempfile
+import time
+
+import pandas as pd
+
+from benchmarks.bench_filters import QUERIES, mask_query
+from benchmarks.synthetic import write_vehicles_csv
+from src.data_processing import load_and_preprocess_data
+from src.filters import FilterIndex
+
+
+def as_object(df: pd.DataFrame) -> pd.DataFrame:
+    """Convierte las columnas de texto categóricas a cadenas Python."""
+    df = df.copy()
+    for column in df.columns:
+        if df[column].dtype.name == 'category' and df[column].cat.categories.dtype == object:
+            df[column] = df[column].astype(object)
+    return df
+
+
+def _best_of(func, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run(n_rows, repeat=3):
+    """Memoria (MB) y tiempos (ms) de cada variante."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        csv_path = write_vehicles_csv(os.path.join(tmp_dir, 'vehicles.csv'), n_rows)
+        categorical = load_and_preprocess_data(csv_path)
+
+    results = {}
+    for name, df in [('object', as_object(categorical)), ('category', categorical)]:
+        index = FilterIndex(df)
+        timings = {
+            'memory_mb': df.memory_usage(deep=True).sum() / 2 ** 20,
+            'index_build_ms': _best_of(lambda: FilterIndex(df), repeat) * 1e3,
+            'groupby_ms': _best_of(
+                lambda: df.groupby('manufacturer', observed=True)['price'].mean(), repeat
+            ) * 1e3,
+        }
+        for query, filters in QUERIES.items():
+            timings[f'mask: {query}'] = _best_of(lambda: mask_query(df, **filters), repeat) * 1e3
+            timings[f'índice: {query}'] = _best_of(lambda: index.query(**filters), repeat) * 1e3
+        results[name] = timings
+    return len(categorical), results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    rows, results = run(args.rows, args.repeat)
+    print(f"{rows:,} filas tras el preprocesamiento")
+    print(f"{'medida':<32} {'object':>12} {'category':>12}")
+    for key in results['object']:
+        print(f"{key:<32} {results['object'][key]:>12.2f} {results['category'][key]:>12.2f}")
+
+
+if __name__ == '__main__':
+    main()
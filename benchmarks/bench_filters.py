@@ -0,0 +1,91 @@
+"""
+Benchmark de los filtros del dashboard.
+
+Compara las máscaras booleanas sobre todo el DataFrame con las consultas
+de `src.filters.FilterIndex`.
+
+Uso:
+    python -m benchmarks.bench_filters --rows 1000000
+"""
+import argparse
+import time
+
+from benchmarks.synthetic import make_vehicles_frame
+from src.filters import FilterIndex
+
+QUERIES = {
+    'rango completo': dict(year_range=(1960, 2019),
+                           conditions=['excellent', 'good', 'like new', 'fair', 'new', 'salvage']),
+    'año específico': dict(year_range=(2012, 2012), conditions=['excellent', 'good']),
+    'años + precio': dict(year_range=(2005, 2015), conditions=['good'],
+                          price_range=(5000, 20000)),
+    'todos los filtros': dict(year_range=(2000, 2019), conditions=['excellent', 'like new'],
+                              price_range=(2000, 30000), manufacturer='toy'),
+    'búsqueda de texto': dict(year_range=(1960, 2019),
+                              conditions=['excellent', 'good', 'like new', 'fair', 'new', 'salvage'],
+                              search='f-1'),
+}
+
+
+def mask_query(df, year_range, conditions, price_range=None, manufacturer=None, search=None):
+    """Filtrado original con máscaras booleanas."""
+    mask = (
+        (df['model_year'] >= year_range[0]) &
+        (df['model_year'] <= year_range[1]) &
+        (df['condition'].isin(conditions))
+    )
+    if price_range is not None:
+        mask &= (df['price'] >= price_range[0]) & (df['price'] <= price_range[1])
+    if manufacturer:
+        mask &= df['manufacturer'].str.contains(manufacturer, case=False)
+    if search:
+        mask &= (df['manufacturer'].str.contains(search, case=False, regex=False) |
+                 df['model'].str.contains(search, case=False, regex=False))
+    return mask.to_numpy().nonzero()[0]
+
+
+def _best_of(func, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def run(n_rows, repeat=5):
+    """Ejecuta las consultas de `QUERIES` y devuelve los tiempos en milisegundos."""
+    df = make_vehicles_frame(n_rows).dropna(subset=['model_year'])
+    df['model_year'] = df['model_year'].astype('int16')
+    df['manufacturer'] = df['model'].str.split().str[0].str.title()
+    df = df.reset_index(drop=True)
+
+    start = time.perf_counter()
+    index = FilterIndex(df)
+    build_time = time.perf_counter() - start
+
+    results = []
+    for name, filters in QUERIES.items():
+        mask_time, expected = _best_of(lambda: mask_query(df, **filters), repeat)
+        index_time, positions = _best_of(lambda: index.query(**filters), repeat)
+        assert len(positions) == len(expected)
+        results.append({'query': name, 'rows': len(positions),
+                        'mask_ms': mask_time * 1e3, 'index_ms': index_time * 1e3})
+    return build_time, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    build_time, results = run(args.rows, args.repeat)
+    print(f"Construcción del índice: {build_time:.3f} s")
+    print(f"{'consulta':<20} {'filas':>10} {'máscaras (ms)':>14} {'índice (ms)':>12}")
+    for r in results:
+        print(f"{r['query']:<20} {r['rows']:>10,} {r['mask_ms']:>14.2f} {r['index_ms']:>12.3f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+"""
+Benchmark de la imputación por grupo de `model`.
+
+Compara las funciones vectorizadas de `src.data_processing` con la
+implementación anterior basada en `groupby().transform(lambda ...)`.
+
+Uso:
+    python -m benchmarks.bench_imputation --rows 100000 1000000 10000000
+"""
+import argparse
+import time
+
+import pandas as pd
+
+from benchmarks.synthetic import make_vehicles_frame
+from src.data_processing import impute_group_median, impute_group_mode
+
+
+def legacy_impute(df: pd.DataFrame) -> pd.DataFrame:
+    """Implementación original con una lambda por grupo."""
+    model_year = df.groupby('model')['model_year'].transform(
+        lambda x: x.fillna(x.median())
+    )
+    cylinders = df.groupby('model')['cylinders'].transform(
+        lambda x: x.fillna(x.mode()[0] if not x.mode().empty else x.median())
+    )
+    return pd.DataFrame({'model_year': model_year, 'cylinders': cylinders})
+
+
+def vectorized_impute(df: pd.DataFrame) -> pd.DataFrame:
+    """Implementación actual con tablas de búsqueda por modelo."""
+    return pd.DataFrame({
+        'model_year': impute_group_median(df, 'model_year'),
+        'cylinders': impute_group_mode(df, 'cylinders'),
+    })
+
+
+def _best_of(func, df, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(df)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def run(rows, repeat=3):
+    """Ejecuta el benchmark para cada tamaño y devuelve los resultados."""
+    results = []
+    for n_rows in rows:
+        df = make_vehicles_frame(n_rows)
+        legacy_time, legacy = _best_of(legacy_impute, df, repeat)
+        vectorized_time, vectorized = _best_of(vectorized_impute, df, repeat)
+        pd.testing.assert_frame_equal(legacy, vectorized)
+        results.append({
+            'rows': n_rows,
+            'legacy_s': legacy_time,
+            'vectorized_s': vectorized_time,
+            'speedup': legacy_time / vectorized_time,
+        })
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--rows', type=int, nargs='+',
+                        default=[100_000, 1_000_000, 10_000_000])
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'filas':>12} {'lambda (s)':>12} {'vectorizado (s)':>16} {'speedup':>9}")
+    for r in run(args.rows, args.repeat):
+        print(f"{r['rows']:>12,} {r['legacy_s']:>12.3f} {r['vectorized_s']:>16.3f} {r['speedup']:>8.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+"""
+Benchmark del modo incremental frente al reprocesamiento completo.
+
+Procesa un histórico con `IncrementalDataset`, mide cuánto tarda en
+anexar una entrega nueva y lo compara con volver a ejecutar
+`load_and_preprocess_data` sobre el histórico más la entrega.
+
+Uso:
+    python -m benchmarks.bench_incremental --history 1000000 --delta 10000 50000
+"""
+import argparse
+import os
+import tempfile
+import time
+
+import pandas as pd
+
+from benchmarks.synthetic import make_vehicles_frame, write_vehicles_csv
+from src.aggregations import AggregateCache
+from src.data_processing import load_and_preprocess_data
+from src.incremental import IncrementalDataset
+
+
+def run(history_rows, delta_rows, odometer_method='age_median'):
+    """Tiempos de anexar cada entrega y de reprocesar todo, en segundos."""
+    results = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        history = make_vehicles_frame(history_rows)
+        history_path = os.path.join(tmp_dir, 'history.csv')
+        history.to_csv(history_path, index=False)
+        state_dir = os.path.join(tmp_dir, 'state')
+        dataset = IncrementalDataset(odometer_method)
+        dataset.append(history_path)
+        dataset.save(state_dir)
+
+        for n_rows in delta_rows:
+            delta_path = write_vehicles_csv(os.path.join(tmp_dir, f'delta-{n_rows}.csv'), n_rows, seed=n_rows)
+            combined_path = os.path.join(tmp_dir, 'combined.csv')
+            pd.concat([history, pd.read_csv(delta_path)]).to_csv(combined_path, index=False)
+
+            start = time.perf_counter()
+            full = load_and_preprocess_data(combined_path, odometer_method=odometer_method)
+            AggregateCache(full)
+            full_time = time.perf_counter() - start
+
+            state = IncrementalDataset.load(state_dir)
+            start = time.perf_counter()
+            state.append(delta_path)
+            state.aggregates()
+            append_time = time.perf_counter() - start
+            results.append({'delta': n_rows, 'full_s': full_time, 'append_s': append_time,
+                            'rows_full': len(full), 'rows_incremental': len(state.dataset)})
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--history', type=int, default=1_000_000)
+    parser.add_argument('--delta', type=int, nargs='+', default=[10_000, 50_000])
+    parser.add_argument('--odometer-method', default='age_median')
+    args = parser.parse_args()
+
+    print(f"Histórico: {args.history:,} filas")
+    print(f"{'anexo':>10} {'completo (s)':>13} {'incremental (s)':>16} {'filas completo':>15} {'filas incr.':>12}")
+    for r in run(args.history, args.delta, args.odometer_method):
+        print(f"{r['delta']:>10,} {r['full_s']:>13.2f} {r['append_s']:>16.3f} "
+              f"{r['rows_full']:>15,} {r['rows_incremental']:>12,}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+"""
+Benchmark de la ingesta de varios archivos con un pool de procesos.
+
+Mide la fase de lectura y limpieza por archivo (la que se reparte entre
+procesos) y el tiempo total de `load_and_preprocess_files` para distintos
+números de procesos.
+
+Uso:
+    python -m benchmarks.bench_multifile --shards 8 --rows-per-shard 250000 --workers 1 2 4 8
+"""
+import argparse
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from benchmarks.synthetic import write_vehicles_csv
+from src.data_processing import _read_shard, load_and_preprocess_files, resolve_shards
+
+
+def _parse_phase(files, workers):
+    start = time.perf_counter()
+    if workers == 1:
+        for path in files:
+            _read_shard(path, None)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            list(executor.map(_read_shard, files, [None] * len(files)))
+    return time.perf_counter() - start
+
+
+def run(shards, rows_per_shard, workers):
+    """Genera los archivos y mide cada número de procesos."""
+    results = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for i in range(shards):
+            write_vehicles_csv(os.path.join(tmp_dir, f'vehicles_us_{i:03d}.csv'), rows_per_shard, seed=i)
+        files = resolve_shards(tmp_dir)
+
+        for n_workers in workers:
+            parse_time = _parse_phase(files, n_workers)
+            start = time.perf_counter()
+            load_and_preprocess_files(tmp_dir, max_workers=n_workers)
+            total_time = time.perf_counter() - start
+            results.append({'workers': n_workers, 'parse_s': parse_time, 'total_s': total_time,
+                            'rows_per_s': shards * rows_per_shard / parse_time})
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--shards', type=int, default=8)
+    parser.add_argument('--rows-per-shard', type=int, default=250_000)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    print(f"CPUs disponibles: {os.cpu_count()}")
+    results = run(args.shards, args.rows_per_shard, args.workers)
+    base = results[0]['parse_s']
+    print(f"{'procesos':>9} {'lectura (s)':>12} {'filas/s':>12} {'aceleración':>12} {'total (s)':>10}")
+    for r in results:
+        print(f"{r['workers']:>9} {r['parse_s']:>12.2f} {r['rows_per_s']:>12,.0f} "
+              f"{base / r['parse_s']:>11.1f}x {r['total_s']:>10.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+"""
+Benchmark de los métodos de imputación del odómetro.
+
+Oculta una fracción de los odómetros conocidos, los imputa con cada método
+de `ODOMETER_METHODS` y mide el tiempo y el error sobre los valores ocultos.
+
+Uso:
+    python -m benchmarks.bench_odometer --rows 100000 1000000 --holdout 0.1
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.synthetic import make_vehicles_frame
+from src.data_processing import ODOMETER_METHODS, impute_group_median, impute_odometer_by_age
+
+
+def interpolate_odometer(df: pd.DataFrame) -> pd.Series:
+    """Interpolación lineal tras ordenar por edad (método 'interpolate')."""
+    df = df.sort_values('age_temp')
+    odometer = df['odometer'].interpolate(method='linear', limit_direction='forward')
+    return odometer.fillna(odometer.median()).reindex(df.index)
+
+
+def impute(df: pd.DataFrame, method: str) -> pd.Series:
+    if method == 'interpolate':
+        return interpolate_odometer(df)
+    return impute_odometer_by_age(df, by_model=(method == 'model_age_median'))
+
+
+def prepare(n_rows: int, holdout: float, seed: int = 0):
+    """Frame con `age_temp` y una máscara de odómetros conocidos ocultados."""
+    df = make_vehicles_frame(n_rows, seed=seed)
+    df['model_year'] = impute_group_median(df, 'model_year')
+    df['age_temp'] = df['date_posted'].dt.year - df['model_year']
+    df = df[['model', 'age_temp', 'odometer']]
+
+    rng = np.random.default_rng(seed)
+    hidden = df['odometer'].notna().to_numpy() & (rng.random(len(df)) < holdout)
+    truth = df['odometer'][hidden]
+    df = df.assign(odometer=df['odometer'].mask(hidden))
+    return df, hidden, truth
+
+
+def run(rows, holdout=0.1):
+    """Devuelve tiempo y errores de cada método para cada tamaño."""
+    results = []
+    for n_rows in rows:
+        df, hidden, truth = prepare(n_rows, holdout)
+        for method in ODOMETER_METHODS:
+            start = time.perf_counter()
+            filled = impute(df, method)
+            elapsed = time.perf_counter() - start
+            errors = (filled[hidden] - truth).abs()
+            results.append({'rows': n_rows, 'method': method, 'seconds': elapsed,
+                            'mae': errors.mean(), 'median_ae': errors.median()})
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--rows', type=int, nargs='+', default=[100_000, 1_000_000])
+    parser.add_argument('--holdout', type=float, default=0.1)
+    args = parser.parse_args()
+
+    print(f"{'filas':>10} {'método':<18} {'tiempo (s)':>11} {'MAE':>10} {'mediana AE':>11}")
+    for r in run(args.rows, args.holdout):
+        print(f"{r['rows']:>10,} {r['method']:<18} {r['seconds']:>11.3f} "
+              f"{r['mae']:>10,.0f} {r['median_ae']:>11,.0f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+"""
+Benchmark de la valoración por lotes con `PriceEstimator` frente a la búsqueda exhaustiva.
+
+Construye el estimador sobre los datos procesados (menos un 10 % de los
+anuncios, que se reservan para valorar) y compara los anuncios valorados
+por segundo con los árboles k-d frente a medir la distancia a todos los
+anuncios del mismo fabricante y tipo. Informa además del error absoluto
+medio de la estimación y del de la mediana global; en los datos
+sintéticos el precio es casi todo ruido, así que el error sólo es
+indicativo con el conjunto real.
+
+Uso:
+    python -m benchmarks.bench_pricing --rows 100000 1000000 --listings 5000
+"""
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from benchmarks.synthetic import write_vehicles_csv
+from src.data_processing import load_and_preprocess_data
+from src.pricing import PriceEstimator
+
+
+def group_members(estimator, train):
+    """Posiciones de los anuncios de referencia de cada grupo fabricante × tipo."""
+    groups = estimator._groups(train)
+    return {group: np.flatnonzero(groups == group) for group in np.unique(groups)}
+
+
+def brute_force(estimator, members_of, listings, k):
+    """Comparables midiendo la distancia a todos los anuncios del mismo grupo."""
+    features = estimator.feature_matrix(listings)
+    positions = np.empty((len(listings), k), dtype=np.int64)
+    for row, group in enumerate(estimator._groups(listings)):
+        members = members_of[group]
+        distances = ((estimator.features[members] - features[row]) ** 2).sum(axis=1)
+        positions[row] = members[np.argsort(distances)[:k]]
+    return positions
+
+
+def run(n_rows, n_listings=5000, k=10):
+    """Construcción, memoria, anuncios por segundo con cada método y errores."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        df = load_and_preprocess_data(write_vehicles_csv(os.path.join(tmp_dir, 'vehicles.csv'), n_rows))
+    holdout = np.random.default_rng(0).random(len(df)) < 0.1
+    train = df[~holdout].reset_index(drop=True)
+    listings = df[holdout].head(n_listings)
+
+    start = time.perf_counter()
+    estimator = PriceEstimator(train, k=k)
+    build_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    prediction = estimator.predict(listings)
+    tree_rate = len(listings) / (time.perf_counter() - start)
+
+    sample = listings.head(max(1, len(listings) // 10))
+    members_of = group_members(estimator, train)
+    start = time.perf_counter()
+    brute_force(estimator, members_of, sample, k)
+    brute_rate = len(sample) / (time.perf_counter() - start)
+
+    error = float((prediction['price_estimate'] - listings['price']).abs().mean())
+    baseline = float((train['price'].median() - listings['price']).abs().mean())
+    return {
+        'rows': len(train), 'build_s': build_s, 'size_mb': estimator.nbytes / 2 ** 20,
+        'tree_rate': tree_rate, 'brute_rate': brute_rate, 'error': error, 'baseline': baseline,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--rows', type=int, nargs='+', default=[100_000, 1_000_000])
+    parser.add_argument('--listings', type=int, default=5000)
+    parser.add_argument('--k', type=int, default=10)
+    args = parser.parse_args()
+
+    for n_rows in args.rows:
+        result = run(n_rows, args.listings, args.k)
+        print(f"{result['rows']:,} anuncios de referencia; estimador construido en {result['build_s']:.2f} s "
+              f"({result['size_mb']:.1f} MB)")
+        print(f"  árboles k-d:          {result['tree_rate']:>10,.0f} anuncios/s")
+        print(f"  búsqueda exhaustiva:  {result['brute_rate']:>10,.0f} anuncios/s")
+        print(f"  error absoluto medio: {result['error']:,.0f} (mediana global: {result['baseline']:,.0f})")
+
+
+if __name__ == '__main__':
+    main()
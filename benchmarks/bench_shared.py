@@ -0,0 +1,106 @@
+"""
+Benchmark de la memoria por proceso con los datos compartidos frente a copias privadas.
+
+Lanza `--workers` procesos que cargan los datos procesados como lo hacía
+cada proceso del dashboard (leyendo el Parquet de la caché) o abriendo el
+archivo publicado con `src.shared`, y mide su memoria privada (RssAnon,
+Linux). Mide además la memoria que añade una sesión con `select` (copia de
+todas las columnas) frente a `selection` (sólo posiciones).
+
+Uso:
+    python -m benchmarks.bench_shared --rows 1000000 --workers 4
+"""
+import argparse
+import multiprocessing
+import os
+import tempfile
+import tracemalloc
+
+import pandas as pd
+
+from benchmarks.synthetic import write_vehicles_csv
+from src.data_processing import load_and_preprocess_data
+from src.filters import FilterIndex
+from src.shared import attach_dataset, publish_dataset
+
+
+def private_memory_mb() -> float:
+    """Memoria anónima (no compartida) del proceso actual en MB; 0 fuera de Linux."""
+    try:
+        with open('/proc/self/status', encoding='utf-8') as f:
+            for line in f:
+                if line.startswith('RssAnon:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return 0.0
+
+
+def _worker(mode, path, results):
+    before = private_memory_mb()
+    df = pd.read_parquet(path) if mode == 'parquet' else attach_dataset(path)
+    # Tocar todas las columnas, como al construir los índices del dashboard
+    for column in df.columns:
+        if df[column].dtype.kind in 'biuf':
+            df[column].to_numpy().sum()
+    results.put(private_memory_mb() - before)
+
+
+def _peak_mb(func):
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1] / 2 ** 20
+    finally:
+        tracemalloc.stop()
+
+
+def run(n_rows, workers=4):
+    """MB privados por proceso con cada modo y MB por sesión con cada forma de filtrar."""
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        csv_path = write_vehicles_csv(os.path.join(tmp_dir, 'vehicles.csv'), n_rows)
+        df = load_and_preprocess_data(csv_path)
+        parquet_path = os.path.join(tmp_dir, 'dataset.parquet')
+        df.to_parquet(parquet_path)
+        shared_path = publish_dataset(df, tmp_dir, 'bench')
+
+        context = multiprocessing.get_context('spawn')
+        for mode, path in [('parquet', parquet_path), ('compartido', shared_path)]:
+            queue = context.Queue()
+            processes = [context.Process(target=_worker, args=(mode, path, queue))
+                         for _ in range(workers)]
+            for process in processes:
+                process.start()
+            results[mode] = [queue.get() for _ in processes]
+            for process in processes:
+                process.join()
+
+        attached = attach_dataset(shared_path)
+        index = FilterIndex(attached)
+        filters = dict(year_range=(1960, 2019),
+                       conditions=['excellent', 'good', 'like new', 'fair', 'new', 'salvage'])
+        sessions = {
+            'select': _peak_mb(lambda: index.select(attached, **filters)['price'].mean()),
+            'selection': _peak_mb(lambda: index.selection(attached, **filters).column('price').mean()),
+        }
+    return len(df), df.memory_usage(deep=True).sum() / 2 ** 20, results, sessions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--workers', type=int, default=4)
+    args = parser.parse_args()
+
+    rows, size_mb, results, sessions = run(args.rows, args.workers)
+    print(f"{rows:,} filas procesadas, {size_mb:.1f} MB en memoria")
+    for mode, values in results.items():
+        print(f"  {mode:<12} memoria privada por proceso: "
+              + ", ".join(f"{value:.1f}" for value in values) + " MB")
+    for name, peak in sessions.items():
+        print(f"  sesión con {name:<10} memoria máxima: {peak:.1f} MB")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+"""
+Benchmark de las estadísticas exactas frente a `QuantileSketch`.
+
+Mide tiempo, error relativo y tamaño del estado del cuantil 0.99 del
+precio y de las medianas del odómetro por edad, con valores muy
+asimétricos, y el preprocesamiento completo con cada opción de
+`statistics`.
+
+Uso:
+    python -m benchmarks.bench_sketch --rows 1000000 10000000
+"""
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.synthetic import write_vehicles_csv
+from src.data_processing import QuantileSketch, column_quantile, load_and_preprocess_data
+
+
+def _timed(func):
+    start = time.perf_counter()
+    result = func()
+    return time.perf_counter() - start, result
+
+
+def run_statistics(n_rows, seed=0):
+    """Cuantil y medianas por grupo, exactos y con sketch."""
+    rng = np.random.default_rng(seed)
+    prices = pd.Series(rng.lognormal(9.0, 1.2, size=n_rows).round())
+    ages = pd.Series(rng.integers(0, 60, size=n_rows).astype('float64'))
+    odometer = pd.Series(ages * rng.normal(12000, 4000, size=n_rows).clip(100, None))
+
+    results = []
+    exact_time, exact = _timed(lambda: prices.quantile(0.99))
+    sketch_time, approx = _timed(lambda: column_quantile(prices, 0.99, statistics='sketch'))
+    results.append({'statistic': 'precio q0.99', 'exact_s': exact_time, 'sketch_s': sketch_time,
+                    'error': abs(approx - exact) / exact, 'state': 'cubetas'})
+
+    sketch = QuantileSketch()
+    exact_time, exact = _timed(lambda: odometer.groupby(ages).median())
+    sketch_time, _ = _timed(lambda: sketch.update(ages, odometer))
+    approx = sketch.median().sort_index()
+    positive = exact > 0
+    results.append({'statistic': 'mediana odómetro/edad', 'exact_s': exact_time,
+                    'sketch_s': sketch_time,
+                    'error': ((approx[positive] - exact[positive]).abs() / exact[positive]).max(),
+                    'state': f'{len(sketch.counts):,} pares'})
+    return results
+
+
+def run_pipeline(n_rows):
+    """Tiempo de `load_and_preprocess_data` con cada opción de `statistics`."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        csv_path = write_vehicles_csv(os.path.join(tmp_dir, 'vehicles.csv'), n_rows)
+        return {statistics: _timed(lambda: load_and_preprocess_data(
+                    csv_path, odometer_method='age_median', statistics=statistics))[0]
+                for statistics in ('exact', 'sketch')}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--rows', type=int, nargs='+', default=[1_000_000, 10_000_000])
+    parser.add_argument('--pipeline-rows', type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    print(f"{'filas':>11} {'estadística':<24} {'exacto (s)':>11} {'sketch (s)':>11} {'error máx.':>11} estado")
+    for n_rows in args.rows:
+        for r in run_statistics(n_rows):
+            print(f"{n_rows:>11,} {r['statistic']:<24} {r['exact_s']:>11.3f} {r['sketch_s']:>11.3f} "
+                  f"{r['error']:>11.4%} {r['state']}")
+
+    timings = run_pipeline(args.pipeline_rows)
+    print(f"\nload_and_preprocess_data ({args.pipeline_rows:,} filas, odometer_method='age_median'):")
+    for statistics, seconds in timings.items():
+        print(f"  {statistics:<7} {seconds:.2f} s")
+
+
+if __name__ == '__main__':
+    main()
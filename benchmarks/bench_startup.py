@@ -0,0 +1,64 @@
+"""
+Benchmark del tiempo hasta la primera pintura del dashboard.
+
+Compara el arranque bloqueante (cargar los datos y construir el índice de
+filtros y los agregados antes de mostrar nada) con `BackgroundLoader` y
+el resumen precalculado: la primera pintura sólo necesita leer el resumen
+y el progreso, mientras la carga sigue en segundo plano.
+
+Uso:
+    python -m benchmarks.bench_startup --rows 100000 1000000
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from benchmarks.synthetic import write_vehicles_csv
+from src.aggregations import AggregateCache
+from src.data_processing import load_and_preprocess_data
+from src.filters import FilterIndex
+from src.warmup import SNAPSHOT_FILE, BackgroundLoader, build_snapshot, read_snapshot, write_snapshot
+
+
+def run(n_rows):
+    """Segundos hasta la primera pintura y hasta tener todo listo."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        csv_path = write_vehicles_csv(os.path.join(tmp_dir, 'vehicles.csv'), n_rows)
+        snapshot_path = os.path.join(tmp_dir, SNAPSHOT_FILE)
+
+        start = time.perf_counter()
+        df = load_and_preprocess_data(csv_path)
+        FilterIndex(df)
+        AggregateCache(df)
+        blocking = time.perf_counter() - start
+        write_snapshot(build_snapshot(df), snapshot_path)
+        del df
+
+        start = time.perf_counter()
+        loader = BackgroundLoader([
+            ('data', lambda results, hook: load_and_preprocess_data(csv_path, hook=hook)),
+            ('filter_index', lambda results, hook: FilterIndex(results['data'])),
+            ('aggregates', lambda results, hook: AggregateCache(results['data'])),
+        ]).start()
+        loader.progress()
+        read_snapshot(snapshot_path)
+        first_paint = time.perf_counter() - start
+        loader.wait()
+        ready = time.perf_counter() - start
+    return {'blocking': blocking, 'first_paint': first_paint, 'ready': ready}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--rows', type=int, nargs='+', default=[100_000, 1_000_000])
+    args = parser.parse_args()
+
+    print(f"{'filas':>12} {'bloqueante (s)':>15} {'1.ª pintura (s)':>16} {'listo (s)':>10}")
+    for n_rows in args.rows:
+        r = run(n_rows)
+        print(f"{n_rows:>12,} {r['blocking']:>15.3f} {r['first_paint']:>16.4f} {r['ready']:>10.3f}")
+
+
+if __name__ == '__main__':
+    main()
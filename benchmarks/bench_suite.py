@@ -0,0 +1,278 @@
+"""
+Suite de benchmarks de carga, filtros, agregados, datos de gráficos, estimación de precio y arranque.
+
+Genera CSV sintéticos del tamaño indicado, mide cada escenario (mejor de
+`--repeat` ejecuciones), guarda los resultados como JSON en `results/` y
+los compara con una línea base. Termina con código 1 si algún escenario
+es más lento que la línea base más la tolerancia.
+
+Uso:
+    python -m benchmarks.bench_suite --sizes 10k 100k 1M 10M
+    python -m benchmarks.bench_suite --sizes 10k 100k --update-baseline
+"""
+import argparse
+import json
+import os
+import platform
+import tempfile
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.synthetic import write_vehicles_csv
+from src.aggregations import AggregateCache
+from src.charts import downsample_scatter, histogram_bins
+from src.data_processing import load_and_preprocess_data
+from src.filters import FilterIndex
+from src.pricing import PriceEstimator
+from src.warmup import SNAPSHOT_FILE, BackgroundLoader, build_snapshot, read_snapshot, write_snapshot
+
+RESULTS_DIR = 'results'
+BASELINE_FILE = os.path.join(RESULTS_DIR, 'baseline.json')
+
+# Escenarios medidos, en orden de ejecución
+SCENARIOS = [
+    'load', 'filter_build', 'filter_query', 'aggregate_build', 'aggregate_query',
+    'chart_histograms', 'chart_scatter', 'pricing_build', 'pricing_predict', 'first_paint',
+]
+
+# Combinaciones de filtros representativas de la barra lateral
+FILTER_QUERIES = [
+    dict(year_range=(1960, 2019), conditions=['excellent', 'good', 'like new', 'fair', 'new', 'salvage']),
+    dict(year_range=(2012, 2012), conditions=['excellent', 'good']),
+    dict(year_range=(2005, 2015), conditions=['good'], price_range=(5000, 20000)),
+    dict(year_range=(2000, 2019), conditions=['excellent', 'like new'],
+         price_range=(2000, 30000), manufacturer='toy'),
+]
+
+# Resúmenes de los modos "Por Fabricante" y "Tendencias Temporales"
+AGGREGATE_QUERIES = [
+    dict(year_range=(1960, 2019), conditions=None),
+    dict(year_range=(2005, 2015), conditions=['excellent', 'good']),
+]
+
+# Anuncios valorados por lote en `pricing_predict`
+PRICING_LISTINGS = 2000
+
+_SIZE_SUFFIXES = {'k': 1_000, 'm': 1_000_000}
+
+
+def parse_size(text: str) -> int:
+    """Convierte '10k', '1M' o '250000' en un número de filas."""
+    text = text.strip().lower().replace('_', '')
+    if text[-1:] in _SIZE_SUFFIXES:
+        return int(float(text[:-1]) * _SIZE_SUFFIXES[text[-1]])
+    return int(text)
+
+
+def _timed(func: Callable, repeat: int, memory: bool) -> tuple:
+    """Mejor tiempo de `repeat` ejecuciones, memoria máxima opcional y resultado."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    peak = None
+    if memory:
+        tracemalloc.start()
+        try:
+            func()
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    return best, peak, result
+
+
+def run_size(csv_path: str, repeat: int = 3, memory: bool = False) -> dict:
+    """
+    Mide todos los escenarios sobre un CSV.
+
+    Returns:
+        Un diccionario con las filas procesadas y, por escenario, los
+        segundos (y los MB máximos si `memory`).
+    """
+    scenarios = {}
+
+    def record(name, func):
+        seconds, peak, result = _timed(func, repeat, memory)
+        scenarios[name] = {'seconds': seconds}
+        if peak is not None:
+            scenarios[name]['peak_mb'] = peak / 2 ** 20
+        return result
+
+    def aggregate_queries():
+        aggregates.invalidate()
+        for query in AGGREGATE_QUERIES:
+            aggregates.manufacturer_stats(**query)
+            aggregates.monthly_stats(**query)
+
+    df = record('load', lambda: load_and_preprocess_data(csv_path))
+    index = record('filter_build', lambda: FilterIndex(df))
+    record('filter_query', lambda: [index.select(df, **query) for query in FILTER_QUERIES])
+    aggregates = record('aggregate_build', lambda: AggregateCache(df))
+    record('aggregate_query', aggregate_queries)
+    record('chart_histograms', lambda: [histogram_bins(df[column]) for column in ('odometer', 'price')])
+    record('chart_scatter', lambda: downsample_scatter(df, 'odometer', 'price'))
+    estimator = record('pricing_build', lambda: PriceEstimator(df))
+    listings = df.sample(min(PRICING_LISTINGS, len(df)), random_state=0)
+    record('pricing_predict', lambda: estimator.predict(listings))
+    scenarios['first_paint'] = {'seconds': min(_first_paint(csv_path, df) for _ in range(repeat))}
+    return {'rows_out': len(df), 'scenarios': scenarios}
+
+
+def _first_paint(csv_path: str, df: pd.DataFrame) -> float:
+    """
+    Segundos hasta la primera pintura del dashboard con la carga en segundo plano.
+
+    Lanza un `BackgroundLoader` con la carga, el índice de filtros y los
+    agregados, y mide hasta tener el progreso y el resumen precalculado.
+    Espera a que termine la carga (fuera de la medición) para que no
+    compita con la siguiente ejecución.
+    """
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        snapshot_path = write_snapshot(build_snapshot(df), os.path.join(tmp_dir, SNAPSHOT_FILE))
+        start = time.perf_counter()
+        loader = BackgroundLoader([
+            ('data', lambda results, hook: load_and_preprocess_data(csv_path, hook=hook)),
+            ('filter_index', lambda results, hook: FilterIndex(results['data'])),
+            ('aggregates', lambda results, hook: AggregateCache(results['data'])),
+        ]).start()
+        loader.progress()
+        read_snapshot(snapshot_path)
+        seconds = time.perf_counter() - start
+        loader.wait()
+    return seconds
+
+
+def _environment() -> dict:
+    return {
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'numpy': np.__version__,
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+    }
+
+
+def run(sizes: List[int], repeat: int = 3, memory: bool = False,
+        data_dir: Optional[str] = None) -> dict:
+    """
+    Ejecuta la suite para cada tamaño.
+
+    Args:
+        sizes: Filas de los CSV sintéticos.
+        repeat: Ejecuciones por escenario (se guarda la mejor).
+        memory: Medir además la memoria máxima con `tracemalloc`.
+        data_dir: Directorio donde guardar y reutilizar los CSV; por
+            defecto, uno temporal.
+
+    Returns:
+        Los resultados, con la forma guardada en el JSON.
+    """
+    results = {
+        'created_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'environment': _environment(),
+        'repeat': repeat,
+        'sizes': {},
+    }
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        data_dir = data_dir or tmp_dir
+        os.makedirs(data_dir, exist_ok=True)
+        for n_rows in sizes:
+            csv_path = os.path.join(data_dir, f'vehicles-{n_rows}.csv')
+            if not os.path.exists(csv_path):
+                write_vehicles_csv(csv_path, n_rows)
+            results['sizes'][str(n_rows)] = run_size(csv_path, repeat, memory)
+    return results
+
+
+def compare(current: dict, baseline: dict, tolerance: float = 0.25,
+            min_seconds: float = 0.005) -> List[Dict]:
+    """
+    Busca regresiones respecto a la línea base.
+
+    Un escenario es una regresión si tarda más de `(1 + tolerance)` veces
+    lo que tardaba y la diferencia supera `min_seconds`, para no fallar por
+    el ruido de los escenarios de pocos milisegundos. Sólo se comparan los
+    tamaños y escenarios presentes en ambos resultados.
+
+    Returns:
+        Una lista con tamaño, escenario, tiempos y cociente de cada regresión.
+    """
+    regressions = []
+    for size, measured in current['sizes'].items():
+        reference = baseline.get('sizes', {}).get(size)
+        if reference is None:
+            continue
+        for name, values in measured['scenarios'].items():
+            if name not in reference['scenarios']:
+                continue
+            before = reference['scenarios'][name]['seconds']
+            after = values['seconds']
+            if after > before * (1 + tolerance) and after - before > min_seconds:
+                regressions.append({'size': size, 'scenario': name, 'baseline': before,
+                                    'current': after, 'ratio': after / before})
+    return regressions
+
+
+def write_results(results: dict, path: str) -> str:
+    """Escribe los resultados como JSON y devuelve la ruta."""
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
+    return path
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--sizes', nargs='+', default=['10k', '100k'],
+                        help='Filas por CSV sintético (10k, 100k, 1M, 10M...)')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--memory', action='store_true', help='Medir también la memoria máxima')
+    parser.add_argument('--data-dir', help='Reutilizar los CSV sintéticos de este directorio')
+    parser.add_argument('--output-dir', default=RESULTS_DIR)
+    parser.add_argument('--baseline', default=BASELINE_FILE)
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help='Ralentización relativa admitida (0.25 = 25 %%)')
+    parser.add_argument('--update-baseline', action='store_true',
+                        help='Guardar estos resultados como nueva línea base')
+    args = parser.parse_args(argv)
+
+    results = run([parse_size(size) for size in args.sizes], args.repeat, args.memory, args.data_dir)
+    path = write_results(results, os.path.join(
+        args.output_dir, f"bench-{time.strftime('%Y%m%d-%H%M%S')}.json"
+    ))
+    print(f"Resultados guardados en {path}")
+
+    for size, measured in results['sizes'].items():
+        print(f"\n{int(size):,} filas ({measured['rows_out']:,} tras el preprocesamiento)")
+        for name, values in measured['scenarios'].items():
+            memory_text = f" {values['peak_mb']:>9.1f} MB" if 'peak_mb' in values else ''
+            print(f"  {name:<18} {values['seconds'] * 1e3:>10.2f} ms{memory_text}")
+
+    if args.update_baseline:
+        write_results(results, args.baseline)
+        print(f"\nLínea base actualizada: {args.baseline}")
+        return 0
+    if not os.path.exists(args.baseline):
+        print(f"\nNo hay línea base en {args.baseline}; use --update-baseline para crearla")
+        return 0
+
+    with open(args.baseline, encoding='utf-8') as f:
+        baseline = json.load(f)
+    regressions = compare(results, baseline, args.tolerance)
+    if not regressions:
+        print(f"\nSin regresiones respecto a {args.baseline} (tolerancia {args.tolerance:.0%})")
+        return 0
+    print(f"\nREGRESIONES respecto a {args.baseline} (tolerancia {args.tolerance:.0%}):")
+    for r in regressions:
+        print(f"  {int(r['size']):,} filas, {r['scenario']}: {r['baseline'] * 1e3:.2f} ms -> "
+              f"{r['current'] * 1e3:.2f} ms (x{r['ratio']:.2f})")
+    return 1
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
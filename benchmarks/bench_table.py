@@ -0,0 +1,83 @@
+"""
+Benchmark de la tabla paginada frente a mostrar toda la selección.
+
+Compara ordenar, serializar (Arrow, el formato con el que `st.dataframe`
+envía los datos) y resumir con `describe()` la selección completa con
+`TableView`, que sólo ordena y serializa la página visible y resume a
+partir de los órdenes precalculados (con caché por consulta).
+
+Uso:
+    python -m benchmarks.bench_table --rows 1000000
+"""
+import argparse
+import time
+
+import pyarrow as pa
+
+from benchmarks.synthetic import make_vehicles_frame
+from src.table import TableView
+
+
+def _best_of(func, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run(n_rows, page_size=50, repeat=3):
+    """Tiempos (ms) de cada operación sobre la selección completa y con `TableView`."""
+    df = make_vehicles_frame(n_rows)
+    positions = (df['price'] > 3000).to_numpy().nonzero()[0]
+    selection = df.take(positions)
+
+    start = time.perf_counter()
+    view = TableView(df)
+    view.describe(positions)
+    view.page(positions, 0, page_size, 'price')
+    build_ms = (time.perf_counter() - start) * 1e3
+
+    def paged(column, ascending):
+        return pa.Table.from_pandas(view.page(positions, 10, page_size, column, ascending))
+
+    results = {
+        'ordenar precio + serializar': (
+            _best_of(lambda: pa.Table.from_pandas(selection.sort_values('price')), repeat),
+            _best_of(lambda: paged('price', True), repeat),
+        ),
+        'ordenar odómetro desc. + serializar': (
+            _best_of(lambda: pa.Table.from_pandas(selection.sort_values('odometer', ascending=False)),
+                     repeat),
+            _best_of(lambda: paged('odometer', False), repeat),
+        ),
+        'describe (sin caché)': (
+            _best_of(lambda: df.take(positions).describe(), repeat),
+            _best_of(lambda: view.describe(positions), repeat),
+        ),
+        'describe (en caché)': (
+            _best_of(lambda: df.take(positions).describe(), repeat),
+            _best_of(lambda: view.describe(positions, key='consulta'), repeat),
+        ),
+    }
+    return len(positions), build_ms, {name: (full * 1e3, paged * 1e3)
+                                      for name, (full, paged) in results.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--page-size', type=int, default=50)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    rows, build_ms, results = run(args.rows, args.page_size, args.repeat)
+    print(f"{rows:,} filas seleccionadas; órdenes de `TableView` calculados en {build_ms:.1f} ms")
+    print(f"{'operación':<38} {'selección (ms)':>15} {'TableView (ms)':>15}")
+    for name, (full, paged) in results.items():
+        print(f"{name:<38} {full:>15.2f} {paged:>15.3f}")
+
+
+if __name__ == '__main__':
+    main()
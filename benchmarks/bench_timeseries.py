@@ -0,0 +1,97 @@
+"""
+Benchmark de las tendencias temporales con `TimeSeriesStore` frente a agrupar las filas.
+
+Compara la conversión de `date_posted` (deduciendo el formato frente a
+`parse_dates`, que convierte cada fecha distinta una vez) y el cálculo de
+la serie del modo "Tendencias Temporales" agrupando la selección por
+`Period` (como hacía el dashboard), con el cubo de `AggregateCache` sin
+caché y con `TimeSeriesStore` en cada granularidad.
+
+Uso:
+    python -m benchmarks.bench_timeseries --rows 1000000
+"""
+import argparse
+import os
+import tempfile
+import time
+
+import pandas as pd
+
+from benchmarks.synthetic import write_vehicles_csv
+from src.aggregations import AggregateCache
+from src.data_processing import load_and_preprocess_data, parse_dates
+from src.timeseries import GRANULARITIES, TimeSeriesStore
+
+# Periodo de pandas equivalente a cada granularidad
+PERIODS = {'day': 'D', 'week': 'W', 'month': 'M'}
+
+
+def _best_of(func, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _grouped(df, granularity, year_range, conditions):
+    selection = df[df['model_year'].between(*year_range) & df['condition'].isin(conditions)]
+    period = selection['date_posted'].dt.to_period(PERIODS[granularity])
+    return selection.groupby(period).agg({'price': ['mean', 'count'], 'condition_score': 'mean'})
+
+
+def run(n_rows, repeat=3):
+    """Tiempos (ms) de la conversión de fechas y de cada serie con cada método."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        csv_path = write_vehicles_csv(os.path.join(tmp_dir, 'vehicles.csv'), n_rows)
+        raw = pd.read_csv(csv_path, usecols=['date_posted'])['date_posted']
+        df = load_and_preprocess_data(csv_path)
+    categorical = raw.astype('category')
+    parsing = {
+        'formato deducido': _best_of(lambda: pd.to_datetime(raw), repeat) * 1e3,
+        'parse_dates (texto)': _best_of(lambda: parse_dates(raw), repeat) * 1e3,
+        'parse_dates (categórico)': _best_of(lambda: parse_dates(categorical), repeat) * 1e3,
+    }
+
+    start = time.perf_counter()
+    store = TimeSeriesStore(df)
+    build_ms = (time.perf_counter() - start) * 1e3
+
+    year_range = (2005, 2015)
+    conditions = ['excellent', 'good', 'like new']
+    aggregates = AggregateCache(df)
+
+    def cube_monthly():
+        aggregates.invalidate()
+        return aggregates.monthly_stats(year_range, conditions)
+
+    trends = {}
+    for granularity in GRANULARITIES:
+        trends[granularity] = (
+            _best_of(lambda: _grouped(df, granularity, year_range, conditions), repeat) * 1e3,
+            _best_of(cube_monthly, repeat) * 1e3 if granularity == 'month' else None,
+            _best_of(lambda: store.trend(granularity, year_range, conditions), repeat) * 1e3,
+        )
+    return len(df), parsing, build_ms, store.nbytes / 2 ** 20, trends
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    rows, parsing, build_ms, size_mb, trends = run(args.rows, args.repeat)
+    print(f"{args.rows:,} filas leídas; conversión de date_posted:")
+    for name, ms in parsing.items():
+        print(f"  {name:<26} {ms:>9.1f} ms")
+    print(f"{rows:,} filas procesadas; almacén construido en {build_ms:.1f} ms ({size_mb:.2f} MB)")
+    print(f"{'granularidad':<14} {'agrupar (ms)':>13} {'cubo (ms)':>11} {'almacén (ms)':>13}")
+    for granularity, (grouped, cube, stored) in trends.items():
+        cube_text = f"{cube:>11.2f}" if cube is not None else f"{'-':>11}"
+        print(f"{granularity:<14} {grouped:>13.2f} {cube_text} {stored:>13.3f}")
+
+
+if __name__ == '__main__':
+    main()
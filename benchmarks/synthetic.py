@@ -0,0 +1,100 @@
+import numpy as np
+import pandas as pd
+
+# Modelos representativos del conjunto vehicles_us.csv
+MODELS = [
+    'ford f-150', 'chevrolet silverado 1500', 'ram 1500', 'chevrolet silverado',
+    'jeep wrangler', 'ford explorer', 'honda accord', 'toyota camry',
+    'honda civic', 'nissan altima', 'toyota tacoma', 'ford f-250 super duty',
+    'ford escape', 'jeep grand cherokee', 'chevrolet malibu', 'toyota corolla',
+    'gmc sierra 1500', 'ford mustang', 'chevrolet tahoe', 'honda cr-v',
+    'toyota rav4', 'dodge grand caravan', 'chevrolet equinox', 'ford focus',
+    'nissan rogue', 'ford fusion', 'subaru outback', 'toyota highlander',
+    'hyundai sonata', 'kia sorento', 'jeep cherokee', 'ram 2500',
+    'chevrolet impala', 'dodge charger', 'volkswagen jetta', 'nissan sentra',
+    'honda pilot', 'ford edge', 'gmc acadia', 'chrysler 300',
+    'hyundai elantra', 'toyota 4runner', 'subaru forester', 'bmw x5',
+    'mercedes-benz benze sprinter 2500', 'cadillac escalade', 'buick enclave',
+    'acura tl', 'toyota prius', 'kia soul',
+]
+CONDITIONS = ['excellent', 'good', 'like new', 'fair', 'new', 'salvage']
+CONDITION_WEIGHTS = [0.48, 0.39, 0.09, 0.03, 0.005, 0.005]
+FUELS = ['gas', 'diesel', 'hybrid', 'other', 'electric']
+FUEL_WEIGHTS = [0.92, 0.07, 0.006, 0.003, 0.001]
+TRANSMISSIONS = ['automatic', 'manual', 'other']
+TRANSMISSION_WEIGHTS = [0.91, 0.05, 0.04]
+TYPES = ['SUV', 'truck', 'sedan', 'pickup', 'coupe', 'wagon', 'mini-van',
+         'hatchback', 'van', 'convertible', 'other', 'offroad', 'bus']
+COLORS = ['white', 'black', 'silver', 'grey', 'blue', 'red', 'green',
+          'brown', 'custom', 'yellow', 'orange', 'purple']
+CYLINDER_CHOICES = np.array([4, 6, 8, 10, 12, 3, 5])
+
+
+def _weighted(rng, options, weights, size):
+    weights = np.asarray(weights, dtype=float)
+    return np.asarray(options, dtype=object)[
+        rng.choice(len(options), size=size, p=weights / weights.sum())
+    ]
+
+
+def make_vehicles_frame(n_rows: int, seed: int = 0) -> pd.DataFrame:
+    """
+    Genera un DataFrame sintético con la forma de vehicles_us.csv.
+
+    Las proporciones de valores ausentes y las distribuciones aproximan
+    las del conjunto real, de modo que los benchmarks ejercitan las mismas
+    ramas de imputación y limpieza.
+
+    Args:
+        n_rows: Número de filas a generar.
+        seed: Semilla del generador aleatorio.
+
+    Returns:
+        Un DataFrame con las columnas originales del CSV.
+    """
+    rng = np.random.default_rng(seed)
+
+    model_idx = rng.integers(0, len(MODELS), size=n_rows)
+    models = np.asarray(MODELS, dtype=object)[model_idx]
+
+    # Cada modelo tiene un año base y una cilindrada típica
+    base_year = 2004 + (model_idx * 7) % 12
+    model_year = (base_year + rng.normal(4, 5, size=n_rows)).round().clip(1960, 2019)
+    cylinders = CYLINDER_CHOICES[(model_idx + rng.binomial(1, 0.2, size=n_rows)) % 3].astype(float)
+
+    date_posted = pd.Timestamp('2018-05-01') + pd.to_timedelta(
+        rng.integers(0, 365, size=n_rows), unit='D'
+    )
+    age = np.clip(2019 - model_year, 0, None)
+    odometer = (age * rng.normal(12000, 4000, size=n_rows)).clip(0, 990000).round()
+    price = (rng.lognormal(9.2, 0.7, size=n_rows) * np.exp(-age / 15)).round().clip(1, 375000)
+    is_4wd = np.where(rng.random(n_rows) < 0.5, 1.0, np.nan)
+
+    df = pd.DataFrame({
+        'price': price.astype('int64'),
+        'model_year': model_year,
+        'model': models,
+        'condition': _weighted(rng, CONDITIONS, CONDITION_WEIGHTS, n_rows),
+        'cylinders': cylinders,
+        'fuel': _weighted(rng, FUELS, FUEL_WEIGHTS, n_rows),
+        'odometer': odometer,
+        'transmission': _weighted(rng, TRANSMISSIONS, TRANSMISSION_WEIGHTS, n_rows),
+        'type': np.asarray(TYPES, dtype=object)[rng.integers(0, len(TYPES), size=n_rows)],
+        'paint_color': np.asarray(COLORS, dtype=object)[rng.integers(0, len(COLORS), size=n_rows)],
+        'is_4wd': is_4wd,
+        'date_posted': date_posted,
+        'days_listed': rng.integers(0, 271, size=n_rows),
+    })
+
+    # Proporciones de ausentes similares al conjunto real
+    for column, rate in [('model_year', 0.07), ('cylinders', 0.10),
+                         ('odometer', 0.15), ('paint_color', 0.18)]:
+        df.loc[rng.random(n_rows) < rate, column] = np.nan
+
+    return df
+
+
+def write_vehicles_csv(path: str, n_rows: int, seed: int = 0) -> str:
+    """Escribe un CSV sintético en `path` y devuelve la ruta."""
+    make_vehicles_frame(n_rows, seed=seed).to_csv(path, index=False)
+    return path
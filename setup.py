@@ -1,27 +1,24 @@
-sprint7-vehicle-analysis
-├── data
-│   ├── raw
-│   │   └── vehicles_us.csv
-│   └── processed
-├── notebooks
-│   ├── 01_data_cleaning.ipynb
-│   ├── 02_exploratory_analysis.ipynb
-│   └── 03_statistical_analysis.ipynb
-├── src
-│   ├── __init__.py
-│   ├── data_processing.py
-│   ├── analysis.py
-│   └── utils.py
-├── tests
-│   ├── __init__.py
-│   └── test_data_processing.py
-├── docs
-│   ├── data_dictionary.md
-│   └── methodology.md
-├── results
-│   └── figures
-├── .gitignore
-├── requirements.txt
-├── setup.py
-├── app.py
-└── README.md
\ No newline at end of file
+from setuptools import find_packages, setup
+
+setup(
+    name='vehicle_analysis_dashboard',
+    version='1.0.0',
+    description='Dashboard interactivo para análisis de vehículos usados en EE. UU.',
+    author='YurgenMg',
+    license='MIT',
+    packages=find_packages(include=['src', 'src.*']),
+    python_requires='>=3.8',
+    install_requires=[
+        'pandas>=1.5.0,<2.0.0',
+        'numpy>=1.20.0',
+        'pyarrow>=8.0.0',
+        'openpyxl>=3.0.0',
+        'streamlit>=1.22.0',
+        'plotly>=5.13.0',
+    ],
+    entry_points={
+        'console_scripts': [
+            'vehicles-build=src.cli:main',
+        ],
+    },
+)
@@ -0,0 +1,225 @@
+import threading
+from collections import OrderedDict
+from typing import Callable, Hashable, Iterable, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Dimensiones del cubo precalculado
+CUBE_DIMENSIONS = ['manufacturer', 'model_year', 'condition', 'month']
+
+# Sumas y conteos que guarda el cubo por combinación de dimensiones
+CUBE_VALUES = ['price_sum', 'price_count', 'condition_score_sum', 'condition_score_count']
+
+
+def build_cube(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Precalcula sumas y conteos por fabricante × año del modelo × condición × mes.
+
+    El mes se guarda como entero (año * 12 + mes - 1) para agrupar sin
+    convertir a `Period`. Las medias se reconstruyen como suma / conteo al
+    agregar el cubo, así que cualquier combinación de filtros sobre sus
+    dimensiones se responde sin recorrer las filas originales.
+
+    Args:
+        df: DataFrame procesado por `load_and_preprocess_data`.
+
+    Returns:
+        Un DataFrame con una fila por combinación observada de dimensiones.
+    """
+    dates = df['date_posted']
+    keys = df[['manufacturer', 'model_year', 'condition']].assign(
+        month=dates.dt.year * 12 + dates.dt.month - 1
+    )
+    values = pd.DataFrame({
+        'price_sum': df['price'].astype('float64'),
+        'price_count': df['price'].notna().astype('int64'),
+        'condition_score_sum': df['condition_score'].astype('float64'),
+        'condition_score_count': df['condition_score'].notna().astype('int64'),
+    })
+    grouped = values.groupby([keys[column] for column in CUBE_DIMENSIONS],
+                             observed=True, dropna=False)
+    return grouped.sum(min_count=0).reset_index()
+
+
+def merge_cubes(*cubes: pd.DataFrame) -> pd.DataFrame:
+    """
+    Combina cubos de conjuntos de filas disjuntos (por ejemplo, anexos sucesivos).
+
+    Las sumas y conteos se suman por combinación de dimensiones, así que el
+    resultado es el cubo de la unión sin volver a recorrer las filas. El
+    coste depende del tamaño de los cubos.
+    """
+    non_empty = [cube for cube in cubes if len(cube)] or list(cubes[:1])
+    if len(non_empty) == 1:
+        return non_empty[0]
+    combined = pd.concat(
+        [cube.astype({column: object for column in ('manufacturer', 'condition')}) for cube in non_empty],
+        ignore_index=True,
+    )
+    return combined.groupby(CUBE_DIMENSIONS, dropna=False).sum(min_count=0).reset_index()
+
+
+def _month_labels(months: pd.Series) -> pd.Series:
+    """Convierte meses enteros (año * 12 + mes - 1) a etiquetas 'AAAA-MM'."""
+    # Hay pocos meses distintos: formatearlos uno a uno es más rápido que las operaciones `.str`
+    labels = [f"{month // 12}-{month % 12 + 1:02d}" for month in months.astype('int64').tolist()]
+    return pd.Series(labels, index=months.index, dtype=object)
+
+
+class AggregateCache:
+    """
+    Cubo de agregados con una caché LRU acotada para los resúmenes derivados.
+
+    El cubo se construye una vez por versión de los datos. `refresh` es el
+    punto de invalidación: si la versión cambia se reconstruye el cubo y se
+    vacía la caché de resúmenes. Es seguro compartirlo entre sesiones.
+    """
+
+    def __init__(self, df: pd.DataFrame, version: Optional[Hashable] = None, maxsize: int = 128):
+        self._reset(maxsize)
+        self._build(df, version)
+
+    @classmethod
+    def from_cube(cls, cube: pd.DataFrame, version: Optional[Hashable] = None,
+                  maxsize: int = 128) -> 'AggregateCache':
+        """Crea la caché a partir de un cubo ya calculado (por ejemplo, leído de disco)."""
+        cache = cls.__new__(cls)
+        cache._reset(maxsize)
+        cache.cube = cube
+        cache.version = version
+        return cache
+
+    def _reset(self, maxsize: int) -> None:
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._rollups = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _build(self, df: pd.DataFrame, version: Optional[Hashable]) -> None:
+        self.cube = build_cube(df)
+        self.version = version if version is not None else df.attrs.get('data_version')
+        self._rollups.clear()
+
+    def refresh(self, df: pd.DataFrame, version: Optional[Hashable] = None) -> bool:
+        """
+        Reconstruye el cubo si la versión de los datos ha cambiado.
+
+        Args:
+            df: DataFrame procesado actual.
+            version: Versión de los datos; por defecto `df.attrs['data_version']`.
+
+        Returns:
+            True si se reconstruyó el cubo.
+        """
+        version = version if version is not None else df.attrs.get('data_version')
+        with self._lock:
+            if version is not None and version == self.version:
+                return False
+            self._build(df, version)
+            return True
+
+    def invalidate(self) -> None:
+        """Vacía la caché de resúmenes derivados."""
+        with self._lock:
+            self._rollups.clear()
+
+    def cache_info(self) -> dict:
+        """Aciertos, fallos y tamaño actual de la caché de resúmenes."""
+        return {'hits': self.hits, 'misses': self.misses,
+                'size': len(self._rollups), 'maxsize': self.maxsize}
+
+    def _memoized(self, key: tuple, compute: Callable[[], pd.DataFrame]) -> pd.DataFrame:
+        with self._lock:
+            if key in self._rollups:
+                self._rollups.move_to_end(key)
+                self.hits += 1
+                return self._rollups[key]
+            self.misses += 1
+        result = compute()
+        with self._lock:
+            self._rollups[key] = result
+            self._rollups.move_to_end(key)
+            while len(self._rollups) > self.maxsize:
+                self._rollups.popitem(last=False)
+        return result
+
+    @staticmethod
+    def _key(kind: str, year_range, conditions) -> tuple:
+        years = tuple(year_range) if year_range is not None else None
+        selected = tuple(sorted(conditions)) if conditions is not None else None
+        return kind, years, selected
+
+    def _filtered_cube(self, year_range, conditions) -> pd.DataFrame:
+        cube = self.cube
+        mask = np.ones(len(cube), dtype=bool)
+        if year_range is not None:
+            years = cube['model_year'].to_numpy()
+            mask &= (years >= year_range[0]) & (years <= year_range[1])
+        if conditions is not None:
+            mask &= cube['condition'].isin(list(conditions)).to_numpy()
+        return cube[mask]
+
+    def _rollup(self, by: str, year_range, conditions) -> pd.DataFrame:
+        # Suma por grupo con `np.bincount` sobre los códigos: el cubo es pequeño y el coste
+        # fijo de `groupby` (sobre todo con columnas categóricas) domina la consulta
+        cube = self._filtered_cube(year_range, conditions)
+        keys = cube[by]
+        if isinstance(keys.dtype, pd.CategoricalDtype):
+            codes = keys.cat.codes.to_numpy().astype(np.intp)
+            n_groups = len(keys.cat.categories)
+        else:
+            codes, uniques = pd.factorize(keys.to_numpy(), sort=True)
+            n_groups = len(uniques)
+        # Los grupos sin valor (código -1) se descartan, como en `groupby`
+        valid = codes >= 0
+        codes = codes[valid]
+        present = np.flatnonzero(np.bincount(codes, minlength=n_groups))
+        totals = {column: np.bincount(codes, weights=cube[column].to_numpy()[valid],
+                                      minlength=n_groups)[present]
+                  for column in CUBE_VALUES}
+        if isinstance(keys.dtype, pd.CategoricalDtype):
+            index = pd.CategoricalIndex(pd.Categorical.from_codes(present, dtype=keys.dtype), name=by)
+        else:
+            index = pd.Index(uniques[present], name=by)
+        return pd.DataFrame({
+            'price_mean': totals['price_sum'] / totals['price_count'],
+            'price_count': totals['price_count'].astype('int64'),
+            'condition_score': totals['condition_score_sum'] / totals['condition_score_count'],
+        }, index=index)
+
+    def manufacturer_stats(self, year_range: Optional[Tuple[int, int]] = None,
+                           conditions: Optional[Iterable[str]] = None) -> pd.DataFrame:
+        """
+        Precio medio, número de anuncios y condición media por fabricante.
+
+        Devuelve las mismas columnas que
+        `groupby('manufacturer').agg({'price': ['mean', 'count'], 'condition_score': 'mean'})`,
+        redondeadas a dos decimales y ordenadas por número de anuncios.
+        """
+        def compute():
+            stats = self._rollup('manufacturer', year_range, conditions).round(2)
+            stats.columns = pd.MultiIndex.from_tuples(
+                [('price', 'mean'), ('price', 'count'), ('condition_score', 'mean')]
+            )
+            stats.index.name = 'manufacturer'
+            return stats.sort_values(('price', 'count'), ascending=False)
+
+        return self._memoized(self._key('manufacturer', year_range, conditions), compute)
+
+    def monthly_stats(self, year_range: Optional[Tuple[int, int]] = None,
+                      conditions: Optional[Iterable[str]] = None) -> pd.DataFrame:
+        """
+        Precio medio, número de anuncios y condición media por mes de publicación.
+
+        Returns:
+            Un DataFrame con las columnas `year_month` ('AAAA-MM'),
+            `price_mean`, `price_count` y `condition_score`.
+        """
+        def compute():
+            totals = self._rollup('month', year_range, conditions).sort_index().reset_index()
+            totals['month'] = _month_labels(totals['month'])
+            return totals.rename(columns={'month': 'year_month'})
+
+        return self._memoized(self._key('monthly', year_range, conditions), compute)
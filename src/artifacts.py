@@ -0,0 +1,119 @@
+import json
+import os
+import time
+from typing import Optional
+
+import pandas as pd
+
+from src.aggregations import build_cube
+from src.cache import file_fingerprint
+from src.charts import histogram_bins
+from src.data_processing import PREPROCESSING_VERSION, load_and_preprocess_data
+from src.instrumentation import StageHook
+
+# Nombres de los archivos generados por el pipeline por lotes
+DATASET_FILE = 'dataset.parquet'
+CUBE_FILE = 'aggregate_cube.parquet'
+HISTOGRAMS_FILE = 'histograms.parquet'
+MANIFEST_FILE = 'manifest.json'
+
+# Columnas con histograma precalculado sobre el conjunto completo
+HISTOGRAM_COLUMNS = ['odometer', 'price']
+
+
+def _write_parquet(df: pd.DataFrame, path: str) -> None:
+    """Escribe un Parquet de forma atómica."""
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    df.to_parquet(tmp_path)
+    os.replace(tmp_path, path)
+
+
+def build_artifacts(file_path: str, output_dir: str, chunksize: Optional[int] = None,
+                    nbins: int = 50, hook: Optional[StageHook] = None, **options) -> dict:
+    """
+    Ejecuta el preprocesamiento y guarda todos los artefactos del dashboard.
+
+    Genera en `output_dir`:
+
+    - `dataset.parquet`: los datos procesados
+    - `aggregate_cube.parquet`: el cubo de agregados (modos por fabricante y temporal)
+    - `histograms.parquet`: histogramas del conjunto completo
+    - `manifest.json`: versión de los datos, filas, archivos y tiempos
+
+    El manifiesto se escribe al final, de modo que sólo existe cuando
+    todos los artefactos están completos.
+
+    Args:
+        file_path: La ruta al archivo CSV.
+        output_dir: Directorio de salida.
+        chunksize: Si se indica, lectura por bloques de ese número de filas.
+        nbins: Número de intervalos de los histogramas.
+        hook: Recibe los eventos de las etapas del preprocesamiento.
+        **options: Opciones de `load_and_preprocess_data` (por ejemplo, las
+            de `src.config.preprocessing_options`).
+
+    Returns:
+        El manifiesto escrito.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    timings = {}
+
+    start = time.perf_counter()
+    params = dict(options, chunksize=chunksize) if chunksize else dict(options)
+    df = load_and_preprocess_data(file_path, hook=hook, **params)
+    timings['preprocess'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    cube = build_cube(df)
+    histograms = pd.concat(
+        [histogram_bins(df[column], nbins=nbins).assign(column=column)
+         for column in HISTOGRAM_COLUMNS],
+        ignore_index=True,
+    )
+    timings['aggregate'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    _write_parquet(df, os.path.join(output_dir, DATASET_FILE))
+    _write_parquet(cube, os.path.join(output_dir, CUBE_FILE))
+    _write_parquet(histograms, os.path.join(output_dir, HISTOGRAMS_FILE))
+    timings['write'] = time.perf_counter() - start
+
+    manifest = {
+        'data_version': file_fingerprint(file_path, params),
+        'preprocessing_version': PREPROCESSING_VERSION,
+        'source': file_path,
+        'rows': len(df),
+        'cube_rows': len(cube),
+        'created_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'files': [DATASET_FILE, CUBE_FILE, HISTOGRAMS_FILE],
+        'timings': timings,
+    }
+    manifest_path = os.path.join(output_dir, MANIFEST_FILE)
+    with open(f"{manifest_path}.tmp", 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(f"{manifest_path}.tmp", manifest_path)
+    return manifest
+
+
+def read_manifest(output_dir: str) -> dict:
+    """Lee el manifiesto; lanza `FileNotFoundError` si los artefactos no existen."""
+    with open(os.path.join(output_dir, MANIFEST_FILE), encoding='utf-8') as f:
+        return json.load(f)
+
+
+def load_dataset(output_dir: str) -> pd.DataFrame:
+    """Carga los datos procesados de los artefactos, con su versión en `attrs`."""
+    manifest = read_manifest(output_dir)
+    df = pd.read_parquet(os.path.join(output_dir, DATASET_FILE))
+    df.attrs['data_version'] = manifest['data_version']
+    return df
+
+
+def load_cube(output_dir: str) -> pd.DataFrame:
+    """Carga el cubo de agregados de los artefactos."""
+    return pd.read_parquet(os.path.join(output_dir, CUBE_FILE))
+
+
+def load_histograms(output_dir: str) -> pd.DataFrame:
+    """Carga los histogramas precalculados del conjunto completo."""
+    return pd.read_parquet(os.path.join(output_dir, HISTOGRAMS_FILE))
@@ -0,0 +1,121 @@
+import hashlib
+import json
+import os
+import re
+from typing import Any, Dict, Optional
+
+import pandas as pd
+
+from src.data_processing import PREPROCESSING_VERSION, load_and_preprocess_data
+from src.instrumentation import StageHook, run_stage
+
+# Tamaño de bloque para calcular el hash del archivo fuente
+_HASH_BLOCK_SIZE = 1 << 20
+
+
+def file_fingerprint(file_path: str, params: Optional[Dict[str, Any]] = None) -> str:
+    """
+    Calcula una huella del archivo fuente y de los parámetros de preprocesamiento.
+
+    La huella combina tamaño, fecha de modificación y hash del contenido del
+    archivo, la versión del pipeline y los parámetros usados, de modo que
+    cualquier cambio en cualquiera de ellos produce una clave distinta.
+
+    Args:
+        file_path: La ruta al archivo CSV.
+        params: Parámetros adicionales pasados a `load_and_preprocess_data`.
+
+    Returns:
+        Una cadena hexadecimal que identifica la combinación.
+    """
+    stat = os.stat(file_path)
+    content_hash = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(_HASH_BLOCK_SIZE), b''):
+            content_hash.update(block)
+
+    key = {
+        'size': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns,
+        'sha256': content_hash.hexdigest(),
+        'version': PREPROCESSING_VERSION,
+        'params': params or {},
+    }
+    payload = json.dumps(key, sort_keys=True, default=str).encode('utf-8')
+    return hashlib.sha256(payload).hexdigest()
+
+
+def _entry_prefix(file_path: str, params: Optional[Dict[str, Any]] = None) -> str:
+    """
+    Prefijo de las entradas de una fuente y unos parámetros concretos.
+
+    Combina el nombre del CSV con un hash de su ruta absoluta y de los
+    parámetros, de modo que cada combinación conserva su propia entrada y
+    la limpieza de una no borra las de otra.
+    """
+    stem = os.path.splitext(os.path.basename(file_path))[0]
+    payload = json.dumps({'path': os.path.abspath(file_path), 'params': params or {}},
+                         sort_keys=True, default=str).encode('utf-8')
+    return f"{stem}-{hashlib.sha256(payload).hexdigest()[:8]}"
+
+
+def cache_path(file_path: str, cache_dir: str, fingerprint: str,
+               params: Optional[Dict[str, Any]] = None) -> str:
+    """Devuelve la ruta del archivo Parquet en caché para una huella dada."""
+    return os.path.join(cache_dir, f"{_entry_prefix(file_path, params)}-{fingerprint[:16]}.parquet")
+
+
+def _remove_stale_entries(file_path: str, cache_dir: str, keep: str,
+                          params: Optional[Dict[str, Any]] = None) -> None:
+    """Elimina las entradas antiguas de la misma fuente con los mismos parámetros."""
+    pattern = re.compile(rf"{re.escape(_entry_prefix(file_path, params))}-[0-9a-f]{{16}}\.parquet")
+    for name in os.listdir(cache_dir):
+        path = os.path.join(cache_dir, name)
+        if pattern.fullmatch(name) and path != keep:
+            # Otro proceso puede haberla eliminado ya
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+def load_processed_data(file_path: str, cache_dir: str = 'data/processed',
+                        hook: Optional[StageHook] = None, **params) -> pd.DataFrame:
+    """
+    Carga los datos procesados desde la caché persistente o los genera.
+
+    Si existe un archivo Parquet para la huella actual del CSV se lee
+    directamente, conservando los tipos compactos y categóricos. En caso
+    contrario se ejecuta `load_and_preprocess_data`, se escribe el resultado
+    de forma atómica y se eliminan las entradas antiguas de la misma fuente
+    con los mismos parámetros.
+    La huella se guarda en `df.attrs['data_version']` para que las cachés
+    derivadas puedan invalidarse cuando cambian los datos.
+
+    Args:
+        file_path: La ruta al archivo CSV.
+        cache_dir: Directorio donde se guardan los datos procesados.
+        hook: Recibe los eventos de las etapas del pipeline, o uno solo
+            (`read_cache`) si los datos vienen de la caché. No forma parte
+            de la huella.
+        **params: Parámetros pasados a `load_and_preprocess_data`.
+
+    Returns:
+        Un DataFrame de pandas con los datos procesados.
+    """
+    fingerprint = file_fingerprint(file_path, params)
+    path = cache_path(file_path, cache_dir, fingerprint, params)
+    if os.path.exists(path):
+        df = run_stage(hook, 'read_cache', pd.read_parquet, path)
+        df.attrs['data_version'] = fingerprint
+        return df
+
+    df = load_and_preprocess_data(file_path, hook=hook, **params)
+    df.attrs['data_version'] = fingerprint
+
+    os.makedirs(cache_dir, exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    df.to_parquet(tmp_path)
+    os.replace(tmp_path, path)
+    _remove_stale_entries(file_path, cache_dir, keep=path, params=params)
+    return df
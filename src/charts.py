@@ -0,0 +1,87 @@
+from typing import Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+def histogram_bins(values: pd.Series, nbins: int = 50,
+                   value_range: Optional[Tuple[float, float]] = None) -> pd.DataFrame:
+    """
+    Calcula un histograma en el servidor para enviar sólo los conteos al navegador.
+
+    Args:
+        values: Valores a agrupar; los nulos se ignoran.
+        nbins: Número de intervalos de igual ancho.
+        value_range: Rango (mínimo, máximo) de los intervalos; por defecto
+            el de los datos.
+
+    Returns:
+        Un DataFrame con una fila por intervalo y las columnas `bin_start`,
+        `bin_end`, `bin_center` y `count`.
+    """
+    data = values.dropna().to_numpy(dtype='float64')
+    if len(data) == 0:
+        return pd.DataFrame(columns=['bin_start', 'bin_end', 'bin_center', 'count'])
+    counts, edges = np.histogram(data, bins=nbins, range=value_range)
+    return pd.DataFrame({
+        'bin_start': edges[:-1],
+        'bin_end': edges[1:],
+        'bin_center': (edges[:-1] + edges[1:]) / 2,
+        'count': counts,
+    })
+
+
+def _grid_cells(x: np.ndarray, y: np.ndarray, grid_size: int) -> np.ndarray:
+    """Asigna cada punto a una celda de una rejilla de `grid_size` × `grid_size`."""
+    def cell(values):
+        low, high = np.nanmin(values), np.nanmax(values)
+        span = high - low if high > low else 1.0
+        return np.minimum(((values - low) / span * grid_size).astype(np.int64), grid_size - 1)
+
+    return cell(x) * grid_size + cell(y)
+
+
+def downsample_scatter(df: pd.DataFrame, x: str, y: str, max_points: int = 5000,
+                       grid_size: int = 100, seed: int = 0) -> pd.DataFrame:
+    """
+    Reduce una nube de puntos a lo sumo a `max_points` filas.
+
+    Divide el plano en una rejilla y conserva de cada celda una fracción de
+    sus puntos proporcional a su densidad, con al menos un punto por celda
+    ocupada para no perder los valores extremos. La rejilla se limita a
+    `max_points` celdas para que el presupuesto se cumpla siempre. Por
+    debajo del presupuesto devuelve `df` sin cambios.
+
+    Args:
+        df: DataFrame con las columnas a representar.
+        x: Columna del eje horizontal.
+        y: Columna del eje vertical.
+        max_points: Presupuesto de puntos.
+        grid_size: Número de celdas por eje.
+        seed: Semilla para elegir los puntos de cada celda.
+
+    Returns:
+        Un subconjunto de las filas de `df`.
+    """
+    data = df.dropna(subset=[x, y])
+    if len(data) <= max_points:
+        return data
+
+    grid_size = max(1, min(grid_size, int(np.sqrt(max_points))))
+    cells = _grid_cells(data[x].to_numpy(dtype='float64'), data[y].to_numpy(dtype='float64'),
+                        grid_size)
+    # Orden aleatorio dentro de cada celda: se conservan los primeros de cada una
+    rng = np.random.default_rng(seed)
+    order = np.lexsort((rng.random(len(cells)), cells))
+    sorted_cells = cells[order]
+    unique_cells, starts, counts = np.unique(sorted_cells, return_index=True, return_counts=True)
+
+    occupied = len(unique_cells)
+    fraction = max(max_points - occupied, 0) / len(cells)
+    quotas = np.maximum(1, np.floor(counts * fraction).astype(np.int64))
+
+    cell_index = np.searchsorted(unique_cells, sorted_cells)
+    rank = np.arange(len(cells)) - starts[cell_index]
+    keep = order[rank < quotas[cell_index]]
+    return data.take(np.sort(keep))
+
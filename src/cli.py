@@ -0,0 +1,46 @@
+import argparse
+from typing import List, Optional
+
+from src.artifacts import build_artifacts
+from src.config import load_config, preprocessing_options
+from src.instrumentation import JsonLinesHook
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Punto de entrada `vehicles-build`: genera los artefactos del dashboard.
+
+    Ejecuta el preprocesamiento y las agregaciones una sola vez, fuera de
+    las sesiones interactivas, y deja los resultados en el directorio de
+    artefactos para que el dashboard arranque en modo de sólo lectura.
+    """
+    parser = argparse.ArgumentParser(
+        prog='vehicles-build',
+        description='Precalcula los datos procesados y los agregados del dashboard.'
+    )
+    parser.add_argument('--config', default='config.ini', help='Archivo de configuración')
+    parser.add_argument('--input', help='CSV de entrada (por defecto [files] raw_data)')
+    parser.add_argument('--output-dir', help='Directorio de artefactos (por defecto [files] artifacts_dir)')
+    parser.add_argument('--chunksize', type=int, help='Leer el CSV por bloques de este número de filas')
+    parser.add_argument('--stage-log', help='Añadir los tiempos de cada etapa a este archivo JSON Lines')
+    args = parser.parse_args(argv)
+
+    config = load_config(args.config)
+    file_path = args.input or config.get('files', 'raw_data', fallback='data/raw/vehicles_us.csv')
+    output_dir = args.output_dir or config.get('files', 'artifacts_dir', fallback='data/processed/artifacts')
+    nbins = config.getint('dashboard', 'histogram_bins', fallback=50)
+
+    hook = JsonLinesHook(args.stage_log) if args.stage_log else None
+
+    manifest = build_artifacts(file_path, output_dir, chunksize=args.chunksize, nbins=nbins,
+                               hook=hook, **preprocessing_options(config))
+    print(f"Artefactos generados en {output_dir}")
+    print(f"  Filas procesadas: {manifest['rows']:,}")
+    print(f"  Celdas del cubo: {manifest['cube_rows']:,}")
+    for stage, seconds in manifest['timings'].items():
+        print(f"  {stage}: {seconds:.2f} s")
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,58 @@
+import configparser
+import json
+from typing import Any, Dict
+
+# Ruta por defecto del archivo de configuración del proyecto
+DEFAULT_CONFIG_PATH = 'config.ini'
+
+
+def load_config(path: str = DEFAULT_CONFIG_PATH) -> configparser.ConfigParser:
+    """
+    Lee el archivo de configuración del proyecto.
+
+    Un archivo inexistente produce una configuración vacía, de modo que los
+    valores por defecto (`fallback`) de cada lectura se aplican.
+
+    Args:
+        path: La ruta al archivo INI.
+
+    Returns:
+        Un `ConfigParser` con las secciones del archivo.
+    """
+    config = configparser.ConfigParser()
+    config.read(path, encoding='utf-8')
+    return config
+
+
+def get_json(config: configparser.ConfigParser, section: str, option: str, fallback: Any = None) -> Any:
+    """Lee una opción escrita como JSON (listas, por ejemplo)."""
+    value = config.get(section, option, fallback=None)
+    return json.loads(value) if value is not None else fallback
+
+
+def preprocessing_options(config: configparser.ConfigParser) -> Dict[str, Any]:
+    """
+    Lee la sección [preprocessing] como argumentos de `load_and_preprocess_data`.
+
+    Sólo se incluyen las opciones presentes en el archivo; las demás toman
+    el valor por defecto del pipeline.
+
+    Returns:
+        Un diccionario con `min_price`, `price_outlier_quantile`,
+        `age_bins`, `age_labels`, `odometer_method` y `statistics` (los
+        que estén definidos).
+    """
+    section = 'preprocessing'
+    if not config.has_section(section):
+        return {}
+    options = {}
+    for option in ('min_price', 'price_outlier_quantile'):
+        if config.has_option(section, option):
+            options[option] = config.getfloat(section, option)
+    for option in ('age_bins', 'age_labels'):
+        if config.has_option(section, option):
+            options[option] = get_json(config, section, option)
+    for option in ('odometer_method', 'statistics'):
+        if config.has_option(section, option):
+            options[option] = config.get(section, option)
+    return options
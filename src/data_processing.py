@@ -1,103 +1,859 @@
+import glob
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Sequence
+
+import numpy as np
 import pandas as pd
 
-def load_and_preprocess_data(file_path: str) -> pd.DataFrame:
+from src.instrumentation import StageHook, run_stage
+
+# Versión del pipeline; incrementarla invalida los datos procesados en caché
+PREPROCESSING_VERSION = 2
+
+
+# Formato de `date_posted` en los CSV (AAAA-MM-DD)
+DATE_FORMAT = '%Y-%m-%d'
+
+# Columnas de texto de baja cardinalidad, leídas directamente como categóricas
+CATEGORICAL_COLUMNS = ['model', 'condition', 'fuel', 'transmission', 'type', 'paint_color']
+
+# Métodos de imputación del odómetro:
+# - 'interpolate': interpolación lineal tras ordenar por edad (comportamiento original)
+# - 'age_median': mediana por edad, sin reordenar el DataFrame
+# - 'model_age_median': mediana por (modelo, edad), con la mediana por edad como respaldo
+ODOMETER_METHODS = ('interpolate', 'age_median', 'model_age_median')
+
+# Cálculo de medianas y cuantiles:
+# - 'exact': ordenando las columnas completas (comportamiento original)
+# - 'sketch': en una pasada con `QuantileSketch`, con error relativo acotado
+STATISTICS = ('exact', 'sketch')
+
+# Error relativo máximo de los cuantiles con `statistics='sketch'`
+SKETCH_RELATIVE_ACCURACY = 0.01
+
+# Valores por defecto de la sección [preprocessing] de config.ini
+DEFAULT_MIN_PRICE = 500
+DEFAULT_PRICE_OUTLIER_QUANTILE = 0.99
+DEFAULT_AGE_BINS = [0, 3, 7, 15, 100]
+DEFAULT_AGE_LABELS = ['Nuevo (0-3)', 'Reciente (4-7)', 'Usado (8-15)', 'Viejo (>15)']
+
+# Escala numérica de la condición del vehículo
+CONDITION_MAP = {
+    'new': 5,      # Mejor condición posible
+    'like new': 4, # Casi nuevo
+    'excellent': 3, # Excelente estado
+    'good': 2,     # Buen estado
+    'fair': 1,     # Estado aceptable
+    'salvage': 0   # Necesita reparación
+}
+
+
+def _group_codes(values: pd.Series) -> tuple:
+    """Devuelve los códigos enteros de grupo (-1 para nulos) y las etiquetas de grupo."""
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        return values.cat.codes.to_numpy().astype(np.intp), values.cat.categories
+    return pd.factorize(values)
+
+
+def _broadcast_lookup(lookup: np.ndarray, codes: np.ndarray) -> np.ndarray:
+    """Lleva una tabla indexada por grupo a cada fila (NaN para grupos nulos)."""
+    return np.where(codes >= 0, lookup[np.maximum(codes, 0)], np.nan)
+
+
+def impute_group_median(df: pd.DataFrame, column: str, by: str = 'model') -> pd.Series:
+    """
+    Rellena los valores ausentes de una columna con la mediana de su grupo.
+
+    Calcula una tabla de medianas por grupo en una sola agregación sobre
+    códigos enteros y la proyecta de vuelta a las filas, evitando una
+    función Python por grupo.
+
+    Args:
+        df: DataFrame de origen.
+        column: Columna numérica a imputar.
+        by: Columna que define los grupos.
+
+    Returns:
+        La columna imputada, alineada con el índice de `df`.
+    """
+    codes, groups = _group_codes(df[by])
+    values = df[column]
+    medians = values.groupby(codes, sort=False).median()
+    medians = medians[medians.index >= 0]
+
+    lookup = np.full(len(groups), np.nan)
+    lookup[medians.index.to_numpy()] = medians.to_numpy()
+    return values.fillna(pd.Series(_broadcast_lookup(lookup, codes), index=df.index))
+
+
+def impute_group_mode(df: pd.DataFrame, column: str, by: str = 'model') -> pd.Series:
+    """
+    Rellena los valores ausentes de una columna con la moda de su grupo.
+
+    Cuenta las combinaciones (grupo, valor) con `np.bincount` sobre códigos
+    enteros. Ante empates se usa el valor más pequeño, igual que
+    `Series.mode()[0]`. Los grupos sin ningún valor conocido quedan sin
+    rellenar (su mediana también sería nula).
+
+    Args:
+        df: DataFrame de origen.
+        column: Columna de baja cardinalidad a imputar.
+        by: Columna que define los grupos.
+
+    Returns:
+        La columna imputada, alineada con el índice de `df`.
+    """
+    codes, groups = _group_codes(df[by])
+    n_groups = len(groups)
+    values = df[column]
+    known = values.notna().to_numpy() & (codes >= 0)
+
+    value_codes, uniques = pd.factorize(values[known], sort=True)
+    lookup = np.full(n_groups, np.nan)
+    if len(uniques):
+        counts = np.bincount(
+            codes[known] * len(uniques) + value_codes,
+            minlength=n_groups * len(uniques),
+        ).reshape(n_groups, len(uniques))
+        has_values = counts.sum(axis=1) > 0
+        lookup[has_values] = uniques.to_numpy()[counts.argmax(axis=1)][has_values]
+    return values.fillna(pd.Series(_broadcast_lookup(lookup, codes), index=df.index))
+
+
+def impute_from_table(values: pd.Series, groups: pd.Series, table: pd.Series) -> pd.Series:
+    """
+    Rellena los valores ausentes con una tabla de búsqueda por grupo ya calculada.
+
+    Args:
+        values: Columna a imputar.
+        groups: Columna de grupos alineada con `values`.
+        table: Valor de relleno indexado por etiqueta de grupo.
+
+    Returns:
+        La columna imputada, alineada con el índice de `values`.
+    """
+    codes, labels = _group_codes(groups)
+    lookup = table.reindex(labels).to_numpy(dtype='float64')
+    return values.fillna(pd.Series(_broadcast_lookup(lookup, codes), index=values.index))
+
+
+def impute_odometer_by_age(df: pd.DataFrame, by_model: bool = False,
+                           age_column: str = 'age_temp', statistics: str = 'exact') -> pd.Series:
+    """
+    Rellena el odómetro con la mediana de los vehículos de la misma edad.
+
+    Las medianas se calculan en una sola pasada vectorizada y se proyectan
+    de vuelta a las filas, sin ordenar ni reordenar el DataFrame, por lo
+    que el resultado no depende del orden de las filas. Los valores que
+    sigan ausentes se rellenan con la mediana global.
+
+    Args:
+        df: DataFrame con las columnas `odometer`, `model` y `age_column`.
+        by_model: Si es True, usa primero la mediana por (modelo, edad) y
+            la mediana por edad sólo como respaldo.
+        age_column: Columna con la edad del vehículo.
+        statistics: Uno de `STATISTICS`; con 'sketch' las medianas salen
+            de un `QuantileSketch` en lugar de ordenar cada grupo.
+
+    Returns:
+        La columna `odometer` imputada, alineada con el índice de `df`.
+    """
+    def fill(values, groups):
+        if statistics == 'sketch':
+            sketch = QuantileSketch()
+            sketch.update(groups, values)
+            return impute_from_table(values, groups, sketch.median())
+        return impute_group_median(
+            pd.DataFrame({'odometer': values, 'key': groups}, index=df.index), 'odometer', 'key'
+        )
+
+    odometer = df['odometer']
+    if by_model:
+        model_codes, _ = _group_codes(df['model'])
+        age_codes, ages = pd.factorize(df[age_column])
+        known = (model_codes >= 0) & (age_codes >= 0)
+        key = np.where(known, model_codes * max(len(ages), 1) + age_codes, np.nan)
+        odometer = fill(odometer, pd.Series(key, index=df.index))
+    odometer = fill(odometer, df[age_column])
+    return odometer.fillna(column_quantile(df['odometer'], 0.5, statistics))
+
+
+class GroupValueCounts:
+    """
+    Conteos acumulables de pares (grupo, valor) para medianas y modas exactas.
+
+    Permite calcular estadísticas por grupo bloque a bloque sin conservar
+    las filas: la memoria depende del número de pares distintos, no del
+    número de filas.
+    """
+
+    def __init__(self):
+        self.counts = pd.Series(dtype='int64')
+
+    def update(self, groups: pd.Series, values: pd.Series) -> None:
+        """Añade los pares (grupo, valor) no nulos de un bloque."""
+        codes, labels = _group_codes(groups)
+        known = values.notna().to_numpy() & (codes >= 0)
+        chunk = pd.Series(values.to_numpy()[known]).groupby(
+            [codes[known], values.to_numpy()[known]], sort=False
+        ).size()
+        chunk.index = pd.MultiIndex.from_arrays([
+            labels.take(chunk.index.get_level_values(0)).astype(object),
+            chunk.index.get_level_values(1).astype('float64'),
+        ])
+        self._add(chunk)
+
+    def merge(self, other: 'GroupValueCounts') -> None:
+        """Acumula los conteos de otra instancia (por ejemplo, de otro archivo)."""
+        self._add(other.counts)
+
+    def _add(self, counts: pd.Series) -> None:
+        if self.counts.empty:
+            self.counts = counts
+        elif not counts.empty:
+            self.counts = self.counts.add(counts, fill_value=0).astype('int64')
+
+    def median(self) -> pd.Series:
+        """Mediana exacta por grupo a partir de los conteos."""
+        counts = self.counts.sort_index()
+        if counts.empty:
+            return pd.Series(dtype='float64')
+        groups = counts.index.get_level_values(0)
+        values = pd.Series(counts.index.get_level_values(1), index=groups)
+        cumulative = counts.groupby(level=0).cumsum().to_numpy()
+        before = cumulative - counts.to_numpy()
+        total = counts.groupby(level=0).transform('sum').to_numpy()
+
+        def value_at(rank):
+            return values[(before <= rank) & (cumulative > rank)]
+
+        low = value_at((total - 1) // 2)
+        high = value_at(total // 2)
+        return (low + high) / 2
+
+    def quantile(self, q: float) -> pd.Series:
+        """Cuantil exacto por grupo, con la interpolación lineal de `Series.quantile`."""
+        counts = self.counts.sort_index()
+        if counts.empty:
+            return pd.Series(dtype='float64')
+        groups = counts.index.get_level_values(0)
+        values = pd.Series(counts.index.get_level_values(1), index=groups)
+        cumulative = counts.groupby(level=0).cumsum().to_numpy()
+        before = cumulative - counts.to_numpy()
+        position = (counts.groupby(level=0).sum() - 1) * q
+
+        def value_at(rank):
+            rank = rank.reindex(groups).to_numpy()
+            return values[(before <= rank) & (cumulative > rank)]
+
+        low = value_at(np.floor(position))
+        high = value_at(np.ceil(position))
+        return low + (high - low) * (position - np.floor(position))
+
+    def to_frame(self) -> pd.DataFrame:
+        """Los conteos como tabla `group`, `value`, `count` (por ejemplo, para Parquet)."""
+        if self.counts.empty:
+            return pd.DataFrame({'group': pd.Series(dtype=object), 'value': pd.Series(dtype='float64'),
+                                 'count': pd.Series(dtype='int64')})
+        frame = self.counts.rename('count').reset_index()
+        frame.columns = ['group', 'value', 'count']
+        return frame
+
+    @classmethod
+    def from_frame(cls, frame: pd.DataFrame) -> 'GroupValueCounts':
+        """Reconstruye los conteos guardados con `to_frame`."""
+        counts = cls()
+        if len(frame):
+            counts.counts = frame.set_index(['group', 'value'])['count'].astype('int64')
+            counts.counts.index.names = [None, None]
+        return counts
+
+    def mode(self) -> pd.Series:
+        """Moda por grupo; ante empates, el valor más pequeño."""
+        if self.counts.empty:
+            return pd.Series(dtype='float64')
+        table = self.counts.rename('count').reset_index()
+        table.columns = ['group', 'value', 'count']
+        table = table.sort_values(['count', 'value'], ascending=[False, True])
+        return table.drop_duplicates('group').set_index('group')['value']
+
+
+class QuantileSketch(GroupValueCounts):
+    """
+    Sketch de cuantiles por grupo con error relativo acotado (estilo DDSketch).
+
+    Cada valor se sustituye por el representante de su cubeta logarítmica
+    (cubetas de razón `(1 + a) / (1 - a)`, con `a` la precisión relativa) y
+    se cuentan los pares (grupo, cubeta). Para valores positivos cualquier
+    cuantil (y la mediana) difiere del exacto en menos de `a` veces su
+    valor; los ceros se conservan exactos y los negativos se tratan por su
+    valor absoluto. La memoria depende del número de cubetas ocupadas por
+    grupo (unas 700 para valores entre 1 y 10^6 con `a = 0.01`), no del
+    número de filas, y los sketches se pueden fusionar con `merge`.
+
+    Args:
+        relative_accuracy: Error relativo máximo `a`, entre 0 y 1.
+    """
+
+    def __init__(self, relative_accuracy: float = SKETCH_RELATIVE_ACCURACY):
+        super().__init__()
+        if not 0 < relative_accuracy < 1:
+            raise ValueError(f"La precisión relativa debe estar en (0, 1): {relative_accuracy}")
+        self.relative_accuracy = relative_accuracy
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+
+    def _buckets(self, values: np.ndarray) -> np.ndarray:
+        """Índice entero de la cubeta logarítmica de cada valor no nulo."""
+        with np.errstate(divide='ignore'):
+            return np.ceil(np.log(np.abs(values)) / np.log(self._gamma))
+
+    def _representatives(self, buckets: np.ndarray) -> np.ndarray:
+        return 2 * self._gamma ** buckets / (self._gamma + 1)
+
+    def quantize(self, values: np.ndarray) -> np.ndarray:
+        """Representante de la cubeta de cada valor (a distancia relativa < `a`)."""
+        values = np.asarray(values, dtype='float64')
+        nonzero = (values != 0) & ~np.isnan(values)
+        quantized = values.copy()
+        quantized[nonzero] = np.sign(values[nonzero]) * self._representatives(self._buckets(values[nonzero]))
+        return quantized
+
+    def update(self, groups: pd.Series, values: pd.Series) -> None:
+        """
+        Añade los pares (grupo, valor) no nulos de un bloque.
+
+        Los pares (grupo, cubeta con signo) se cuentan con `np.bincount`
+        sobre enteros, en una sola pasada y sin ordenar los valores.
+        """
+        codes, labels = _group_codes(groups)
+        data = values.to_numpy(dtype='float64')
+        known = ~np.isnan(data) & (codes >= 0)
+        codes, data = codes[known], data[known]
+        if not len(data):
+            return
+
+        # Cubeta con signo desplazada a [0, 2 * span]; el 0 exacto queda en el centro
+        nonzero = data != 0
+        buckets = np.zeros(len(data), dtype=np.int64)
+        if nonzero.any():
+            raw = self._buckets(data[nonzero]).astype(np.int64)
+            low = raw.min()
+            buckets[nonzero] = np.sign(data[nonzero]).astype(np.int64) * (raw - low + 1)
+            span = int(raw.max() - low + 1)
+        else:
+            low, span = 0, 0
+        width = 2 * span + 1
+        keys = codes.astype(np.int64) * width + buckets + span
+        if len(labels) * width <= 4 * len(keys) + 1024:
+            counts = np.bincount(keys, minlength=len(labels) * width)
+            occupied = np.flatnonzero(counts)
+            counts = counts[occupied]
+        else:
+            occupied, counts = np.unique(keys, return_counts=True)
+
+        signed = occupied % width - span
+        representatives = np.sign(signed) * self._representatives(np.abs(signed) - 1 + low)
+        chunk = pd.Series(counts.astype('int64'), index=pd.MultiIndex.from_arrays([
+            labels.take(occupied // width).astype(object),
+            np.where(signed == 0, 0.0, representatives),
+        ]))
+        self._add(chunk)
+
+    def merge(self, other: 'GroupValueCounts') -> None:
+        """Acumula otro sketch con la misma precisión."""
+        if getattr(other, 'relative_accuracy', None) != self.relative_accuracy:
+            raise ValueError("Sólo se pueden fusionar sketches con la misma precisión relativa")
+        super().merge(other)
+
+
+def column_quantile(values: pd.Series, q: float, statistics: str = 'exact') -> float:
+    """
+    Cuantil de una columna, exacto o con `QuantileSketch`.
+
+    Args:
+        values: Columna numérica; los nulos se ignoran.
+        q: Cuantil entre 0 y 1.
+        statistics: Uno de `STATISTICS`.
+
+    Returns:
+        El cuantil, o NaN si no hay valores.
+    """
+    if statistics == 'sketch':
+        sketch = QuantileSketch()
+        sketch.update(pd.Series(0, index=values.index), values)
+        quantiles = sketch.quantile(q)
+        return float(quantiles.iloc[0]) if len(quantiles) else np.nan
+    return values.quantile(q)
+
+
+def _map_values(values: pd.Series, mapping: dict) -> pd.Series:
+    """Aplica `mapping` a una columna, resolviéndolo sobre las categorías si es categórica."""
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        return pd.Series(np.asarray(values.map(mapping)), index=values.index)
+    return values.map(mapping)
+
+
+def parse_dates(values: pd.Series) -> pd.Series:
+    """
+    Convierte fechas en texto con formato `DATE_FORMAT` a datetime.
+
+    Con un formato explícito pandas no tiene que deducirlo, y si los valores
+    son categóricos sólo se convierte cada fecha distinta (unos cientos)
+    y el resultado se reparte por los códigos.
+
+    Raises:
+        ValueError: Si alguna fecha no tiene el formato esperado.
+    """
+    if not isinstance(values.dtype, pd.CategoricalDtype):
+        return pd.to_datetime(values, format=DATE_FORMAT)
+    dates = pd.to_datetime(values.cat.categories, format=DATE_FORMAT).to_numpy()
+    # El código -1 (nulo) toma el último elemento, NaT
+    dates = np.append(dates, np.datetime64('NaT', 'ns'))
+    return pd.Series(dates[values.cat.codes.to_numpy()], index=values.index, name=values.name)
+
+
+def _extract_manufacturer(model: pd.Series) -> pd.Series:
+    """Extrae la marca (primera palabra del modelo, en formato título)."""
+    if isinstance(model.dtype, pd.CategoricalDtype):
+        names = model.cat.categories.str.split().str[0].str.title()
+        name_codes, manufacturers = pd.factorize(names, sort=True)
+        codes = model.cat.codes.to_numpy()
+        manufacturer_codes = np.where(codes >= 0, name_codes[np.maximum(codes, 0)], -1)
+        return pd.Series(
+            pd.Categorical.from_codes(manufacturer_codes, categories=manufacturers),
+            index=model.index,
+        )
+    return model.str.split().str[0].str.title()
+
+
+def _fill_category(values: pd.Series, value: str) -> pd.Series:
+    """Rellena los nulos de una columna categórica, añadiendo la categoría (en orden) si falta."""
+    if isinstance(values.dtype, pd.CategoricalDtype) and value not in values.cat.categories:
+        values = values.cat.set_categories(values.cat.categories.union([value]))
+    return values.fillna(value)
+
+
+def _concat_categorical(frames: list) -> pd.DataFrame:
+    """Concatena bloques unificando (y ordenando) las categorías de sus columnas categóricas."""
+    first = frames[0]
+    for column in first.columns:
+        if isinstance(first[column].dtype, pd.CategoricalDtype):
+            categories = pd.api.types.union_categoricals(
+                [frame[column] for frame in frames], sort_categories=True, ignore_order=True
+            ).categories
+            for frame in frames:
+                frame[column] = frame[column].cat.set_categories(categories)
+    return pd.concat(frames)
+
+
+class _IngestState:
+    """
+    Estado acumulado de la lectura por bloques.
+
+    De cada bloque se conservan:
+
+    - Los conteos (modelo, año) y (modelo, cilindros) para las imputaciones
+      por grupo.
+    - Una proyección mínima de todas las filas (modelo, año de publicación,
+      año del modelo y odómetro) para reproducir la interpolación global
+      del odómetro.
+    - Las filas completas con precio válido, que son las únicas que pueden
+      llegar al resultado.
+
+    Las filas se numeran en orden de lectura, de modo que varios estados
+    (uno por archivo) pueden fusionarse como si se hubiera leído un único
+    CSV concatenado.
+    """
+
+    def __init__(self, min_price: float = DEFAULT_MIN_PRICE):
+        self.min_price = min_price
+        self.year_counts = GroupValueCounts()
+        self.cylinder_counts = GroupValueCounts()
+        self.anchors = []
+        self.kept = []
+        self.rows = 0
+
+    def __len__(self) -> int:
+        return self.rows
+
+    @property
+    def nbytes(self) -> int:
+        """Memoria de la proyección mínima y de las filas conservadas."""
+        return int(sum(frame.memory_usage(index=True, deep=True).sum()
+                       for frame in self.anchors + self.kept))
+
+    def add_block(self, chunk: pd.DataFrame) -> None:
+        """Aplica la limpieza local por fila a un bloque y acumula lo necesario."""
+        chunk.index = pd.RangeIndex(self.rows, self.rows + len(chunk))
+        self.rows += len(chunk)
+
+        chunk['date_posted'] = parse_dates(chunk['date_posted'])
+        chunk['model_year'] = pd.to_numeric(chunk['model_year'], errors='coerce')
+        chunk['cylinders'] = pd.to_numeric(chunk['cylinders'], errors='coerce')
+        self.year_counts.update(chunk['model'], chunk['model_year'])
+        self.cylinder_counts.update(chunk['model'], chunk['cylinders'])
+
+        self.anchors.append(pd.DataFrame({
+            'model': chunk['model'],
+            'posted_year': chunk['date_posted'].dt.year.astype('int16'),
+            'model_year': chunk['model_year'],
+            'odometer': chunk['odometer'],
+        }))
+
+        chunk['paint_color'] = _fill_category(chunk['paint_color'], 'unknown')
+        chunk['is_4wd'] = chunk['is_4wd'].fillna(0)
+        self.kept.append(chunk[chunk['price'].notna() & (chunk['price'] > self.min_price)])
+
+    def compact(self) -> None:
+        """Une los bloques acumulados en un único DataFrame por tipo."""
+        if len(self.anchors) > 1:
+            self.anchors = [_concat_categorical(self.anchors)]
+            self.kept = [_concat_categorical(self.kept)]
+
+    def merge(self, other: '_IngestState') -> None:
+        """Añade a continuación las filas y conteos de otro estado."""
+        for frame in other.anchors + other.kept:
+            frame.index = frame.index + self.rows
+        self.anchors.extend(other.anchors)
+        self.kept.extend(other.kept)
+        self.year_counts.merge(other.year_counts)
+        self.cylinder_counts.merge(other.cylinder_counts)
+        self.rows += other.rows
+
+    def finish(self, odometer_method: str = 'interpolate', statistics: str = 'exact') -> pd.DataFrame:
+        """
+        Aplica los pasos globales (imputaciones por modelo y del odómetro).
+
+        Args:
+            odometer_method: Uno de `ODOMETER_METHODS`.
+            statistics: Uno de `STATISTICS` (medianas del odómetro por edad).
+
+        Returns:
+            Un DataFrame equivalente al de la ruta estándar antes del
+            tratamiento de valores atípicos, en el mismo orden de filas.
+        """
+        year_medians = self.year_counts.median()
+        anchors = _concat_categorical(self.anchors)
+        self.anchors = []
+        anchors['model_year'] = impute_from_table(anchors['model_year'], anchors['model'], year_medians)
+
+        # Misma imputación del odómetro que la ruta estándar, sobre la proyección mínima
+        anchors['age_temp'] = anchors['posted_year'] - anchors['model_year']
+        if odometer_method == 'interpolate':
+            anchors = anchors.sort_values('age_temp')
+            odometer = anchors['odometer'].interpolate(method='linear', limit_direction='forward')
+            odometer = odometer.fillna(odometer.median())
+        else:
+            odometer = impute_odometer_by_age(anchors, by_model=(odometer_method == 'model_age_median'),
+                                              statistics=statistics)
+        del anchors
+
+        df = _concat_categorical(self.kept)
+        self.kept = []
+        if odometer_method == 'interpolate':
+            order = odometer.index[odometer.index.isin(df.index)]
+            df = df.loc[order]
+        df['odometer'] = odometer.loc[df.index]
+        df['model_year'] = impute_from_table(df['model_year'], df['model'], year_medians)
+        df['cylinders'] = impute_from_table(df['cylinders'], df['model'], self.cylinder_counts.mode())
+        return df.dropna(subset=['price', 'model_year'])
+
+
+# Tipos de lectura: el texto se convierte a categórico en el propio parser. Las
+# fechas también: hay pocos días distintos y así cada uno se convierte una sola vez
+_TEXT_DTYPES = {column: 'category' for column in CATEGORICAL_COLUMNS + ['date_posted']}
+
+
+def _read_csv(file_path: str) -> pd.DataFrame:
+    """Lee un CSV completo con las columnas de texto como categóricas."""
+    return pd.read_csv(file_path, dtype=_TEXT_DTYPES)
+
+
+def _read_csv_blocks(file_path: str, chunksize: Optional[int],
+                     min_price: float = DEFAULT_MIN_PRICE) -> _IngestState:
+    """Lee un CSV (por bloques si se indica `chunksize`) con texto categórico."""
+    state = _IngestState(min_price)
+    if chunksize:
+        for chunk in pd.read_csv(file_path, dtype=_TEXT_DTYPES, chunksize=chunksize):
+            state.add_block(chunk)
+    else:
+        state.add_block(_read_csv(file_path))
+    return state
+
+
+def _read_shard(file_path: str, chunksize: Optional[int],
+                min_price: float = DEFAULT_MIN_PRICE) -> _IngestState:
+    """Tarea de un proceso trabajador: lee y limpia un archivo completo."""
+    state = _read_csv_blocks(file_path, chunksize, min_price)
+    state.compact()
+    return state
+
+
+def _read_shards(files: List[str], max_workers: Optional[int], chunksize: Optional[int],
+                 min_price: float) -> _IngestState:
+    """Lee los archivos (en paralelo si hay varios) y fusiona sus estados en orden."""
+    state = _IngestState(min_price)
+    if max_workers == 1 or len(files) == 1:
+        for path in files:
+            state.merge(_read_shard(path, chunksize, min_price))
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            shards = executor.map(_read_shard, files, [chunksize] * len(files),
+                                  [min_price] * len(files))
+            for shard in shards:
+                state.merge(shard)
+    return state
+
+
+def resolve_shards(source: str) -> List[str]:
+    """
+    Devuelve los archivos CSV de un directorio o patrón glob, ordenados por nombre.
+
+    Raises:
+        FileNotFoundError: Si no hay ningún archivo.
+    """
+    pattern = os.path.join(source, '*.csv') if os.path.isdir(source) else source
+    files = sorted(glob.glob(pattern))
+    if not files:
+        raise FileNotFoundError(f"No se encontraron archivos CSV en {source}")
+    return files
+
+
+def load_and_preprocess_files(source: str, max_workers: Optional[int] = None,
+                              chunksize: Optional[int] = None,
+                              odometer_method: str = 'interpolate',
+                              min_price: float = DEFAULT_MIN_PRICE,
+                              price_outlier_quantile: float = DEFAULT_PRICE_OUTLIER_QUANTILE,
+                              age_bins: Optional[Sequence[float]] = None,
+                              age_labels: Optional[Sequence[str]] = None,
+                              statistics: str = 'exact',
+                              hook: Optional[StageHook] = None) -> pd.DataFrame:
+    """
+    Carga y preprocesa varios CSV (por ejemplo, `vehicles_us_*.csv` diarios).
+
+    Cada archivo se lee y recibe la limpieza local por fila en un proceso
+    de un `ProcessPoolExecutor`. Los pasos globales (medianas y modas por
+    modelo, interpolación del odómetro y cuantil del precio) se aplican
+    después sobre el conjunto fusionado, así que el resultado es el mismo
+    que procesar los archivos concatenados en orden de nombre.
+
+    Args:
+        source: Directorio (se usan sus `*.csv`) o patrón glob.
+        max_workers: Número de procesos; por defecto, uno por CPU.
+        chunksize: Si se indica, cada archivo se lee por bloques.
+        odometer_method: Uno de `ODOMETER_METHODS`.
+        min_price, price_outlier_quantile, age_bins, age_labels, statistics, hook:
+            Como en `load_and_preprocess_data`.
+
+    Returns:
+        Un DataFrame de pandas con los datos procesados, con columnas de
+        texto categóricas.
+    """
+    age_bins, age_labels = _check_options(odometer_method, price_outlier_quantile,
+                                          age_bins, age_labels, statistics)
+    files = resolve_shards(source)
+    state = run_stage(hook, 'read_shards', _read_shards, files, max_workers, chunksize, min_price)
+    df = run_stage(hook, 'impute_global', _IngestState.finish, state, odometer_method, statistics)
+    return _trim_and_engineer(df, min_price, price_outlier_quantile, age_bins, age_labels,
+                              statistics, hook)
+
+
+def _check_options(odometer_method: str, price_outlier_quantile: float,
+                   age_bins: Optional[Sequence[float]],
+                   age_labels: Optional[Sequence[str]], statistics: str = 'exact') -> tuple:
+    """Valida las opciones del pipeline y devuelve los intervalos de edad a usar."""
+    if odometer_method not in ODOMETER_METHODS:
+        raise ValueError(
+            f"Método de imputación del odómetro desconocido: {odometer_method!r}; "
+            f"use uno de {ODOMETER_METHODS}"
+        )
+    if statistics not in STATISTICS:
+        raise ValueError(f"Cálculo de estadísticas desconocido: {statistics!r}; use uno de {STATISTICS}")
+    if not 0 < price_outlier_quantile <= 1:
+        raise ValueError(
+            f"El cuantil de precios atípicos debe estar en (0, 1]: {price_outlier_quantile}"
+        )
+    age_bins = list(age_bins) if age_bins is not None else DEFAULT_AGE_BINS
+    age_labels = list(age_labels) if age_labels is not None else DEFAULT_AGE_LABELS
+    if len(age_labels) != len(age_bins) - 1:
+        raise ValueError(
+            f"Se esperaban {len(age_bins) - 1} etiquetas de edad para {len(age_bins)} "
+            f"límites, pero hay {len(age_labels)}"
+        )
+    return age_bins, age_labels
+
+
+def load_and_preprocess_data(file_path: str, chunksize: Optional[int] = None,
+                             odometer_method: str = 'interpolate',
+                             min_price: float = DEFAULT_MIN_PRICE,
+                             price_outlier_quantile: float = DEFAULT_PRICE_OUTLIER_QUANTILE,
+                             age_bins: Optional[Sequence[float]] = None,
+                             age_labels: Optional[Sequence[str]] = None,
+                             statistics: str = 'exact',
+                             hook: Optional[StageHook] = None) -> pd.DataFrame:
     """
     Carga los datos desde un archivo CSV, los preprocesa y devuelve un DataFrame.
 
+    Con `chunksize` el archivo se lee por bloques con columnas de texto
+    categóricas, de modo que la memoria máxima depende del tamaño del
+    resultado y no del CSV completo. El contenido es el mismo que el de la
+    lectura completa; sólo cambian los tipos de las columnas de texto.
+
+    El pipeline se ejecuta como una serie de etapas con nombre (`read`,
+    `coerce_types`, `impute_groups`, `impute_odometer`, `fill_defaults`,
+    `drop_missing`, `trim_outliers`, `engineer_features` y
+    `optimize_dtypes`; en la lectura por bloques las cinco primeras son
+    `read_blocks` e `impute_global`). Si se indica `hook`, recibe al final
+    de cada etapa su tiempo, filas de entrada y salida y variación de
+    memoria (ver `src.instrumentation`).
+
     Args:
         file_path: La ruta al archivo CSV.
+        chunksize: Número de filas por bloque para la lectura por bloques.
+        odometer_method: Imputación del odómetro, uno de `ODOMETER_METHODS`.
+            'interpolate' (por defecto) ordena las filas por edad; los
+            métodos por mediana conservan el orden original.
+        min_price: Se descartan los anuncios con precio menor o igual.
+        price_outlier_quantile: Se descartan los precios por encima de
+            este cuantil.
+        age_bins: Límites de `age_category` (intervalos cerrados por la
+            izquierda); por defecto `DEFAULT_AGE_BINS`.
+        age_labels: Etiquetas de `age_category`, una por intervalo.
+        statistics: Uno de `STATISTICS`. Con 'sketch' la mediana del año
+            por modelo sale de conteos (los años distintos son pocos) y las
+            medianas del odómetro por edad y el cuantil de precio de un
+            `QuantileSketch`, en una pasada y sin ordenar las columnas, con
+            un error relativo menor que `SKETCH_RELATIVE_ACCURACY`. La
+            interpolación del odómetro siempre ordena por edad.
+        hook: Función que recibe un evento por etapa.
 
     Returns:
         Un DataFrame de pandas con los datos procesados.
+
+    Raises:
+        ValueError: Si alguna opción no es válida.
     """
-    # Leer datos
-    df = pd.read_csv(file_path)
-    
-    # --- Limpieza y Preprocesamiento ---
+    age_bins, age_labels = _check_options(odometer_method, price_outlier_quantile,
+                                          age_bins, age_labels, statistics)
+    if chunksize:
+        state = run_stage(hook, 'read_blocks', _read_csv_blocks, file_path, chunksize, min_price)
+        df = run_stage(hook, 'impute_global', _IngestState.finish, state, odometer_method, statistics)
+        return _trim_and_engineer(df, min_price, price_outlier_quantile, age_bins, age_labels,
+                                  statistics, hook)
+
+    df = run_stage(hook, 'read', _read_csv, file_path)
+    df = run_stage(hook, 'coerce_types', _coerce_types, df)
+    df = run_stage(hook, 'impute_groups', _impute_groups, df, statistics)
+    df = run_stage(hook, 'impute_odometer', _impute_odometer, df, odometer_method, statistics)
+    df = run_stage(hook, 'fill_defaults', _fill_defaults, df)
+    df = run_stage(hook, 'drop_missing', _drop_missing, df)
+    return _trim_and_engineer(df, min_price, price_outlier_quantile, age_bins, age_labels,
+                              statistics, hook)
+
 
+# --- Etapas del pipeline ---
+
+def _coerce_types(df: pd.DataFrame) -> pd.DataFrame:
+    """Convierte las fechas y las columnas numéricas leídas como texto."""
     # Convertir 'date_posted' a datetime
-    df['date_posted'] = pd.to_datetime(df['date_posted'])
-    
+    df['date_posted'] = parse_dates(df['date_posted'])
+
     # Asegurar que 'model_year' y 'cylinders' sean numéricos, convirtiendo errores a NaN
     df['model_year'] = pd.to_numeric(df['model_year'], errors='coerce')
     df['cylinders'] = pd.to_numeric(df['cylinders'], errors='coerce')
+    return df
 
-    # --- Manejo de Valores Ausentes ---
 
-    # Rellenar 'model_year' con la mediana por grupo de 'model'
-    df['model_year'] = df.groupby('model')['model_year'].transform(
-        lambda x: x.fillna(x.median())
-    )
+def _impute_groups(df: pd.DataFrame, statistics: str = 'exact') -> pd.DataFrame:
+    """Rellena año del modelo y cilindros con la mediana y la moda por modelo."""
+    if statistics == 'sketch':
+        year_counts = GroupValueCounts()
+        year_counts.update(df['model'], df['model_year'])
+        df['model_year'] = impute_from_table(df['model_year'], df['model'], year_counts.median())
+    else:
+        df['model_year'] = impute_group_median(df, 'model_year')
+    df['cylinders'] = impute_group_mode(df, 'cylinders')
+    return df
 
-    # Rellenar 'cylinders' con la moda por grupo de 'model'
-    # Si la moda está vacía, se usa la mediana del grupo
-    df['cylinders'] = df.groupby('model')['cylinders'].transform(
-        lambda x: x.fillna(x.mode()[0] if not x.mode().empty else x.median())
-    )
 
-    # Rellenar 'odometer' usando interpolación lineal por edad
-    # Primero, calculamos una edad temporal para ordenar
+def _impute_odometer(df: pd.DataFrame, odometer_method: str, statistics: str = 'exact') -> pd.DataFrame:
+    """Rellena 'odometer' según la edad del vehículo."""
+    # Primero, calculamos una edad temporal
     df['age_temp'] = df['date_posted'].dt.year - df['model_year']
-    df = df.sort_values('age_temp')
-    df['odometer'] = df['odometer'].interpolate(method='linear', limit_direction='forward')
-    # Rellenar los restantes (si los hay) con la mediana global
-    df['odometer'] = df['odometer'].fillna(df['odometer'].median())
+    if odometer_method == 'interpolate':
+        # Interpolación lineal tras ordenar por edad
+        df = df.sort_values('age_temp')
+        df['odometer'] = df['odometer'].interpolate(method='linear', limit_direction='forward')
+        # Rellenar los restantes (si los hay) con la mediana global
+        df['odometer'] = df['odometer'].fillna(df['odometer'].median())
+    else:
+        # Mediana por edad (y modelo), sin reordenar las filas
+        df['odometer'] = impute_odometer_by_age(df, by_model=(odometer_method == 'model_age_median'),
+                                                statistics=statistics)
+    return df
 
+
+def _fill_defaults(df: pd.DataFrame) -> pd.DataFrame:
+    """Rellena las columnas con un valor por defecto conocido."""
     # Rellenar 'paint_color' con 'unknown'
-    df['paint_color'] = df['paint_color'].fillna('unknown')
+    df['paint_color'] = _fill_category(df['paint_color'], 'unknown')
 
     # Rellenar 'is_4wd' con 0 (asumiendo que si no se especifica, no es 4WD)
     df['is_4wd'] = df['is_4wd'].fillna(0)
+    return df
 
-    # Eliminar filas donde 'price' o 'model_year' son nulos después del relleno
-    df.dropna(subset=['price', 'model_year'], inplace=True)
 
-    # --- Tratamiento de Valores Atípicos ---
+def _drop_missing(df: pd.DataFrame) -> pd.DataFrame:
+    """Elimina filas donde 'price' o 'model_year' son nulos después del relleno."""
+    return df.dropna(subset=['price', 'model_year'])
 
-    # Eliminar anuncios con precios irrisorios
-    df = df[df['price'] > 500]
 
-    # Eliminar precios extremadamente altos (cuantil 0.99)
-    q99 = df['price'].quantile(0.99)
-    df = df[df['price'] <= q99]
+def _trim_outliers(df: pd.DataFrame, min_price: float, price_outlier_quantile: float,
+                   statistics: str = 'exact') -> pd.DataFrame:
+    """Elimina los precios irrisorios y los extremadamente altos."""
+    df = df[df['price'] > min_price]
+    upper = column_quantile(df['price'], price_outlier_quantile, statistics)
+    return df[df['price'] <= upper]
 
-    # --- Creación de Nuevas Características (Feature Engineering) ---
 
+def _engineer_features(df: pd.DataFrame, age_bins: Sequence[float],
+                       age_labels: Sequence[str]) -> pd.DataFrame:
+    """Crea edad, fabricante, categoría de edad y puntuación de condición."""
     # Crear columna de edad del vehículo
     df['age'] = df['date_posted'].dt.year - df['model_year']
     # Eliminar vehículos con edad negativa (error en los datos)
     df = df[df['age'] >= 0]
 
     # Extraer marca del modelo
-    df['manufacturer'] = df['model'].str.split().str[0].str.title()
+    df['manufacturer'] = _extract_manufacturer(df['model'])
 
     # Clasificar por categoría de edad según reglas de negocio
-    df['age_category'] = pd.cut(
-        df['age'],
-        bins=[0, 3, 7, 15, 100],
-        labels=['Nuevo (0-3)', 'Reciente (4-7)', 'Usado (8-15)', 'Viejo (>15)'],
-        right=False
-    )
+    df['age_category'] = pd.cut(df['age'], bins=age_bins, labels=age_labels, right=False)
 
     # Convertir condición a escala numérica para análisis cuantitativos
-    condition_map = {
-        'new': 5,      # Mejor condición posible
-        'like new': 4, # Casi nuevo
-        'excellent': 3, # Excelente estado
-        'good': 2,     # Buen estado
-        'fair': 1,     # Estado aceptable
-        'salvage': 0   # Necesita reparación
-    }
-    df['condition_score'] = df['condition'].map(condition_map)
-
-    # Optimización de tipos de datos para reducir uso de memoria
+    df['condition_score'] = _map_values(df['condition'], CONDITION_MAP)
+    return df
+
+
+def _optimize_dtypes(df: pd.DataFrame) -> pd.DataFrame:
+    """Compacta los tipos numéricos y elimina las columnas temporales."""
     df['model_year'] = df['model_year'].astype('int16')  # Años no requieren int64
     df['cylinders'] = df['cylinders'].astype('int8')     # Cilindros típicamente 1-12
     df['is_4wd'] = df['is_4wd'].astype('bool')          # Boolean para banderas
     df['age'] = df['age'].astype('int16')               # Edad no requiere int64
-    
+
     # Eliminar columnas temporales y no necesarias
     if 'age_temp' in df.columns:
         df = df.drop('age_temp', axis=1)
+    return df
+
 
-    return df
\ No newline at end of file
+def _trim_and_engineer(df: pd.DataFrame, min_price: float, price_outlier_quantile: float,
+                       age_bins: Sequence[float], age_labels: Sequence[str], statistics: str,
+                       hook: Optional[StageHook]) -> pd.DataFrame:
+    """Etapas comunes a todas las rutas de lectura."""
+    df = run_stage(hook, 'trim_outliers', _trim_outliers, df, min_price, price_outlier_quantile,
+                   statistics)
+    df = run_stage(hook, 'engineer_features', _engineer_features, df, age_bins, age_labels)
+    return run_stage(hook, 'optimize_dtypes', _optimize_dtypes, df)
@@ -0,0 +1,116 @@
+import time
+from typing import Any, Dict, List, Optional
+
+import pandas as pd
+
+from src.instrumentation import StageHook
+
+# Tipos de medición de una ejecución del dashboard
+DIAGNOSTIC_KINDS = ('filter', 'aggregate', 'chart', 'table')
+
+
+def column_memory(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Memoria de cada columna de un DataFrame, de mayor a menor.
+
+    Returns:
+        Un DataFrame indexado por columna con `dtype`, `bytes` (incluido el
+        texto de las columnas `object` y las categorías) y `share`, la
+        fracción del total. La fila del índice se llama `(index)`.
+    """
+    usage = df.memory_usage(index=True, deep=True).rename({'Index': '(index)'})
+    dtypes = df.dtypes.astype(str).reindex(usage.index).fillna(type(df.index).__name__)
+    table = pd.DataFrame({'dtype': dtypes, 'bytes': usage.astype('int64')})
+    table['share'] = table['bytes'] / max(int(table['bytes'].sum()), 1)
+    table.index.name = 'column'
+    return table.sort_values('bytes', ascending=False)
+
+
+def cache_report(caches: Dict[str, dict]) -> pd.DataFrame:
+    """
+    Tabla de aciertos y fallos a partir de los `cache_info()` de varias cachés.
+
+    Acepta el formato de `AggregateCache` y `TableView` (`hits`, `misses`,
+    `size`, `maxsize`) y el de `SectionCache`, que se desglosa en una fila
+    por sección (`nombre.sección`).
+
+    Args:
+        caches: `cache_info()` de cada caché por nombre.
+
+    Returns:
+        Un DataFrame indexado por caché con `hits`, `misses`, `hit_rate`,
+        `size` y `maxsize` (vacíos en las filas por sección).
+    """
+    rows: List[Dict[str, Any]] = []
+    for name, info in caches.items():
+        if 'sections' in info:
+            hits = sum(stats['hits'] for stats in info['sections'].values())
+            misses = sum(stats['misses'] for stats in info['sections'].values())
+            rows.append({'cache': name, 'hits': hits, 'misses': misses,
+                         'size': info.get('size'), 'maxsize': info.get('maxsize')})
+            rows.extend({'cache': f"{name}.{section}", **stats} for section, stats in info['sections'].items())
+        else:
+            rows.append({'cache': name, **{key: info.get(key) for key in ('hits', 'misses', 'size', 'maxsize')}})
+    table = pd.DataFrame(rows, columns=['cache', 'hits', 'misses', 'size', 'maxsize']).set_index('cache')
+    lookups = table['hits'] + table['misses']
+    table.insert(2, 'hit_rate', (table['hits'] / lookups.where(lookups > 0)).astype('float64'))
+    return table
+
+
+class SessionProfile:
+    """
+    Mediciones de una ejecución del dashboard.
+
+    Es un hook (como `StageRecorder`) para `timed` y `run_stage`: guarda
+    cada evento añadiéndole el contexto (sesión, ejecución, modo...) y lo
+    reenvía a `hook`, por ejemplo un `JsonLinesHook` para el log
+    estructurado. Cuando el diagnóstico está desactivado el dashboard no
+    crea ningún perfil y `timed(None, ...)` no mide nada.
+
+    Args:
+        hook: Destino adicional de los eventos.
+        **context: Campos que se añaden a todos los eventos.
+    """
+
+    def __init__(self, hook: Optional[StageHook] = None, **context: Any):
+        self.hook = hook
+        self.context = context
+        self.events: List[Dict[str, Any]] = []
+        self._started_at = time.perf_counter()
+
+    def __call__(self, event: Dict[str, Any]) -> None:
+        event = dict(event, **self.context)
+        self.events.append(event)
+        if self.hook is not None:
+            self.hook(event)
+
+    def to_frame(self) -> pd.DataFrame:
+        """Una fila por medición (`stage`, `kind`, `seconds`), en orden."""
+        frame = pd.DataFrame(self.events, columns=['stage', 'kind', 'seconds'])
+        frame['kind'] = frame['kind'].fillna('')
+        return frame
+
+    def totals(self) -> Dict[str, float]:
+        """Segundos por tipo de medición (`DIAGNOSTIC_KINDS`), incluidos los que no aparecen."""
+        totals = {kind: 0.0 for kind in DIAGNOSTIC_KINDS}
+        for event in self.events:
+            kind = event.get('kind')
+            if kind in totals:
+                totals[kind] += event['seconds']
+        return totals
+
+    def finish(self, **fields: Any) -> Dict[str, Any]:
+        """
+        Cierra la ejecución con un evento `run`.
+
+        El evento contiene los segundos transcurridos desde que se creó el
+        perfil, los totales por tipo y los campos adicionales (por ejemplo,
+        la memoria por columna y el estado de las cachés).
+
+        Returns:
+            El evento enviado.
+        """
+        event = dict(fields, stage='run', kind='run',
+                     seconds=time.perf_counter() - self._started_at, totals=self.totals())
+        self(event)
+        return event
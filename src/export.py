@@ -0,0 +1,172 @@
+import tempfile
+import time
+import zlib
+from typing import BinaryIO, Iterator, Optional
+
+import numpy as np
+import pandas as pd
+
+# Filas serializadas por bloque
+DEFAULT_CHUNK_ROWS = 50_000
+
+# Filas de una hoja de Excel, incluida la cabecera
+EXCEL_MAX_ROWS = 1_048_576
+
+# Tamaño de los bloques leídos de los archivos temporales
+_READ_BLOCK_SIZE = 1 << 20
+
+# Formatos disponibles: extensión y tipo MIME
+EXPORT_FORMATS = {
+    'csv': {'extension': 'csv', 'mime': 'text/csv'},
+    'csv.gz': {'extension': 'csv.gz', 'mime': 'application/gzip'},
+    'xlsx': {'extension': 'xlsx',
+             'mime': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'},
+    'parquet': {'extension': 'parquet', 'mime': 'application/vnd.apache.parquet'},
+}
+
+
+class ExportStats:
+    """Bytes escritos, filas y tiempo de una exportación."""
+
+    def __init__(self):
+        self.rows = 0
+        self.bytes_written = 0
+        self.seconds = 0.0
+
+    @property
+    def bytes_per_second(self) -> float:
+        return self.bytes_written / self.seconds if self.seconds else 0.0
+
+
+def _row_chunks(df: pd.DataFrame, chunk_rows: int,
+                positions: Optional[np.ndarray] = None) -> Iterator[pd.DataFrame]:
+    # Con posiciones se extraen las filas de cada bloque sin copiar antes toda la selección
+    n_rows = len(df) if positions is None else len(positions)
+    for start in range(0, n_rows, chunk_rows):
+        if positions is None:
+            yield df.iloc[start:start + chunk_rows]
+        else:
+            yield df.take(positions[start:start + chunk_rows])
+
+
+def _iter_csv(df: pd.DataFrame, chunk_rows: int, compress: bool,
+              positions: Optional[np.ndarray] = None) -> Iterator[bytes]:
+    compressor = zlib.compressobj(wbits=31) if compress else None  # wbits=31: formato gzip
+    chunks = _row_chunks(df, chunk_rows, positions)
+    first = True
+    for chunk in chunks:
+        data = chunk.to_csv(index=False, header=first).encode('utf-8')
+        first = False
+        yield compressor.compress(data) if compressor else data
+    if first:
+        # Sin filas: sólo la cabecera
+        data = df.head(0).to_csv(index=False).encode('utf-8')
+        yield compressor.compress(data) if compressor else data
+    if compressor:
+        yield compressor.flush()
+
+
+def _iter_file(file_obj: BinaryIO) -> Iterator[bytes]:
+    file_obj.seek(0)
+    for block in iter(lambda: file_obj.read(_READ_BLOCK_SIZE), b''):
+        yield block
+
+
+def _iter_xlsx(df: pd.DataFrame, chunk_rows: int,
+               positions: Optional[np.ndarray] = None) -> Iterator[bytes]:
+    from openpyxl import Workbook
+
+    # Libro en modo sólo escritura: las filas se vuelcan al disco al añadirse
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet()
+    sheet.append([str(column) for column in df.columns])
+    for chunk in _row_chunks(df, chunk_rows, positions):
+        values = chunk.astype(object).where(chunk.notna(), None)
+        for row in values.itertuples(index=False, name=None):
+            sheet.append(row)
+    with tempfile.TemporaryFile() as tmp:
+        workbook.save(tmp)
+        yield from _iter_file(tmp)
+
+
+def _iter_parquet(df: pd.DataFrame, chunk_rows: int,
+                  positions: Optional[np.ndarray] = None) -> Iterator[bytes]:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = pa.Schema.from_pandas(df.head(0), preserve_index=False)
+    with tempfile.TemporaryFile() as tmp:
+        with pq.ParquetWriter(tmp, schema) as writer:
+            for chunk in _row_chunks(df, chunk_rows, positions):
+                writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+        yield from _iter_file(tmp)
+
+
+def iter_export(df: pd.DataFrame, fmt: str, chunk_rows: int = DEFAULT_CHUNK_ROWS,
+                stats: Optional[ExportStats] = None,
+                positions: Optional[np.ndarray] = None) -> Iterator[bytes]:
+    """
+    Serializa `df` en el formato indicado, bloque a bloque.
+
+    CSV se genera directamente por bloques de filas (con compresión gzip
+    incremental en `csv.gz`). Excel y Parquet se escriben por bloques en un
+    archivo temporal (libro de sólo escritura y grupos de filas) y se leen
+    de vuelta por bloques. En ningún caso se mantiene en memoria más de un
+    bloque de salida serializada; con `positions` tampoco se copia la
+    selección completa, sino las filas de cada bloque.
+
+    Args:
+        df: Datos a exportar.
+        fmt: Una de las claves de `EXPORT_FORMATS`.
+        chunk_rows: Filas serializadas por bloque.
+        stats: Si se indica, se actualiza con filas, bytes y tiempo.
+        positions: Posiciones de las filas de `df` a exportar, en orden
+            (por defecto todas).
+
+    Returns:
+        Un iterador de bloques de bytes.
+
+    Raises:
+        ValueError: Si el formato no existe o si una exportación a Excel
+            supera las filas de una hoja (`EXCEL_MAX_ROWS`).
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Formato de exportación no soportado: {fmt}")
+    n_rows = len(df) if positions is None else len(positions)
+    if fmt == 'xlsx' and n_rows + 1 > EXCEL_MAX_ROWS:
+        raise ValueError(f"Excel admite como máximo {EXCEL_MAX_ROWS - 1:,} filas por hoja; "
+                         f"la exportación tiene {n_rows:,}. Usa CSV o Parquet.")
+    if fmt == 'xlsx':
+        blocks = _iter_xlsx(df, chunk_rows, positions)
+    elif fmt == 'parquet':
+        blocks = _iter_parquet(df, chunk_rows, positions)
+    else:
+        blocks = _iter_csv(df, chunk_rows, compress=(fmt == 'csv.gz'), positions=positions)
+
+    start = time.perf_counter()
+    for block in blocks:
+        if stats is not None:
+            stats.bytes_written += len(block)
+            stats.seconds = time.perf_counter() - start
+        yield block
+    if stats is not None:
+        stats.rows = n_rows
+        stats.seconds = time.perf_counter() - start
+
+
+def write_export(df: pd.DataFrame, fmt: str, file_obj: BinaryIO,
+                 chunk_rows: int = DEFAULT_CHUNK_ROWS,
+                 positions: Optional[np.ndarray] = None) -> ExportStats:
+    """
+    Escribe la exportación de `df` (o de sus filas `positions`) en `file_obj` bloque a bloque.
+
+    Returns:
+        Las estadísticas de la exportación (incluidos bytes por segundo).
+
+    Raises:
+        ValueError: Como `iter_export`, antes de escribir nada.
+    """
+    stats = ExportStats()
+    for block in iter_export(df, fmt, chunk_rows=chunk_rows, stats=stats, positions=positions):
+        file_obj.write(block)
+    return stats
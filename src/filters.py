@@ -0,0 +1,294 @@
+import threading
+from collections import OrderedDict
+from typing import Callable, Iterable, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+
+def _shifted_codes(values: pd.Series) -> Tuple[np.ndarray, pd.Index]:
+    """Códigos enteros desplazados en uno (0 para nulos) y sus etiquetas."""
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        codes, labels = values.cat.codes.to_numpy(), values.cat.categories
+    else:
+        codes, labels = pd.factorize(values)
+    return (codes + 1).astype(np.int32), pd.Index(labels)
+
+
+class NameSearch:
+    """
+    Búsqueda de texto sobre los nombres distintos de modelo y fabricante.
+
+    Cada modelo (código desplazado, 0 para nulos) se asocia a su nombre y
+    al de su fabricante en minúsculas. Una búsqueda compara el texto sólo
+    con esos nombres distintos, así que su coste no depende del número de
+    filas. Los resultados se guardan en una caché LRU; si el texto amplía
+    uno ya buscado (lo habitual al escribir letra a letra) sólo se revisan
+    los modelos que coincidían con él. Es seguro compartirla entre sesiones.
+
+    Args:
+        models: Nombres de los modelos, en el orden de sus códigos.
+        manufacturers: Fabricante de cada modelo (alineado con `models`).
+        maxsize: Búsquedas guardadas en la caché.
+    """
+
+    FIELDS = ('manufacturer', 'model')
+
+    def __init__(self, models: pd.Index, manufacturers: pd.Index, maxsize: int = 256):
+        self._names = {
+            'model': np.asarray(pd.Index(models).astype(str).str.lower(), dtype=object),
+            'manufacturer': np.asarray(
+                pd.Index(manufacturers).fillna('').astype(str).str.lower(), dtype=object
+            ),
+        }
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._cache: 'OrderedDict[tuple, np.ndarray]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._names['model'])
+
+    def cache_info(self) -> dict:
+        """Aciertos, fallos y tamaño actual de la caché de búsquedas."""
+        return {'hits': self.hits, 'misses': self.misses,
+                'size': len(self._cache), 'maxsize': self.maxsize}
+
+    def _candidates(self, text: str, fields: tuple) -> np.ndarray:
+        """Modelos donde buscar: los de la búsqueda guardada más larga contenida en `text`."""
+        with self._lock:
+            cached = dict(self._cache)
+        for length in range(len(text) - 1, 0, -1):
+            for start in range(len(text) - length + 1):
+                previous = cached.get((text[start:start + length], fields))
+                if previous is not None:
+                    return np.flatnonzero(previous[1:])
+        return np.arange(len(self))
+
+    def matches(self, text: str, fields: Iterable[str] = FIELDS) -> np.ndarray:
+        """
+        Modelos cuyo nombre o fabricante contiene `text`, sin distinguir mayúsculas.
+
+        Args:
+            text: Texto buscado; vacío coincide con todos los modelos no nulos.
+            fields: Nombres donde buscar, entre `FIELDS`.
+
+        Returns:
+            Una tabla booleana por código desplazado de modelo (el 0 es nulo).
+        """
+        text, fields = text.strip().lower(), tuple(sorted(fields))
+        unknown = set(fields) - set(self.FIELDS)
+        if unknown:
+            raise ValueError(f"Campos de búsqueda desconocidos: {sorted(unknown)}")
+        key = (text, fields)
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return self._cache[key]
+            self.misses += 1
+
+        candidates = self._candidates(text, fields)
+        found = np.zeros(len(candidates), dtype=bool)
+        for field in fields:
+            names = self._names[field][candidates]
+            found |= np.fromiter((text in name for name in names), dtype=bool, count=len(names))
+        result = np.zeros(len(self) + 1, dtype=bool)
+        result[candidates[found] + 1] = True
+        result.flags.writeable = False
+
+        with self._lock:
+            self._cache[key] = result
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.maxsize:
+                self._cache.popitem(last=False)
+        return result
+
+
+class FilterIndex:
+    """
+    Índice precalculado para los filtros del dashboard.
+
+    Las filas se ordenan una sola vez por (condición, modelo, año del
+    modelo, precio). Cada combinación (condición, modelo, año) forma un
+    cubo contiguo en ese orden, con los precios ordenados dentro del cubo.
+    El fabricante de cada modelo se guarda aparte, y las búsquedas de texto
+    por fabricante o modelo se resuelven con `NameSearch` sobre los nombres
+    distintos. Una consulta selecciona los cubos que cumplen condición,
+    modelo (o fabricante) y rango de años con operaciones sobre la tabla de
+    cubos, resuelve el rango
+    de precios de todos ellos con una sola búsqueda binaria vectorizada y
+    concatena los tramos resultantes. El coste depende del número de cubos
+    y de filas devueltas, no del tamaño del DataFrame.
+
+    Las consultas devuelven posiciones de fila del DataFrame original
+    (agrupadas por cubo y ordenadas por precio dentro de cada cubo).
+    """
+
+    def __init__(self, df: pd.DataFrame, year_column: str = 'model_year',
+                 condition_column: str = 'condition', price_column: str = 'price',
+                 manufacturer_column: str = 'manufacturer', model_column: str = 'model'):
+        condition_codes, self.conditions = _shifted_codes(df[condition_column])
+        model_codes, self.models = _shifted_codes(df[model_column])
+        manufacturer_codes, self.manufacturers = _shifted_codes(df[manufacturer_column])
+        # El fabricante se deriva del modelo: uno por modelo (0 para nulos)
+        self._model_manufacturer = np.zeros(len(self.models) + 1, dtype=np.int32)
+        self._model_manufacturer[model_codes] = manufacturer_codes
+        self.search = NameSearch(
+            self.models,
+            pd.Index(np.concatenate([[None], self.manufacturers.astype(object)]), dtype=object)
+            .take(self._model_manufacturer[1:]),
+        )
+        self.years, year_codes = np.unique(df[year_column].to_numpy(), return_inverse=True)
+        self._prices, price_ranks = np.unique(
+            df[price_column].to_numpy(dtype='float64'), return_inverse=True
+        )
+
+        bucket_ids = (
+            (condition_codes.astype(np.int64) * (len(self.models) + 1)
+             + model_codes) * len(self.years)
+            + year_codes
+        )
+        self._key = bucket_ids * len(self._prices) + price_ranks
+        self._order = np.argsort(self._key, kind='stable')
+        self._key = self._key[self._order]
+
+        # Tabla de cubos: identificador, componentes y límites en el orden interno
+        buckets, starts = np.unique(self._key // len(self._prices), return_index=True)
+        self._buckets = buckets
+        self._bucket_bounds = np.append(starts, len(self._order))
+        self._bucket_year = buckets % len(self.years)
+        rest = buckets // len(self.years)
+        self._bucket_model = rest % (len(self.models) + 1)
+        self._bucket_condition = rest // (len(self.models) + 1)
+
+    def __len__(self) -> int:
+        return len(self._order)
+
+    @staticmethod
+    def _allowed(labels: pd.Index, selected: Iterable) -> np.ndarray:
+        """Tabla booleana por código desplazado (el código 0 es nulo)."""
+        return np.concatenate([[False], labels.isin(list(selected))])
+
+    def _selected_buckets(self, year_range, conditions, manufacturer, search) -> np.ndarray:
+        """Máscara sobre la tabla de cubos para año, condición, fabricante y texto."""
+        selected = np.ones(len(self._buckets), dtype=bool)
+        if year_range is not None:
+            first = np.searchsorted(self.years, year_range[0], side='left')
+            last = np.searchsorted(self.years, year_range[1], side='right')
+            selected &= (self._bucket_year >= first) & (self._bucket_year < last)
+        if conditions is not None:
+            selected &= self._allowed(self.conditions, conditions)[self._bucket_condition]
+        if manufacturer:
+            selected &= self.search.matches(manufacturer, ['manufacturer'])[self._bucket_model]
+        if search:
+            selected &= self.search.matches(search)[self._bucket_model]
+        return selected
+
+    def query(self, year_range: Optional[Tuple[int, int]] = None,
+              conditions: Optional[Iterable[str]] = None,
+              price_range: Optional[Tuple[float, float]] = None,
+              manufacturer: Optional[str] = None,
+              search: Optional[str] = None) -> np.ndarray:
+        """
+        Devuelve las posiciones de las filas que cumplen todos los filtros.
+
+        Args:
+            year_range: Años del modelo (mínimo, máximo), ambos inclusive.
+            conditions: Condiciones permitidas; `None` no filtra.
+            price_range: Precios (mínimo, máximo), ambos inclusive.
+            manufacturer: Texto contenido en el fabricante; vacío no filtra.
+            search: Texto contenido en el fabricante o en el modelo; vacío
+                no filtra.
+
+        Returns:
+            Un array con las posiciones de fila en el DataFrame original.
+        """
+        selected = np.flatnonzero(self._selected_buckets(year_range, conditions, manufacturer, search))
+        if price_range is None:
+            starts = self._bucket_bounds[selected]
+            stops = self._bucket_bounds[selected + 1]
+        else:
+            base = self._buckets[selected] * len(self._prices)
+            low = np.searchsorted(self._prices, price_range[0], side='left')
+            high = np.searchsorted(self._prices, price_range[1], side='right')
+            starts = np.searchsorted(self._key, base + low, side='left')
+            stops = np.searchsorted(self._key, base + high, side='left')
+
+        non_empty = stops > starts
+        starts, stops = starts[non_empty], stops[non_empty]
+        if len(starts) == 0:
+            return np.empty(0, dtype=self._order.dtype)
+
+        # Fusionar tramos adyacentes; un único tramo se devuelve como vista
+        breaks = np.flatnonzero(starts[1:] != stops[:-1]) + 1
+        starts = starts[np.concatenate([[0], breaks])]
+        stops = stops[np.concatenate([breaks - 1, [len(stops) - 1]])]
+        if len(starts) == 1:
+            return self._order[starts[0]:stops[0]]
+
+        lengths = stops - starts
+        offsets = np.repeat(starts - np.concatenate([[0], np.cumsum(lengths)[:-1]]), lengths)
+        return self._order[offsets + np.arange(lengths.sum())]
+
+    def select(self, df: pd.DataFrame, **filters) -> pd.DataFrame:
+        """Aplica `query` y devuelve las filas correspondientes de `df`."""
+        return df.take(self.query(**filters))
+
+    def selection(self, df: pd.DataFrame, **filters) -> 'Selection':
+        """
+        Devuelve las filas de `query` como `Selection`, sin copiarlas.
+
+        La consulta se ejecuta la primera vez que se usan las posiciones,
+        así que una selección que ninguna sección llega a usar no cuesta nada.
+        """
+        return Selection(df, lambda: self.query(**filters))
+
+
+class Selection:
+    """
+    Filas seleccionadas de un DataFrame compartido, guardadas como posiciones.
+
+    En lugar de copiar todas las columnas de la selección (como `select`),
+    cada sesión guarda sólo las posiciones y extrae las columnas que usa
+    cuando las necesita. Si la selección incluye todas las filas, las
+    columnas se devuelven sin copia, en el orden del DataFrame: los
+    resúmenes (medias, modas, histogramas) no dependen del orden.
+
+    Args:
+        df: DataFrame completo (por ejemplo, el publicado con `src.shared`).
+        positions: Posiciones de fila seleccionadas, o una función sin
+            argumentos que las calcula cuando se usan por primera vez.
+    """
+
+    def __init__(self, df: pd.DataFrame, positions: Union[np.ndarray, Callable[[], np.ndarray]]):
+        self.df = df
+        self._positions = positions
+
+    @property
+    def positions(self) -> np.ndarray:
+        if callable(self._positions):
+            self._positions = self._positions()
+        return np.asarray(self._positions)
+
+    def __len__(self) -> int:
+        return len(self.positions)
+
+    @property
+    def is_complete(self) -> bool:
+        """Indica si la selección contiene todas las filas del DataFrame."""
+        return len(self.positions) == len(self.df)
+
+    def column(self, name: str) -> pd.Series:
+        """Valores de una columna en las filas seleccionadas."""
+        if self.is_complete:
+            return self.df[name]
+        return self.df[name].take(self.positions)
+
+    def frame(self, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """Las filas seleccionadas, sólo con `columns` si se indican."""
+        df = self.df if columns is None else self.df[columns]
+        if self.is_complete:
+            return df
+        return df.take(self.positions)
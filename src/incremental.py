@@ -0,0 +1,243 @@
+import copy
+import hashlib
+import json
+import os
+from typing import Dict, Optional, Sequence
+
+import pandas as pd
+
+from src.aggregations import AggregateCache, build_cube, merge_cubes
+from src.artifacts import _write_parquet
+from src.cache import file_fingerprint
+from src.data_processing import (
+    DEFAULT_MIN_PRICE,
+    DEFAULT_PRICE_OUTLIER_QUANTILE,
+    GroupValueCounts,
+    _check_options,
+    _concat_categorical,
+    _engineer_features,
+    _IngestState,
+    _optimize_dtypes,
+    _read_csv_blocks,
+    impute_from_table,
+)
+from src.instrumentation import StageHook, run_stage
+
+# Métodos del odómetro admitidos: la interpolación depende del orden global de las filas
+INCREMENTAL_ODOMETER_METHODS = ('age_median', 'model_age_median')
+
+# Resolución (millas) de los conteos del odómetro; acota el tamaño del estado
+ODOMETER_RESOLUTION = 100
+
+# Archivos del estado guardado
+STATE_FILE = 'state.json'
+CUBE_FILE = 'aggregate_cube.parquet'
+_COUNT_NAMES = ('year', 'cylinders', 'odometer_age', 'odometer_model_age', 'odometer', 'price')
+
+
+def _part_file(number: int) -> str:
+    return f'part-{number:05d}.parquet'
+
+
+def _model_age_key(model: pd.Series, age: pd.Series) -> pd.Series:
+    """Clave de grupo (modelo, edad) como texto; nula si falta cualquiera de los dos."""
+    key = model.astype(str) + '|' + age.astype(str)
+    return key.mask(model.isna() | age.isna())
+
+
+class IncrementalDataset:
+    """
+    Conjunto procesado que admite anexar nuevos anuncios sin reprocesar el histórico.
+
+    Guarda estadísticas acumulables (`GroupValueCounts`) de todo lo leído:
+    años y cilindros por modelo, odómetro por edad (y por modelo y edad) y
+    precios. Cada anexo lee sólo el CSV nuevo, fusiona sus conteos con los
+    acumulados, imputa y recorta las filas nuevas con las medianas, modas y
+    el cuantil de precio del conjunto completo, y suma su cubo de agregados
+    al existente.
+
+    Las filas ya procesadas no se revisan: si un anexo mueve una mediana o
+    el cuantil de precio, sólo las filas nuevas usan el valor actualizado.
+    Por eso el resultado coincide con el procesamiento completo salvo en
+    esas filas (y en el redondeo del odómetro a `ODOMETER_RESOLUTION`).
+
+    Args:
+        odometer_method: Uno de `INCREMENTAL_ODOMETER_METHODS`.
+        min_price, price_outlier_quantile, age_bins, age_labels: Como en
+            `load_and_preprocess_data`.
+
+    Raises:
+        ValueError: Si el método del odómetro no es incremental o alguna
+            opción no es válida.
+    """
+
+    def __init__(self, odometer_method: str = 'age_median', min_price: float = DEFAULT_MIN_PRICE,
+                 price_outlier_quantile: float = DEFAULT_PRICE_OUTLIER_QUANTILE,
+                 age_bins: Optional[Sequence[float]] = None,
+                 age_labels: Optional[Sequence[str]] = None):
+        self.age_bins, self.age_labels = _check_options(
+            odometer_method, price_outlier_quantile, age_bins, age_labels
+        )
+        if odometer_method not in INCREMENTAL_ODOMETER_METHODS:
+            raise ValueError(
+                f"El modo incremental no admite odometer_method={odometer_method!r}; "
+                f"use uno de {INCREMENTAL_ODOMETER_METHODS}"
+            )
+        self.odometer_method = odometer_method
+        self.min_price = min_price
+        self.price_outlier_quantile = price_outlier_quantile
+        self.counts: Dict[str, GroupValueCounts] = {name: GroupValueCounts() for name in _COUNT_NAMES}
+        self.parts = []
+        self.cube = None
+        self.rows = 0
+        self.version = None
+        self._dataset = None
+        self._saved_parts = 0
+
+    @property
+    def settings(self) -> dict:
+        """Opciones del pipeline (forman parte de la versión de los datos)."""
+        return {
+            'odometer_method': self.odometer_method,
+            'min_price': self.min_price,
+            'price_outlier_quantile': self.price_outlier_quantile,
+            'age_bins': self.age_bins,
+            'age_labels': self.age_labels,
+        }
+
+    def append(self, file_path: str, chunksize: Optional[int] = None,
+               hook: Optional[StageHook] = None) -> pd.DataFrame:
+        """
+        Procesa un CSV de anuncios nuevos y lo añade al conjunto.
+
+        El coste depende del tamaño del CSV nuevo y del de las estadísticas
+        acumuladas (valores distintos por grupo), no del número de filas ya
+        procesadas.
+
+        Args:
+            file_path: CSV con las filas nuevas (mismas columnas que vehicles_us.csv).
+            chunksize: Si se indica, lectura por bloques.
+            hook: Recibe los eventos de las etapas, como en `load_and_preprocess_data`.
+
+        Returns:
+            Las filas nuevas ya procesadas.
+        """
+        # Los conteos se actualizan sobre copias (cada actualización sustituye la Series de
+        # conteos, así que basta una copia superficial) y el estado sólo cambia si todas las
+        # etapas terminan; un anexo fallido deja el conjunto como estaba
+        counts = {name: copy.copy(group_counts) for name, group_counts in self.counts.items()}
+        delta = run_stage(hook, 'read_blocks', _read_csv_blocks, file_path, chunksize, self.min_price)
+        df = run_stage(hook, 'impute_incremental', self._impute, delta, counts)
+        df = run_stage(hook, 'trim_outliers', self._trim_outliers, df, counts)
+        df = run_stage(hook, 'engineer_features', _engineer_features, df, self.age_bins, self.age_labels)
+        df = run_stage(hook, 'optimize_dtypes', _optimize_dtypes, df)
+        cube = build_cube(df)
+        cube = cube if self.cube is None else merge_cubes(self.cube, cube)
+        fingerprint = file_fingerprint(file_path, self.settings)
+
+        self.counts = counts
+        self.rows += delta.rows
+        self.parts.append(df)
+        self.cube = cube
+        self.version = hashlib.sha256(f"{self.version}:{fingerprint}".encode('utf-8')).hexdigest()
+        self._dataset = None
+        return df
+
+    def _impute(self, delta: _IngestState, counts: Dict[str, GroupValueCounts]) -> pd.DataFrame:
+        """Fusiona los conteos del anexo en `counts` e imputa sus filas con los acumulados."""
+        # Numerar las filas a continuación de las ya leídas
+        for frame in delta.anchors + delta.kept:
+            frame.index = frame.index + self.rows
+        counts['year'].merge(delta.year_counts)
+        counts['cylinders'].merge(delta.cylinder_counts)
+        year_medians = counts['year'].median()
+
+        # Odómetro: conteos por edad de todas las filas leídas, como en la ruta estándar
+        anchors = _concat_categorical(delta.anchors)
+        model_year = impute_from_table(anchors['model_year'], anchors['model'], year_medians)
+        age = anchors['posted_year'] - model_year
+        odometer = (anchors['odometer'] / ODOMETER_RESOLUTION).round() * ODOMETER_RESOLUTION
+        counts['odometer_age'].update(age, odometer)
+        counts['odometer'].update(pd.Series(0, index=anchors.index), odometer)
+        if self.odometer_method == 'model_age_median':
+            counts['odometer_model_age'].update(_model_age_key(anchors['model'], age), odometer)
+        del anchors
+
+        df = _concat_categorical(delta.kept)
+        df['model_year'] = impute_from_table(df['model_year'], df['model'], year_medians)
+        df['cylinders'] = impute_from_table(df['cylinders'], df['model'], counts['cylinders'].mode())
+        age = df['date_posted'].dt.year - df['model_year']
+        if self.odometer_method == 'model_age_median':
+            df['odometer'] = impute_from_table(df['odometer'], _model_age_key(df['model'], age),
+                                               counts['odometer_model_age'].median())
+        df['odometer'] = impute_from_table(df['odometer'], age, counts['odometer_age'].median())
+        overall = counts['odometer'].median()
+        if len(overall):
+            df['odometer'] = df['odometer'].fillna(overall.iloc[0])
+        df = df.dropna(subset=['price', 'model_year'])
+
+        counts['price'].update(pd.Series(0, index=df.index), df['price'])
+        return df
+
+    def _trim_outliers(self, df: pd.DataFrame, counts: Dict[str, GroupValueCounts]) -> pd.DataFrame:
+        """Recorta con el cuantil de precio de todas las filas acumuladas (en `counts`)."""
+        upper = counts['price'].quantile(self.price_outlier_quantile)
+        if upper.empty:
+            return df
+        return df[df['price'] <= upper.iloc[0]]
+
+    @property
+    def dataset(self) -> pd.DataFrame:
+        """Todas las filas procesadas, en orden de llegada."""
+        if self._dataset is None:
+            if not self.parts:
+                return pd.DataFrame()
+            self._dataset = _concat_categorical(self.parts)
+            self._dataset.attrs['data_version'] = self.version
+        return self._dataset
+
+    def aggregates(self, maxsize: int = 128) -> AggregateCache:
+        """Una `AggregateCache` sobre el cubo acumulado, con la versión actual."""
+        return AggregateCache.from_cube(self.cube, version=self.version, maxsize=maxsize)
+
+    def save(self, directory: str) -> None:
+        """
+        Guarda el estado en `directory`.
+
+        Sólo se escriben las partes nuevas desde el último guardado; las
+        estadísticas, el cubo y `state.json` se reescriben (su tamaño no
+        depende del número de filas). `state.json` se escribe al final.
+        """
+        os.makedirs(directory, exist_ok=True)
+        for number in range(self._saved_parts, len(self.parts)):
+            _write_parquet(self.parts[number], os.path.join(directory, _part_file(number)))
+        for name, counts in self.counts.items():
+            _write_parquet(counts.to_frame(), os.path.join(directory, f'counts-{name}.parquet'))
+        if self.cube is not None:
+            _write_parquet(self.cube, os.path.join(directory, CUBE_FILE))
+
+        state = dict(self.settings, rows=self.rows, version=self.version, parts=len(self.parts))
+        state_path = os.path.join(directory, STATE_FILE)
+        with open(f"{state_path}.tmp", 'w', encoding='utf-8') as f:
+            json.dump(state, f, indent=2)
+        os.replace(f"{state_path}.tmp", state_path)
+        self._saved_parts = len(self.parts)
+
+    @classmethod
+    def load(cls, directory: str) -> 'IncrementalDataset':
+        """Recupera un estado guardado con `save`."""
+        with open(os.path.join(directory, STATE_FILE), encoding='utf-8') as f:
+            state = json.load(f)
+        dataset = cls(state['odometer_method'], state['min_price'], state['price_outlier_quantile'],
+                      state['age_bins'], state['age_labels'])
+        dataset.rows = state['rows']
+        dataset.version = state['version']
+        for name in _COUNT_NAMES:
+            frame = pd.read_parquet(os.path.join(directory, f'counts-{name}.parquet'))
+            dataset.counts[name] = GroupValueCounts.from_frame(frame)
+        dataset.parts = [pd.read_parquet(os.path.join(directory, _part_file(number)))
+                         for number in range(state['parts'])]
+        if dataset.parts:
+            dataset.cube = pd.read_parquet(os.path.join(directory, CUBE_FILE))
+        dataset._saved_parts = len(dataset.parts)
+        return dataset
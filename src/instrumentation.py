@@ -0,0 +1,149 @@
+import json
+import logging
+import time
+from collections.abc import Sized
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, TextIO, Union
+
+import numpy as np
+import pandas as pd
+
+# Un hook recibe un diccionario por cada etapa completada del pipeline
+StageHook = Callable[[Dict[str, Any]], None]
+
+
+def memory_bytes(obj: Any) -> int:
+    """
+    Memoria en bytes de un DataFrame o Series, incluido el texto de las columnas.
+
+    Otros objetos pueden exponer su tamaño con un atributo `nbytes`; si no
+    lo tienen se cuentan como 0.
+    """
+    if isinstance(obj, (pd.DataFrame, pd.Series)):
+        return int(np.sum(obj.memory_usage(index=True, deep=True)))
+    return int(getattr(obj, 'nbytes', 0) or 0)
+
+
+def _row_count(obj: Any) -> int:
+    """Filas de la entrada o salida de una etapa (0 para rutas de archivo)."""
+    if isinstance(obj, Sized) and not isinstance(obj, (str, bytes)):
+        return len(obj)
+    return 0
+
+
+def run_stage(hook: Optional[StageHook], name: str, func: Callable, *args, **kwargs) -> Any:
+    """
+    Ejecuta `func(*args, **kwargs)` como la etapa `name` y la notifica a `hook`.
+
+    El primer argumento posicional se toma como la entrada de la etapa para
+    contar filas y memoria. El evento enviado al hook contiene `stage`,
+    `seconds`, `rows_in`, `rows_out`, `memory_before`, `memory_after` y
+    `memory_delta` (bytes). Sin hook la función se llama directamente, sin
+    ninguna medición.
+
+    Returns:
+        El resultado de `func`.
+    """
+    if hook is None:
+        return func(*args, **kwargs)
+
+    source = args[0] if args else None
+    rows_in = _row_count(source)
+    memory_before = memory_bytes(source)
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    seconds = time.perf_counter() - start
+    memory_after = memory_bytes(result)
+    hook({
+        'stage': name,
+        'seconds': seconds,
+        'rows_in': rows_in,
+        'rows_out': _row_count(result),
+        'memory_before': memory_before,
+        'memory_after': memory_after,
+        'memory_delta': memory_after - memory_before,
+    })
+    return result
+
+
+@contextmanager
+def timed(hook: Optional[StageHook], name: str, **fields: Any) -> Iterator[None]:
+    """
+    Mide el bloque `with` como la etapa `name` y la notifica a `hook`.
+
+    A diferencia de `run_stage` sólo mide el tiempo: el evento contiene
+    `stage`, `seconds` y los campos adicionales (`fields`). Sin hook el
+    bloque se ejecuta sin ninguna medición. Si el bloque lanza una
+    excepción no se envía ningún evento.
+    """
+    if hook is None:
+        yield
+        return
+    start = time.perf_counter()
+    yield
+    hook(dict(fields, stage=name, seconds=time.perf_counter() - start))
+
+
+class StageRecorder:
+    """Hook que guarda los eventos en memoria (por ejemplo, para un panel de depuración)."""
+
+    def __init__(self):
+        self.events: List[Dict[str, Any]] = []
+
+    def __call__(self, event: Dict[str, Any]) -> None:
+        self.events.append(event)
+
+    def to_frame(self) -> pd.DataFrame:
+        """Una fila por etapa, en orden de ejecución."""
+        return pd.DataFrame(self.events)
+
+
+class LoggingHook:
+    """Hook que escribe una línea de log por etapa."""
+
+    def __init__(self, logger: Optional[logging.Logger] = None, level: int = logging.INFO):
+        self.logger = logger or logging.getLogger('src.pipeline')
+        self.level = level
+
+    def __call__(self, event: Dict[str, Any]) -> None:
+        self.logger.log(
+            self.level, "%s: %.3f s, %d -> %d filas, %+.1f MB",
+            event['stage'], event['seconds'], event['rows_in'], event['rows_out'],
+            event['memory_delta'] / 2 ** 20,
+        )
+
+
+class JsonLinesHook:
+    """
+    Hook que añade cada evento como una línea JSON.
+
+    Args:
+        target: Ruta del archivo (se abre en modo de adición en cada
+            evento) o un objeto de texto ya abierto.
+    """
+
+    def __init__(self, target: Union[str, TextIO]):
+        self.target = target
+
+    def __call__(self, event: Dict[str, Any]) -> None:
+        line = json.dumps(dict(event, timestamp=time.time())) + '\n'
+        if isinstance(self.target, str):
+            with open(self.target, 'a', encoding='utf-8') as f:
+                f.write(line)
+        else:
+            self.target.write(line)
+
+
+def combine_hooks(*hooks: Optional[StageHook]) -> Optional[StageHook]:
+    """Reparte cada evento entre varios hooks; ignora los `None`."""
+    active = [hook for hook in hooks if hook is not None]
+    if not active:
+        return None
+    if len(active) == 1:
+        return active[0]
+
+    def hook(event: Dict[str, Any]) -> None:
+        for target in active:
+            target(event)
+
+    return hook
@@ -0,0 +1,299 @@
+from typing import Dict, Hashable, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.data_processing import CONDITION_MAP
+
+# Columnas numéricas de la matriz de características (escaladas por su desviación típica)
+NUMERIC_FEATURES = ['age', 'odometer', 'condition_score', 'cylinders', 'is_4wd']
+
+# Columnas categóricas codificadas: los comparables deben coincidir en ellas
+CATEGORY_FEATURES = ['manufacturer', 'type']
+
+# Cuantiles del precio de los comparables: estimación (mediana) y rango
+PRICE_QUANTILES = {'price_low': 0.25, 'price_estimate': 0.5, 'price_high': 0.75}
+
+# Puntos con los que se estima el rango de cada dimensión al dividir un nodo
+_SPREAD_SAMPLE = 256
+
+# Elementos (puntos × hojas) de cada lote de cotas en una búsqueda
+_BOUNDS_CHUNK = 2 ** 22
+
+# Hojas más cercanas que se ordenan de una vez para cada punto en una búsqueda
+_LEAVES_PER_PASS = 32
+
+
+class KDTree:
+    """
+    Árbol k-d con hojas de varios puntos para buscar vecinos más cercanos.
+
+    Los puntos se dividen por la mediana de la dimensión con más rango
+    hasta que cada hoja tiene a lo sumo `leaf_size` puntos. Sólo se
+    guardan las hojas, como una matriz (hojas, leaf_size, d) rellenada con
+    infinitos, y sus cajas envolventes.
+
+    La búsqueda es por lotes: se calcula la distancia mínima posible de
+    cada punto a cada caja y, en cada ronda, cada punto mide la hoja no
+    visitada más cercana y actualiza sus `k` mejores vecinos. Un punto
+    termina cuando ninguna hoja pendiente puede tener un vecino más cercano
+    que el k-ésimo, así que el resultado es exacto; cada ronda es una
+    operación de NumPy sobre todos los puntos que siguen buscando.
+
+    Args:
+        points: Matriz (n, d) de puntos.
+        leaf_size: Puntos máximos por hoja.
+    """
+
+    def __init__(self, points: np.ndarray, leaf_size: int = 128):
+        points = np.asarray(points, dtype=np.float32)
+        # Copia por columnas que se reordena al dividir (nunca una vista de `points`)
+        columns = np.array(points.T, order='C')
+        order = np.arange(len(points))
+        leaves = []
+        pending = [(0, len(points))] if len(points) else []
+        while pending:
+            start, end = pending.pop()
+            if end - start <= leaf_size:
+                leaves.append((start, end))
+                continue
+            # Las columnas se reordenan junto con `order`, así que cada nodo es un tramo contiguo;
+            # el rango de cada dimensión se estima con una muestra del nodo
+            block = columns[:, start:end]
+            sample = block[:, ::max(1, (end - start) // _SPREAD_SAMPLE)]
+            dim = int((sample.max(axis=1) - sample.min(axis=1)).argmax())
+            half = (end - start) // 2
+            split = np.argpartition(block[dim], half)
+            columns[:, start:end] = block[:, split]
+            order[start:end] = order[start:end][split]
+            pending.extend([(start, start + half), (start + half, end)])
+
+        starts, ends = np.sort(np.asarray(leaves, dtype=np.int64).reshape(-1, 2), axis=0).T
+        lengths = ends - starts
+        leaf = np.repeat(np.arange(len(starts)), lengths)
+        slot = np.arange(len(points)) - np.repeat(starts, lengths)
+        self.leaf_size = leaf_size
+        self.size, self.dims = points.shape
+        self.leaves = np.full((len(starts), leaf_size, self.dims), np.inf, dtype=np.float32)
+        self.index = np.full((len(starts), leaf_size), -1, dtype=np.int32)
+        self.index[leaf, slot] = order
+        self.leaves[leaf, slot] = points[order]
+        filled = (self.index >= 0)[..., None]
+        self.mins = np.where(filled, self.leaves, np.inf).min(axis=1)
+        self.maxs = np.where(filled, self.leaves, -np.inf).max(axis=1)
+
+    def __len__(self) -> int:
+        return self.size
+
+    @property
+    def nbytes(self) -> int:
+        """Memoria de las hojas, sus posiciones y sus cajas."""
+        return int(self.leaves.nbytes + self.index.nbytes + self.mins.nbytes + self.maxs.nbytes)
+
+    def _bounds(self, points: np.ndarray) -> np.ndarray:
+        """Distancia mínima (al cuadrado) de cada punto a la caja de cada hoja."""
+        bounds = np.zeros((len(points), len(self.mins)), dtype=np.float32)
+        for dim in range(self.dims):
+            value = points[:, dim, None]
+            gap = np.maximum(self.mins[:, dim] - value, 0) + np.maximum(value - self.maxs[:, dim], 0)
+            bounds += gap * gap
+        return bounds
+
+    def _search(self, points: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        bounds = self._bounds(points)
+        best = np.full((len(points), k), np.inf, dtype=np.float32)
+        found = np.full((len(points), k), -1, dtype=np.int64)
+        active = np.arange(len(points))
+        while len(active):
+            # Las hojas de cada punto por cota creciente, `_LEAVES_PER_PASS` cada vez
+            pending = bounds[active]
+            count = min(_LEAVES_PER_PASS, pending.shape[1])
+            order = np.argpartition(pending, count - 1, axis=1)[:, :count]
+            order = np.take_along_axis(order, np.argsort(np.take_along_axis(pending, order, axis=1), axis=1),
+                                       axis=1)
+            for step in range(count):
+                leaf = order[:, step]
+                # Terminan los puntos cuya siguiente hoja ya no puede mejorar el k-ésimo vecino
+                searching = bounds[active, leaf] <= best[active, -1]
+                active, leaf, order = active[searching], leaf[searching], order[searching]
+                if not len(active):
+                    break
+                bounds[active, leaf] = np.inf
+                self._merge(points, active, leaf, best, found, k)
+        return np.sqrt(best), found
+
+    def _merge(self, points: np.ndarray, active: np.ndarray, leaf: np.ndarray,
+               best: np.ndarray, found: np.ndarray, k: int) -> None:
+        """Añade los puntos de una hoja a los k mejores vecinos de cada punto activo."""
+        diff = self.leaves[leaf] - points[active, None]
+        distances = np.concatenate([best[active], np.einsum('qpd,qpd->qp', diff, diff)], axis=1)
+        positions = np.concatenate([found[active], self.index[leaf]], axis=1)
+        keep = np.argpartition(distances, k - 1, axis=1)[:, :k]
+        distances = np.take_along_axis(distances, keep, axis=1)
+        ordered = np.argsort(distances, axis=1, kind='stable')
+        best[active] = np.take_along_axis(distances, ordered, axis=1)
+        found[active] = np.take_along_axis(np.take_along_axis(positions, keep, axis=1), ordered, axis=1)
+
+    def query(self, points: np.ndarray, k: int = 10) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Los `k` vecinos más cercanos (distancia euclídea) de cada punto.
+
+        Args:
+            points: Matriz (m, d) de puntos a buscar.
+            k: Vecinos por punto.
+
+        Returns:
+            Distancias y posiciones (en la matriz original) de los vecinos,
+            dos matrices (m, k) ordenadas de más cercano a más lejano.
+
+        Raises:
+            ValueError: Si `k` no está entre 1 y el número de puntos del árbol.
+        """
+        if not 1 <= k <= len(self):
+            raise ValueError(f"k debe estar entre 1 y {len(self)}, no {k}")
+        points = np.asarray(points, dtype=np.float32).reshape(-1, self.dims)
+        distances = np.empty((len(points), k), dtype=np.float32)
+        positions = np.empty((len(points), k), dtype=np.int64)
+        # Las cotas de todas las hojas se calculan por lotes de puntos para acotar la memoria
+        chunk = max(1, _BOUNDS_CHUNK // len(self.mins))
+        for begin in range(0, len(points), chunk):
+            rows = slice(begin, begin + chunk)
+            distances[rows], positions[rows] = self._search(points[rows], k)
+        return distances, positions
+
+
+class PriceEstimator:
+    """
+    Precio estimado y anuncios comparables a partir de los datos procesados.
+
+    Construye una matriz compacta (float32) con `NUMERIC_FEATURES`
+    divididas por su desviación típica y codifica `CATEGORY_FEATURES`.
+    Los comparables de un anuncio son sus vecinos más cercanos entre los
+    anuncios del mismo fabricante y tipo (un `KDTree` por combinación);
+    si la combinación no existe o tiene menos de `k` anuncios se buscan en
+    todos. El precio estimado es la mediana del precio de los comparables,
+    con el rango intercuartílico como intervalo.
+
+    Args:
+        df: DataFrame procesado.
+        k: Comparables por anuncio.
+        leaf_size: Puntos por hoja de los árboles.
+        version: Versión de los datos; por defecto `df.attrs['data_version']`.
+    """
+
+    def __init__(self, df: pd.DataFrame, k: int = 10, leaf_size: int = 128,
+                 version: Optional[Hashable] = None):
+        self.k = k
+        self.version = version if version is not None else df.attrs.get('data_version')
+        self.reference_year = int(df['date_posted'].dt.year.max())
+        # Las categorías se comparan sin distinguir mayúsculas ('Ford' y 'ford')
+        self.categories = {column: pd.Index(df[column].astype('category').cat.categories
+                                            .astype(str).str.lower().unique())
+                           for column in CATEGORY_FEATURES}
+        numeric = df[NUMERIC_FEATURES].astype('float64')
+        self.fill = numeric.median()
+        self.scale = numeric.std().replace(0, 1).fillna(1)
+        self.features = self._scaled(numeric)
+        self.prices = df['price'].to_numpy(dtype='float64')
+
+        groups = self._groups(df)
+        self._tree = KDTree(self.features, leaf_size)
+        self._trees: Dict[int, Tuple[KDTree, np.ndarray]] = {}
+        order = np.argsort(groups, kind='stable')
+        bounds = np.flatnonzero(np.diff(groups[order])) + 1
+        for members in np.split(order, bounds):
+            if len(members) >= k and groups[members[0]] >= 0:
+                self._trees[int(groups[members[0]])] = (KDTree(self.features[members], leaf_size),
+                                                        members.astype(np.int32))
+
+    def __len__(self) -> int:
+        return len(self.features)
+
+    @property
+    def nbytes(self) -> int:
+        """Memoria de la matriz de características, los precios y los árboles."""
+        trees = [self._tree] + [tree for tree, _ in self._trees.values()]
+        return int(self.features.nbytes + self.prices.nbytes
+                   + sum(tree.nbytes for tree in trees)
+                   + sum(members.nbytes for _, members in self._trees.values()))
+
+    def _scaled(self, numeric: pd.DataFrame) -> np.ndarray:
+        return np.ascontiguousarray((numeric.fillna(self.fill) / self.scale).to_numpy(dtype=np.float32))
+
+    def _groups(self, listings: pd.DataFrame) -> np.ndarray:
+        """Código de la combinación fabricante × tipo de cada anuncio (-1 si alguno es desconocido)."""
+        codes = []
+        for column in CATEGORY_FEATURES:
+            values = listings[column] if column in listings else pd.Series(np.nan, index=listings.index)
+            codes.append(self.categories[column].get_indexer(values.astype(str).str.lower()))
+        manufacturer, kind = codes
+        groups = manufacturer.astype(np.int64) * len(self.categories['type']) + kind
+        groups[(manufacturer < 0) | (kind < 0)] = -1
+        return groups
+
+    def feature_matrix(self, listings: pd.DataFrame) -> np.ndarray:
+        """
+        Características escaladas de anuncios nuevos.
+
+        Si falta `age` se calcula con `model_year` respecto al año de
+        publicación más reciente de los datos, y si falta `condition_score`
+        se obtiene de `condition`. Los valores que sigan faltando se
+        rellenan con la mediana de los datos.
+        """
+        numeric = pd.DataFrame(index=listings.index)
+        for column in NUMERIC_FEATURES:
+            if column in listings:
+                numeric[column] = pd.to_numeric(listings[column], errors='coerce')
+            elif column == 'age' and 'model_year' in listings:
+                numeric[column] = self.reference_year - pd.to_numeric(listings['model_year'], errors='coerce')
+            elif column == 'condition_score' and 'condition' in listings:
+                numeric[column] = listings['condition'].astype(object).map(CONDITION_MAP)
+            else:
+                numeric[column] = np.nan
+        return self._scaled(numeric.astype('float64'))
+
+    def neighbors(self, listings: pd.DataFrame, k: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Comparables de cada anuncio.
+
+        Args:
+            listings: Anuncios con las columnas de `NUMERIC_FEATURES` (o
+                `model_year` y `condition`) y de `CATEGORY_FEATURES`.
+            k: Comparables por anuncio; por defecto el del estimador.
+
+        Returns:
+            Distancias y posiciones (filas del DataFrame original) de los
+            comparables, dos matrices (anuncios, k) de más cercano a más lejano.
+        """
+        k = k or self.k
+        features = self.feature_matrix(listings)
+        groups = self._groups(listings)
+        distances = np.empty((len(listings), k), dtype=np.float32)
+        positions = np.empty((len(listings), k), dtype=np.int64)
+        for group in np.unique(groups):
+            rows = np.flatnonzero(groups == group)
+            tree, members = self._trees.get(int(group), (self._tree, None))
+            if len(tree) < k:
+                tree, members = self._tree, None
+            found_distances, found = tree.query(features[rows], k)
+            distances[rows] = found_distances
+            positions[rows] = found if members is None else members[found]
+        return distances, positions
+
+    def predict(self, listings: pd.DataFrame, k: Optional[int] = None) -> pd.DataFrame:
+        """
+        Precio estimado de cada anuncio a partir de sus comparables.
+
+        Returns:
+            Un DataFrame con el índice de `listings` y las columnas de
+            `PRICE_QUANTILES`: `price_low`, `price_estimate` y `price_high`.
+        """
+        _, positions = self.neighbors(listings, k)
+        prices = self.prices[positions]
+        return pd.DataFrame({name: np.quantile(prices, q, axis=1) for name, q in PRICE_QUANTILES.items()},
+                            index=listings.index)
+
+    def similar(self, listing: dict, k: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """Posiciones y distancias de los comparables de un único anuncio (un diccionario)."""
+        distances, positions = self.neighbors(pd.DataFrame([listing]), k)
+        return positions[0], distances[0]
@@ -0,0 +1,71 @@
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+
+class SectionCache:
+    """
+    Resultados de cada sección del dashboard, guardados por sus propias entradas.
+
+    Cada sección (métricas, distribuciones, correlaciones, vista previa...)
+    pide sus datos con `get(sección, entradas, compute)`, donde `entradas`
+    son sólo los valores de los que depende (versión de los datos, filtros
+    que usa, parámetros de sus gráficos). Cambiar un control sólo recalcula
+    las secciones cuyas entradas incluyen ese control, y una sección que no
+    se muestra no llama nunca a `compute`.
+
+    La caché es una LRU acotada común a todas las secciones, con aciertos y
+    fallos por sección. Es segura para compartir entre sesiones.
+
+    Args:
+        maxsize: Resultados guardados entre todas las secciones.
+    """
+
+    def __init__(self, maxsize: int = 128):
+        self.maxsize = maxsize
+        self._results = OrderedDict()
+        self._stats: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._results)
+
+    def get(self, section: str, inputs: Hashable, compute: Callable[[], Any]) -> Any:
+        """
+        Devuelve el resultado de `section` para `inputs`, calculándolo si hace falta.
+
+        Args:
+            section: Nombre de la sección.
+            inputs: Valores de los que depende el resultado (deben ser hashables).
+            compute: Función sin argumentos que calcula el resultado.
+        """
+        key = (section, inputs)
+        with self._lock:
+            stats = self._stats.setdefault(section, {'hits': 0, 'misses': 0})
+            if key in self._results:
+                self._results.move_to_end(key)
+                stats['hits'] += 1
+                return self._results[key]
+            stats['misses'] += 1
+        result = compute()
+        with self._lock:
+            self._results[key] = result
+            self._results.move_to_end(key)
+            while len(self._results) > self.maxsize:
+                self._results.popitem(last=False)
+        return result
+
+    def invalidate(self, section: Optional[str] = None) -> None:
+        """Elimina los resultados de una sección, o de todas si no se indica."""
+        with self._lock:
+            if section is None:
+                self._results.clear()
+                return
+            for key in [key for key in self._results if key[0] == section]:
+                del self._results[key]
+
+    def cache_info(self) -> dict:
+        """Aciertos y fallos por sección y tamaño actual de la caché."""
+        with self._lock:
+            return {'sections': {name: dict(stats) for name, stats in self._stats.items()},
+                    'size': len(self._results), 'maxsize': self.maxsize}
@@ -0,0 +1,121 @@
+import glob
+import os
+from typing import Callable
+
+import pandas as pd
+import pyarrow as pa
+
+# Archivos publicados: un archivo Arrow IPC por versión de los datos
+SHARED_PREFIX = 'dataset-'
+SHARED_SUFFIX = '.arrow'
+_VERSION_KEY = b'data_version'
+
+
+def shared_path(directory: str, version: str) -> str:
+    """Ruta del archivo publicado para una versión de los datos."""
+    return os.path.join(directory, f"{SHARED_PREFIX}{str(version)[:16]}{SHARED_SUFFIX}")
+
+
+def _to_arrow(df: pd.DataFrame) -> pa.Table:
+    """
+    Convierte el DataFrame a Arrow con columnas que se pueden mapear sin copia.
+
+    `from_pandas` convierte los NaN de las columnas de coma flotante en
+    nulos, y una columna con nulos se copia al volver a pandas. Esas
+    columnas se guardan con los NaN como valores, sin máscara de nulos.
+    """
+    table = pa.Table.from_pandas(df)
+    for position, name in enumerate(df.columns):
+        values = df[name]
+        if values.dtype.kind == 'f' and values.isna().any():
+            table = table.set_column(position, table.field(position),
+                                     pa.array(values.to_numpy(), from_pandas=False))
+    return table
+
+
+def publish_dataset(df: pd.DataFrame, directory: str, version: str) -> str:
+    """
+    Publica los datos procesados en un archivo Arrow IPC sin comprimir.
+
+    El archivo se escribe en uno temporal y se renombra, así que los
+    procesos que lo lean nunca ven un archivo a medias; si dos procesos
+    publican la misma versión a la vez, el segundo simplemente lo
+    reemplaza por otro idéntico. Las versiones anteriores se eliminan (en
+    Linux los procesos que aún las tienen mapeadas las siguen leyendo).
+
+    Args:
+        df: DataFrame procesado.
+        directory: Directorio compartido; en Linux, `/dev/shm/...` lo
+            mantiene en memoria.
+        version: Versión de los datos (`df.attrs['data_version']`).
+
+    Returns:
+        La ruta del archivo publicado.
+    """
+    os.makedirs(directory, exist_ok=True)
+    path = shared_path(directory, version)
+    table = _to_arrow(df)
+    metadata = dict(table.schema.metadata or {})
+    metadata[_VERSION_KEY] = str(version).encode('utf-8')
+    table = table.replace_schema_metadata(metadata)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with pa.OSFile(tmp_path, 'wb') as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    os.replace(tmp_path, path)
+
+    for stale in glob.glob(os.path.join(directory, f"{SHARED_PREFIX}*{SHARED_SUFFIX}")):
+        if stale != path:
+            try:
+                os.remove(stale)
+            except OSError:
+                pass
+    return path
+
+
+def attach_dataset(path: str) -> pd.DataFrame:
+    """
+    Abre un archivo publicado con `publish_dataset` sin copiar los datos.
+
+    El archivo se mapea en memoria y cada columna se convierte en un bloque
+    propio de pandas que apunta al mapa, así que todos los procesos que lo
+    abren comparten las mismas páginas. Las columnas numéricas, de fechas y
+    los códigos de las categóricas no se copian; las booleanas (un bit por
+    fila en Arrow) sí. Los arrays resultantes son de sólo lectura.
+
+    Returns:
+        El DataFrame, con la versión en `attrs['data_version']`.
+    """
+    table = pa.ipc.open_file(pa.memory_map(path)).read_all()
+    df = table.to_pandas(split_blocks=True)
+    metadata = table.schema.metadata or {}
+    if _VERSION_KEY in metadata:
+        df.attrs['data_version'] = metadata[_VERSION_KEY].decode('utf-8')
+    return df
+
+
+def shared_dataset(directory: str, version: str, load: Callable[[], pd.DataFrame]) -> pd.DataFrame:
+    """
+    Devuelve la versión `version` de los datos desde el directorio compartido.
+
+    Si ya está publicada (por este u otro proceso) se abre sin copia; si no,
+    se genera con `load`, se publica y se abre el archivo publicado, de
+    modo que el proceso que publica tampoco conserva su copia privada.
+
+    Args:
+        directory: Directorio compartido.
+        version: Versión esperada de los datos.
+        load: Función que genera los datos procesados.
+    """
+    path = shared_path(directory, version)
+    if not os.path.exists(path):
+        df = load()
+        publish_dataset(df, directory, version)
+        extra = {key: value for key, value in df.attrs.items() if key != 'data_version'}
+        del df
+    else:
+        extra = {}
+    attached = attach_dataset(path)
+    attached.attrs.update(extra)
+    return attached
+
@@ -0,0 +1,175 @@
+import threading
+from collections import OrderedDict
+from typing import Callable, Hashable, Iterable, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Estadísticas de `DataFrame.describe()` para columnas numéricas, en su orden
+DESCRIBE_ROWS = ['count', 'mean', 'std', 'min', '25%', '50%', '75%', 'max']
+_QUARTILES = (0.25, 0.5, 0.75)
+
+
+class TableView:
+    """
+    Vista paginada de un DataFrame con ordenación en el servidor.
+
+    Para cada columna usada al ordenar o resumir se calcula una sola vez el
+    rango de cada fila en el orden ascendente (nulos al final) y los valores
+    ya ordenados. Con ellos una página ordenada de una selección de filas
+    sale de una selección parcial (`np.argpartition`) sobre los rangos de
+    la selección, y los cuartiles de `describe` de otra sobre los mismos
+    rangos, sin ordenar la selección ni copiar sus filas. Sólo las filas de
+    la página visible se extraen del DataFrame.
+
+    Los resúmenes de `describe` se guardan en una caché LRU acotada por la
+    clave de la consulta. Es seguro compartir la vista entre sesiones.
+
+    Args:
+        df: DataFrame procesado.
+        maxsize: Resúmenes guardados en la caché.
+    """
+
+    def __init__(self, df: pd.DataFrame, maxsize: int = 64):
+        self.df = df
+        # Columnas que resume `DataFrame.describe()` (calculadas sobre una vista vacía)
+        self.numeric_columns = df.iloc[:0].select_dtypes('number').columns
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._sorted = {}
+        self._summaries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.df)
+
+    def _sorted_column(self, column: str) -> Tuple[np.ndarray, np.ndarray, int]:
+        """Rango de cada fila, valores ordenados y número de valores no nulos."""
+        with self._lock:
+            if column in self._sorted:
+                return self._sorted[column]
+        series = self.df[column].reset_index(drop=True)
+        # `sort_values` ordena cualquier tipo (categorías por su orden, nulos al final)
+        order = series.sort_values(kind='stable', na_position='last').index.to_numpy()
+        values = series.to_numpy()
+        rank_dtype = np.int32 if len(values) < 2 ** 31 else np.int64
+        ranks = np.empty(len(values), dtype=rank_dtype)
+        ranks[order] = np.arange(len(values), dtype=rank_dtype)
+        valid = int(series.notna().sum())
+        entry = (ranks, values[order], valid)
+        with self._lock:
+            self._sorted[column] = entry
+        return entry
+
+    def _sort_keys(self, column: str, ascending: bool, positions: np.ndarray) -> np.ndarray:
+        """Claves de orden de las filas seleccionadas; los nulos siempre al final."""
+        ranks, _, valid = self._sorted_column(column)
+        keys = ranks[positions]
+        if not ascending:
+            keys = np.where(keys < valid, valid - 1 - keys, keys)
+        return keys
+
+    @staticmethod
+    def page_count(rows: int, page_size: int) -> int:
+        """Páginas necesarias para `rows` filas (al menos una)."""
+        return max(1, -(-rows // page_size))
+
+    def page(self, positions: np.ndarray, number: int = 0, page_size: int = 50,
+             sort_by: Optional[str] = None, ascending: bool = True) -> pd.DataFrame:
+        """
+        Devuelve una página de las filas seleccionadas.
+
+        Args:
+            positions: Posiciones de fila seleccionadas (por ejemplo, de
+                `FilterIndex.query`).
+            number: Página, empezando en 0.
+            page_size: Filas por página.
+            sort_by: Columna por la que ordenar; `None` mantiene el orden
+                de `positions`.
+            ascending: Sentido del orden. Los nulos quedan siempre al final.
+
+        Returns:
+            Las filas de la página, con el índice del DataFrame original.
+        """
+        positions = np.asarray(positions)
+        start = number * page_size
+        stop = min(start + page_size, len(positions))
+        if start >= stop:
+            return self.df.iloc[:0]
+        if sort_by is None:
+            return self.df.take(positions[start:stop])
+
+        keys = self._sort_keys(sort_by, ascending, positions)
+        # Sólo las claves de la página quedan en su sitio; el resto no se ordena
+        candidates = np.argpartition(keys, [start, stop - 1])[start:stop]
+        visible = candidates[np.argsort(keys[candidates], kind='stable')]
+        return self.df.take(positions[visible])
+
+    def _describe(self, positions: np.ndarray, columns: Iterable[str]) -> pd.DataFrame:
+        summary = {}
+        for column in columns:
+            ranks, ordered, valid = self._sorted_column(column)
+            selected = ranks[positions]
+            selected = selected[selected < valid]
+            count = len(selected)
+            stats = dict.fromkeys(DESCRIBE_ROWS, np.nan)
+            stats['count'] = float(count)
+            if count:
+                values = ordered[selected].astype('float64')
+                stats['mean'] = values.mean()
+                stats['std'] = values.std(ddof=1) if count > 1 else np.nan
+                # Posiciones de los cuartiles con la interpolación lineal de `Series.quantile`
+                points = np.array([0.0, *_QUARTILES, 1.0]) * (count - 1)
+                lower = np.floor(points).astype(np.int64)
+                upper = np.minimum(lower + 1, count - 1)
+                kth = np.unique(np.concatenate([lower, upper]))
+                partitioned = np.partition(selected, kth)
+                low_values = ordered[partitioned[lower]].astype('float64')
+                high_values = ordered[partitioned[upper]].astype('float64')
+                quantiles = low_values + (high_values - low_values) * (points - lower)
+                stats['min'], stats['25%'], stats['50%'], stats['75%'], stats['max'] = quantiles
+            summary[column] = stats
+        return pd.DataFrame(summary, index=DESCRIBE_ROWS, columns=list(columns), dtype='float64')
+
+    def describe(self, positions: np.ndarray, key: Optional[Hashable] = None,
+                 columns: Optional[Iterable[str]] = None) -> pd.DataFrame:
+        """
+        Resumen de las filas seleccionadas con las filas y columnas de `describe()`.
+
+        Args:
+            positions: Posiciones de fila seleccionadas.
+            key: Clave de la consulta que produjo `positions` (por ejemplo,
+                sus filtros). Si se indica, el resumen se guarda en la caché
+                y las llamadas con la misma clave no recorren la selección.
+            columns: Columnas a resumir; por defecto, las numéricas.
+
+        Returns:
+            Un DataFrame con una fila por estadística y una columna por
+            columna resumida.
+        """
+        columns = list(self.numeric_columns if columns is None else columns)
+        compute = lambda: self._describe(np.asarray(positions), columns)
+        if key is None:
+            return compute()
+        return self._memoized((key, tuple(columns)), compute)
+
+    def _memoized(self, key: tuple, compute: Callable[[], pd.DataFrame]) -> pd.DataFrame:
+        with self._lock:
+            if key in self._summaries:
+                self._summaries.move_to_end(key)
+                self.hits += 1
+                return self._summaries[key]
+            self.misses += 1
+        result = compute()
+        with self._lock:
+            self._summaries[key] = result
+            self._summaries.move_to_end(key)
+            while len(self._summaries) > self.maxsize:
+                self._summaries.popitem(last=False)
+        return result
+
+    def cache_info(self) -> dict:
+        """Aciertos, fallos y tamaño actual de la caché de resúmenes."""
+        return {'hits': self.hits, 'misses': self.misses,
+                'size': len(self._summaries), 'maxsize': self.maxsize}
@@ -0,0 +1,153 @@
+from typing import Dict, Hashable, Iterable, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Granularidades de las series temporales, de la más fina a la más gruesa
+GRANULARITIES = ('day', 'week', 'month')
+
+# Día que marca una fecha nula en los números de día
+MISSING_DAY = np.iinfo(np.int32).min
+
+# Sumas y conteos que se guardan por periodo, año del modelo y condición
+_VALUES = ['rows', 'price_sum', 'price_count', 'condition_score_sum', 'condition_score_count']
+
+
+def day_numbers(dates: pd.Series) -> np.ndarray:
+    """
+    Convierte fechas a días desde 1970-01-01 (int32).
+
+    Las fechas nulas se convierten en `MISSING_DAY`.
+    """
+    values = dates.to_numpy(dtype='datetime64[ns]').astype('datetime64[D]')
+    days = values.astype(np.int64)
+    days[np.isnat(values)] = MISSING_DAY
+    return days.astype(np.int32)
+
+
+def _period_starts(days: np.ndarray, granularity: str) -> np.ndarray:
+    """Primer día (número de día) del periodo de cada día."""
+    if granularity == 'day':
+        return days
+    if granularity == 'week':
+        # El 1970-01-01 fue jueves: las semanas empiezan en lunes, como `to_period('W')`
+        return days - (days + 3) % 7
+    months = days.astype('datetime64[D]').astype('datetime64[M]')
+    return months.astype('datetime64[D]').astype(np.int32)
+
+
+class TimeSeriesStore:
+    """
+    Series temporales precalculadas de precio y condición por periodo de publicación.
+
+    Las fechas se convierten una vez a números de día (int32) y se agregan
+    sumas y conteos por día × año del modelo × condición; a partir de esa
+    tabla se precalculan los acumulados por semana y por mes. Una tendencia
+    con cualquier filtro de años y condiciones se responde con una máscara
+    y un `np.bincount` sobre el acumulado de su granularidad, cuyo tamaño
+    depende del número de periodos y no del de anuncios.
+
+    Las filas sin fecha de publicación no se incluyen.
+
+    Args:
+        df: DataFrame procesado.
+        version: Versión de los datos; por defecto `df.attrs['data_version']`.
+    """
+
+    def __init__(self, df: pd.DataFrame, version: Optional[Hashable] = None):
+        self.version = version if version is not None else df.attrs.get('data_version')
+        condition = df['condition']
+        if not isinstance(condition.dtype, pd.CategoricalDtype):
+            condition = condition.astype('category')
+        self.conditions = [str(value) for value in condition.cat.categories]
+
+        days = day_numbers(df['date_posted'])
+        valid = days != MISSING_DAY
+        keys = pd.DataFrame({
+            'day': days,
+            'model_year': df['model_year'].to_numpy(dtype='float64'),
+            'condition': condition.cat.codes.to_numpy(),
+        })[valid]
+        values = pd.DataFrame({
+            'rows': np.ones(len(df), dtype='int64'),
+            'price_sum': df['price'].to_numpy(dtype='float64'),
+            'price_count': df['price'].notna().to_numpy(dtype='int64'),
+            'condition_score_sum': df['condition_score'].to_numpy(dtype='float64'),
+            'condition_score_count': df['condition_score'].notna().to_numpy(dtype='int64'),
+        })[valid]
+        daily = values.groupby([keys['day'], keys['model_year'], keys['condition']],
+                               dropna=False).sum(min_count=0).reset_index()
+
+        self._rollups = {granularity: self._rollup(daily, granularity) for granularity in GRANULARITIES}
+
+    @staticmethod
+    def _rollup(daily: pd.DataFrame, granularity: str) -> Dict[str, np.ndarray]:
+        """Acumulado por periodo × año del modelo × condición en arrays de NumPy."""
+        period = _period_starts(daily['day'].to_numpy(dtype=np.int32), granularity)
+        totals = daily[_VALUES].groupby([period, daily['model_year'], daily['condition']],
+                                        dropna=False).sum(min_count=0)
+        starts, slots = np.unique(totals.index.get_level_values(0).to_numpy(), return_inverse=True)
+        rollup = {column: totals[column].to_numpy() for column in _VALUES}
+        rollup.update(
+            slot=slots.astype(np.int32),
+            model_year=totals.index.get_level_values(1).to_numpy(dtype='float64'),
+            condition=totals.index.get_level_values(2).to_numpy(dtype=np.int8),
+            starts=starts.astype(np.int32),
+        )
+        return rollup
+
+    def __len__(self) -> int:
+        """Filas de la tabla diaria."""
+        return len(self._rollups['day']['slot'])
+
+    @property
+    def nbytes(self) -> int:
+        """Memoria de los acumulados de todas las granularidades."""
+        return int(sum(array.nbytes for rollup in self._rollups.values() for array in rollup.values()))
+
+    def _mask(self, rollup: Dict[str, np.ndarray], year_range, conditions) -> np.ndarray:
+        mask = np.ones(len(rollup['slot']), dtype=bool)
+        if year_range is not None:
+            years = rollup['model_year']
+            mask &= (years >= year_range[0]) & (years <= year_range[1])
+        if conditions is not None:
+            codes = [self.conditions.index(name) for name in conditions if name in self.conditions]
+            mask &= np.isin(rollup['condition'], codes)
+        return mask
+
+    def trend(self, granularity: str = 'month', year_range: Optional[Tuple[int, int]] = None,
+              conditions: Optional[Iterable[str]] = None) -> pd.DataFrame:
+        """
+        Precio medio, número de anuncios y condición media por periodo.
+
+        Args:
+            granularity: Uno de `GRANULARITIES`; las semanas empiezan en lunes.
+            year_range: Años del modelo (inclusive); None para todos.
+            conditions: Condiciones incluidas; None para todas.
+
+        Returns:
+            Un DataFrame con las columnas `period` (primer día del periodo),
+            `price_mean`, `price_count` y `condition_score`, con una fila por
+            periodo con anuncios en orden cronológico.
+
+        Raises:
+            ValueError: Si la granularidad no es una de `GRANULARITIES`.
+        """
+        if granularity not in GRANULARITIES:
+            raise ValueError(f"granularity debe ser uno de {GRANULARITIES}, no {granularity!r}")
+        rollup = self._rollups[granularity]
+        mask = self._mask(rollup, year_range, conditions)
+        slots = rollup['slot'][mask]
+        length = len(rollup['starts'])
+        totals = {column: np.bincount(slots, weights=rollup[column][mask], minlength=length)
+                  for column in _VALUES}
+        present = totals['rows'] > 0
+        with np.errstate(invalid='ignore', divide='ignore'):
+            price_mean = totals['price_sum'] / totals['price_count']
+            condition_score = totals['condition_score_sum'] / totals['condition_score_count']
+        return pd.DataFrame({
+            'period': rollup['starts'][present].astype('datetime64[D]').astype('datetime64[ns]'),
+            'price_mean': price_mean[present],
+            'price_count': totals['price_count'][present].astype('int64'),
+            'condition_score': condition_score[present],
+        })
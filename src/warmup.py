@@ -0,0 +1,214 @@
+import json
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.charts import histogram_bins
+from src.filters import Selection
+from src.instrumentation import StageHook
+
+# Resumen precalculado que el dashboard muestra mientras carga los datos completos
+SNAPSHOT_FILE = 'snapshot.json'
+
+# Columnas con histograma en el resumen (las del modo "Distribuciones")
+SNAPSHOT_HISTOGRAMS = ['odometer', 'price']
+
+# Un paso de la carga recibe los resultados de los pasos anteriores y un hook de etapas
+LoadStep = Callable[[Dict[str, Any], StageHook], Any]
+
+
+def summary_metrics(selection: Selection) -> dict:
+    """
+    Métricas de la cabecera del dashboard para una selección de filas.
+
+    Returns:
+        Filas, medias de precio, odómetro y año, precios mínimo y máximo y
+        la condición más frecuente.
+    """
+    prices = selection.column('price')
+    return {
+        'rows': len(selection),
+        'price_mean': float(prices.mean()),
+        'price_min': int(prices.min()),
+        'price_max': int(prices.max()),
+        'odometer_mean': float(selection.column('odometer').mean()),
+        'model_year_mean': float(selection.column('model_year').mean()),
+        'condition': str(selection.column('condition').mode()[0]),
+    }
+
+
+def build_snapshot(df: pd.DataFrame, nbins: int = 50, top_manufacturers: int = 10) -> dict:
+    """
+    Resumen del conjunto completo con los filtros por defecto del dashboard.
+
+    Contiene las métricas de la cabecera, los histogramas de
+    `SNAPSHOT_HISTOGRAMS`, los fabricantes con más anuncios y los valores
+    de los filtros (años y condiciones). Ocupa unos pocos KB y se lee en
+    milisegundos, así que se puede mostrar antes de cargar los datos.
+
+    Args:
+        df: DataFrame procesado.
+        nbins: Intervalos de los histogramas.
+        top_manufacturers: Fabricantes incluidos.
+    """
+    everything = Selection(df, np.arange(len(df)))
+    manufacturers = df['manufacturer'].value_counts().head(top_manufacturers)
+    return {
+        'data_version': df.attrs.get('data_version'),
+        'created_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'metrics': summary_metrics(everything),
+        'year_range': [int(df['model_year'].min()), int(df['model_year'].max())],
+        'conditions': sorted(str(value) for value in df['condition'].dropna().unique()),
+        'histograms': {
+            column: histogram_bins(df[column], nbins=nbins).to_dict(orient='list')
+            for column in SNAPSHOT_HISTOGRAMS
+        },
+        'manufacturers': {str(name): int(count) for name, count in manufacturers.items()},
+    }
+
+
+def write_snapshot(snapshot: dict, path: str) -> str:
+    """Escribe el resumen como JSON de forma atómica y devuelve la ruta."""
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(snapshot, f)
+    os.replace(tmp_path, path)
+    return path
+
+
+def read_snapshot(path: str) -> Optional[dict]:
+    """Lee el resumen; `None` si todavía no existe o no se puede leer."""
+    try:
+        with open(path, encoding='utf-8') as f:
+            snapshot = json.load(f)
+    except (OSError, ValueError):
+        return None
+    snapshot['histograms'] = {column: pd.DataFrame(bins)
+                              for column, bins in snapshot.get('histograms', {}).items()}
+    return snapshot
+
+
+def failed_load(loader: 'BackgroundLoader', clear: Callable[[], None]) -> Optional[str]:
+    """
+    Error de una carga terminada; si lo hay, descarta el cargador con `clear`.
+
+    El dashboard guarda el cargador con `st.cache_resource`, que también
+    guarda los cargadores cuyo hilo falló. Con `clear` (por ejemplo,
+    `cached_loader.clear`) la siguiente ejecución o sesión crea uno nuevo y
+    vuelve a intentar la carga en lugar de mostrar el mismo error hasta
+    reiniciar el servidor.
+
+    Returns:
+        El mensaje del error, o None si la carga terminó sin errores.
+    """
+    if loader.error is None:
+        return None
+    clear()
+    return str(loader.error)
+
+
+class BackgroundLoader:
+    """
+    Ejecuta la carga de los datos y el calentamiento de las cachés en un hilo.
+
+    Los pasos se ejecutan en orden; cada uno recibe un diccionario con los
+    resultados de los anteriores (por nombre) y un hook que registra sus
+    etapas internas (por ejemplo, las de `load_and_preprocess_data`). El
+    progreso se puede consultar en cualquier momento desde otro hilo, así
+    que el dashboard puede mostrar un resumen y el avance mientras tanto.
+
+    Args:
+        steps: Pares (nombre, función) en orden de ejecución.
+    """
+
+    def __init__(self, steps: Sequence[Tuple[str, LoadStep]]):
+        self.steps = list(steps)
+        self.results: Dict[str, Any] = {}
+        self.error: Optional[Exception] = None
+        self._events: List[Dict[str, Any]] = []
+        self._current: Optional[str] = None
+        self._started_at: Optional[float] = None
+        self._finished = threading.Event()
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> 'BackgroundLoader':
+        """Lanza el hilo (sólo la primera vez) y devuelve el propio cargador."""
+        with self._lock:
+            if self._thread is None:
+                self._started_at = time.perf_counter()
+                self._thread = threading.Thread(target=self._run, name='dashboard-loader', daemon=True)
+                self._thread.start()
+        return self
+
+    def _record(self, event: Dict[str, Any]) -> None:
+        with self._lock:
+            self._events.append(dict(event, step=self._current))
+
+    def _run(self) -> None:
+        try:
+            for name, step in self.steps:
+                with self._lock:
+                    self._current = name
+                start = time.perf_counter()
+                result = step(self.results, self._record)
+                with self._lock:
+                    self.results[name] = result
+                    self._events.append({'stage': name, 'step': name,
+                                         'seconds': time.perf_counter() - start})
+        except Exception as error:
+            # Se guarda para mostrarlo en el dashboard en lugar de perderlo en el hilo
+            self.error = error
+        finally:
+            with self._lock:
+                self._current = None
+            self._finished.set()
+
+    @property
+    def done(self) -> bool:
+        """Indica si la carga terminó (con o sin error)."""
+        return self._finished.is_set()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Espera a que termine la carga; devuelve False si vence el plazo."""
+        return self._finished.wait(timeout)
+
+    def result(self, name: str) -> Any:
+        """
+        Resultado de un paso terminado.
+
+        Raises:
+            RuntimeError: Si la carga falló (con el error original como causa).
+            KeyError: Si el paso todavía no ha terminado.
+        """
+        if self.error is not None:
+            raise RuntimeError(f"La carga de datos falló: {self.error}") from self.error
+        return self.results[name]
+
+    def progress(self) -> dict:
+        """
+        Estado actual de la carga.
+
+        Returns:
+            Un diccionario con el paso en curso (`current`), los pasos
+            terminados y totales, la fracción completada, los segundos
+            transcurridos, los eventos de cada etapa terminada (los de los
+            pasos y los de sus etapas internas, en orden) y el error, si lo hubo.
+        """
+        with self._lock:
+            completed = len(self.results)
+            elapsed = time.perf_counter() - self._started_at if self._started_at is not None else 0.0
+            return {
+                'current': self._current,
+                'completed': completed,
+                'total': len(self.steps),
+                'fraction': completed / len(self.steps) if self.steps else 1.0,
+                'elapsed': elapsed,
+                'events': list(self._events),
+                'error': None if self.error is None else str(self.error),
+            }
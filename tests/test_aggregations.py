@@ -0,0 +1,88 @@
+import os
+import tempfile
+import unittest
+
+import pandas as pd
+
+from benchmarks.synthetic import write_vehicles_csv
+from src.aggregations import AggregateCache
+from src.data_processing import load_and_preprocess_data
+
+
+class TestAggregateCache(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        """Procesar un CSV sintético y construir el cubo"""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            csv_path = write_vehicles_csv(os.path.join(tmp_dir, 'vehicles.csv'), 20000)
+            cls.df = load_and_preprocess_data(csv_path)
+        cls.year_range = (2005, 2015)
+        cls.conditions = ['good', 'excellent', 'like new']
+        cls.filtered = cls.df[
+            cls.df['model_year'].between(*cls.year_range) &
+            cls.df['condition'].isin(cls.conditions)
+        ]
+
+    def test_manufacturer_stats_match_groupby(self):
+        """El resumen por fabricante coincide con el groupby sobre las filas"""
+        expected = self.filtered.groupby('manufacturer').agg({
+            'price': ['mean', 'count'],
+            'condition_score': 'mean'
+        }).round(2)
+        stats = AggregateCache(self.df).manufacturer_stats(self.year_range, self.conditions)
+        pd.testing.assert_frame_equal(stats.sort_index(), expected, check_dtype=False)
+        self.assertTrue(stats[('price', 'count')].is_monotonic_decreasing)
+
+    def test_monthly_stats_match_groupby(self):
+        """El resumen mensual coincide con el groupby por `Period('M')`"""
+        temporal = self.filtered.assign(year_month=self.filtered['date_posted'].dt.to_period('M'))
+        expected = temporal.groupby('year_month').agg({
+            'price': ['mean', 'count'],
+            'condition_score': 'mean'
+        }).reset_index()
+        expected['year_month'] = expected['year_month'].astype(str)
+        expected.columns = ['year_month', 'price_mean', 'price_count', 'condition_score']
+
+        stats = AggregateCache(self.df).monthly_stats(self.year_range, self.conditions)
+        pd.testing.assert_frame_equal(stats, expected, check_dtype=False)
+
+    def test_cube_with_text_dimensions(self):
+        """Un cubo con fabricantes como texto (p. ej., combinado) y fabricantes vacíos da el mismo resumen"""
+        df = self.df.copy()
+        df.loc[df.index[::50], 'manufacturer'] = None
+        categorical = AggregateCache(df)
+        text = AggregateCache.from_cube(categorical.cube.astype({'manufacturer': object, 'condition': object}))
+        expected = categorical.manufacturer_stats(self.year_range, self.conditions)
+        stats = text.manufacturer_stats(self.year_range, self.conditions)
+        self.assertListEqual(list(stats.index), list(expected.index))
+        self.assertNotIn(None, list(stats.index))
+        pd.testing.assert_frame_equal(stats.reset_index(drop=True), expected.reset_index(drop=True))
+        pd.testing.assert_frame_equal(text.monthly_stats(), categorical.monthly_stats())
+
+    def test_lru_is_bounded(self):
+        """La caché de resúmenes respeta su tamaño máximo y cuenta aciertos"""
+        cache = AggregateCache(self.df, maxsize=2)
+        cache.manufacturer_stats((2000, 2010), ['good'])
+        cache.manufacturer_stats((2000, 2010), ['good'])
+        cache.monthly_stats((2000, 2010), ['good'])
+        cache.monthly_stats((2001, 2010), ['good'])
+        info = cache.cache_info()
+        self.assertEqual(info['hits'], 1)
+        self.assertEqual(info['misses'], 3)
+        self.assertEqual(info['size'], 2)
+
+    def test_refresh_on_new_version(self):
+        """Un cambio de versión reconstruye el cubo y vacía la caché"""
+        cache = AggregateCache(self.df, version='v1')
+        cache.manufacturer_stats()
+        self.assertFalse(cache.refresh(self.df, version='v1'))
+        self.assertEqual(cache.cache_info()['size'], 1)
+
+        subset = self.df[self.df['manufacturer'] == 'Ford']
+        self.assertTrue(cache.refresh(subset, version='v2'))
+        self.assertEqual(cache.cache_info()['size'], 0)
+        self.assertEqual(list(cache.manufacturer_stats().index), ['Ford'])
+
+
+if __name__ == '__main__':
+    unittest.main()
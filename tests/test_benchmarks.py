@@ -0,0 +1,56 @@
+import json
+import os
+import tempfile
+import unittest
+
+from benchmarks.bench_suite import SCENARIOS, compare, main, parse_size
+
+
+class TestBenchmarkSuite(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.output_dir = os.path.join(self.tmp_dir.name, 'results')
+        self.baseline = os.path.join(self.output_dir, 'baseline.json')
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def _run(self, *extra):
+        return main(['--sizes', '2k', '--repeat', '1', '--output-dir', self.output_dir,
+                     '--baseline', self.baseline, *extra])
+
+    def test_parse_size(self):
+        """Los tamaños aceptan sufijos k y M"""
+        self.assertEqual(parse_size('10k'), 10_000)
+        self.assertEqual(parse_size('1M'), 1_000_000)
+        self.assertEqual(parse_size('250000'), 250_000)
+
+    def test_results_and_baseline(self):
+        """Se guardan los resultados y la línea base con todos los escenarios"""
+        self.assertEqual(self._run('--update-baseline'), 0)
+        with open(self.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+        self.assertListEqual(list(baseline['sizes']['2000']['scenarios']), SCENARIOS)
+        self.assertTrue(any(name.startswith('bench-') for name in os.listdir(self.output_dir)))
+
+    def test_regression_fails(self):
+        """Un escenario más lento que la línea base hace fallar la suite"""
+        self._run('--update-baseline')
+        with open(self.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+        baseline['sizes']['2000']['scenarios']['load']['seconds'] = 1e-6
+        with open(self.baseline, 'w', encoding='utf-8') as f:
+            json.dump(baseline, f)
+        self.assertEqual(self._run(), 1)
+
+    def test_compare_ignores_noise(self):
+        """Las diferencias por debajo del umbral absoluto no cuentan"""
+        baseline = {'sizes': {'10': {'scenarios': {'load': {'seconds': 0.001}}}}}
+        current = {'sizes': {'10': {'scenarios': {'load': {'seconds': 0.002}}}}}
+        self.assertEqual(compare(current, baseline), [])
+        current['sizes']['10']['scenarios']['load']['seconds'] = 0.5
+        self.assertEqual(compare(current, baseline)[0]['scenario'], 'load')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import pandas as pd
+
+from benchmarks.synthetic import write_vehicles_csv
+from src.cache import file_fingerprint, load_processed_data
+from src.instrumentation import StageRecorder
+
+
+class TestProcessedDataCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.csv_path = write_vehicles_csv(os.path.join(self.tmp_dir, 'vehicles.csv'), 2000)
+        self.cache_dir = os.path.join(self.tmp_dir, 'processed')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def _cache_files(self):
+        return sorted(os.listdir(self.cache_dir))
+
+    def test_second_load_reads_cache(self):
+        """La segunda carga lee el Parquet y conserva los tipos"""
+        first = load_processed_data(self.csv_path, cache_dir=self.cache_dir)
+        self.assertEqual(len(self._cache_files()), 1)
+
+        second = load_processed_data(self.csv_path, cache_dir=self.cache_dir)
+        pd.testing.assert_frame_equal(first, second)
+        self.assertEqual(second['model_year'].dtype, 'int16')
+        self.assertEqual(second['age_category'].dtype.name, 'category')
+
+    def test_changed_source_invalidates_cache(self):
+        """Modificar el CSV genera una nueva entrada y elimina la antigua"""
+        load_processed_data(self.csv_path, cache_dir=self.cache_dir)
+        old_files = self._cache_files()
+
+        write_vehicles_csv(self.csv_path, 1500, seed=1)
+        load_processed_data(self.csv_path, cache_dir=self.cache_dir)
+        new_files = self._cache_files()
+
+        self.assertEqual(len(new_files), 1)
+        self.assertNotEqual(old_files, new_files)
+
+    def test_fingerprint_depends_on_params(self):
+        """Los parámetros de preprocesamiento forman parte de la clave"""
+        self.assertNotEqual(
+            file_fingerprint(self.csv_path, {'min_price': 500}),
+            file_fingerprint(self.csv_path, {'min_price': 1000}),
+        )
+
+    def test_hook_is_not_part_of_the_key(self):
+        """Con hook se reutiliza la entrada y se notifica la lectura de la caché"""
+        load_processed_data(self.csv_path, cache_dir=self.cache_dir)
+        recorder = StageRecorder()
+        load_processed_data(self.csv_path, cache_dir=self.cache_dir, hook=recorder)
+        self.assertEqual(len(self._cache_files()), 1)
+        self.assertEqual([event['stage'] for event in recorder.events], ['read_cache'])
+
+    def test_other_sources_and_params_are_kept(self):
+        """Limpiar una entrada no borra las de otro CSV con nombre parecido ni las de otros parámetros"""
+        other_path = write_vehicles_csv(os.path.join(self.tmp_dir, 'vehicles-2.csv'), 1000, seed=2)
+        load_processed_data(self.csv_path, cache_dir=self.cache_dir)
+        load_processed_data(other_path, cache_dir=self.cache_dir)
+        load_processed_data(self.csv_path, cache_dir=self.cache_dir, min_price=1000)
+        self.assertEqual(len(self._cache_files()), 3)
+
+        recorder = StageRecorder()
+        load_processed_data(self.csv_path, cache_dir=self.cache_dir, hook=recorder)
+        self.assertEqual([event['stage'] for event in recorder.events], ['read_cache'])
+
+
+if __name__ == '__main__':
+    unittest.main()
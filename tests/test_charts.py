@@ -0,0 +1,59 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.synthetic import make_vehicles_frame
+from src.charts import downsample_scatter, histogram_bins
+
+
+class TestHistogramBins(unittest.TestCase):
+    def test_counts_match_numpy(self):
+        """Los conteos coinciden con `np.histogram` e ignoran nulos"""
+        values = pd.Series([1.0, 2.0, 2.5, np.nan, 9.0, 10.0])
+        bins = histogram_bins(values, nbins=3)
+        counts, edges = np.histogram([1.0, 2.0, 2.5, 9.0, 10.0], bins=3)
+        np.testing.assert_array_equal(bins['count'], counts)
+        np.testing.assert_allclose(bins['bin_start'], edges[:-1])
+        self.assertEqual(bins['count'].sum(), 5)
+
+    def test_fixed_range(self):
+        """Con `value_range` los intervalos cubren exactamente ese rango"""
+        bins = histogram_bins(pd.Series([0, 10, 60000]), nbins=5, value_range=(0, 50000))
+        self.assertEqual(bins['bin_start'].iloc[0], 0)
+        self.assertEqual(bins['bin_end'].iloc[-1], 50000)
+        self.assertEqual(bins['count'].sum(), 2)
+
+    def test_empty_input(self):
+        """Una serie vacía produce un histograma vacío"""
+        self.assertTrue(histogram_bins(pd.Series([], dtype='float64')).empty)
+
+
+class TestDownsampleScatter(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.df = make_vehicles_frame(50000, seed=4)
+
+    def test_small_input_unchanged(self):
+        """Por debajo del presupuesto se devuelven todas las filas"""
+        small = self.df.dropna(subset=['odometer']).head(100)
+        pd.testing.assert_frame_equal(downsample_scatter(small, 'odometer', 'price'), small)
+
+    def test_respects_budget(self):
+        """El resultado nunca supera el presupuesto de puntos"""
+        for budget in [500, 2000, 5000]:
+            with self.subTest(budget=budget):
+                sample = downsample_scatter(self.df, 'odometer', 'price', max_points=budget)
+                self.assertLessEqual(len(sample), budget)
+                self.assertGreater(len(sample), budget * 0.5)
+
+    def test_keeps_extremes_and_density(self):
+        """Se conservan los extremos y la forma de la distribución"""
+        data = self.df.dropna(subset=['odometer'])
+        sample = downsample_scatter(self.df, 'odometer', 'price', max_points=2000)
+        self.assertIn(data['price'].idxmax(), sample.index)
+        self.assertAlmostEqual(sample['price'].median() / data['price'].median(), 1, delta=0.15)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+import os
+import tempfile
+import unittest
+
+import pandas as pd
+
+from benchmarks.synthetic import write_vehicles_csv
+from src.aggregations import AggregateCache
+from src.artifacts import load_cube, load_dataset, load_histograms, read_manifest
+from src.charts import histogram_bins
+from src.cli import main
+from src.data_processing import load_and_preprocess_data
+
+
+class TestBuildCommand(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        """Ejecutar `vehicles-build` sobre un CSV sintético"""
+        cls.tmp_dir = tempfile.TemporaryDirectory()
+        cls.csv_path = write_vehicles_csv(os.path.join(cls.tmp_dir.name, 'vehicles.csv'), 5000)
+        cls.output_dir = os.path.join(cls.tmp_dir.name, 'artifacts')
+        cls.exit_code = main(['--input', cls.csv_path, '--output-dir', cls.output_dir])
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmp_dir.cleanup()
+
+    def test_manifest(self):
+        """El manifiesto describe los artefactos generados"""
+        self.assertEqual(self.exit_code, 0)
+        manifest = read_manifest(self.output_dir)
+        for name in manifest['files']:
+            with self.subTest(file=name):
+                self.assertTrue(os.path.exists(os.path.join(self.output_dir, name)))
+        self.assertEqual(set(manifest['timings']), {'preprocess', 'aggregate', 'write'})
+
+    def test_dataset_matches_preprocessing(self):
+        """Los datos guardados coinciden con `load_and_preprocess_data`"""
+        dataset = load_dataset(self.output_dir)
+        pd.testing.assert_frame_equal(dataset, load_and_preprocess_data(self.csv_path))
+        self.assertEqual(dataset.attrs['data_version'], read_manifest(self.output_dir)['data_version'])
+
+    def test_cube_answers_like_live_data(self):
+        """El cubo guardado responde igual que uno construido en memoria"""
+        dataset = load_dataset(self.output_dir)
+        stored = AggregateCache.from_cube(load_cube(self.output_dir))
+        live = AggregateCache(dataset)
+        pd.testing.assert_frame_equal(
+            stored.monthly_stats((2005, 2015), ['good']),
+            live.monthly_stats((2005, 2015), ['good']),
+        )
+
+    def test_histograms(self):
+        """Hay un histograma por columna con todas las filas"""
+        histograms = load_histograms(self.output_dir)
+        rows = read_manifest(self.output_dir)['rows']
+        for column, counts in histograms.groupby('column')['count']:
+            with self.subTest(column=column):
+                self.assertEqual(counts.sum(), rows)
+
+    def test_histograms_match_live_bins(self):
+        """Los histogramas guardados son los que el dashboard calcularía sin filtros"""
+        dataset = load_dataset(self.output_dir)
+        for column, bins in load_histograms(self.output_dir).groupby('column'):
+            with self.subTest(column=column):
+                pd.testing.assert_frame_equal(bins.drop(columns='column').reset_index(drop=True),
+                                              histogram_bins(dataset[column], nbins=50))
+
+
+if __name__ == '__main__':
+    unittest.main()
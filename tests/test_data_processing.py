@@ -1,7 +1,25 @@
+import os
+import tempfile
+import tracemalloc
 import unittest
 import pandas as pd
 import numpy as np
-from src.data_processing import load_and_preprocess_data
+from benchmarks.synthetic import write_vehicles_csv
+from src.data_processing import (
+    ODOMETER_METHODS,
+    SKETCH_RELATIVE_ACCURACY,
+    GroupValueCounts,
+    QuantileSketch,
+    column_quantile,
+    impute_group_median,
+    impute_group_mode,
+    impute_odometer_by_age,
+    load_and_preprocess_data,
+    load_and_preprocess_files,
+    parse_dates,
+)
+from src.config import load_config, preprocessing_options
+from src.instrumentation import StageRecorder
 
 class TestDataProcessing(unittest.TestCase):
     @classmethod
@@ -62,6 +80,24 @@ class TestDataProcessing(unittest.TestCase):
         self.assertEqual(self.processed_data['is_4wd'].dtype, 'bool')
         self.assertEqual(self.processed_data['age'].dtype, 'int16')
     
+    def test_text_columns_are_categorical(self):
+        """Las columnas de texto se leen y se devuelven como categóricas"""
+        for column in ['model', 'condition', 'paint_color', 'manufacturer']:
+            with self.subTest(column=column):
+                self.assertEqual(self.processed_data[column].dtype.name, 'category')
+                categories = list(self.processed_data[column].cat.categories)
+                self.assertListEqual(categories, sorted(categories))
+
+    def test_date_parsing(self):
+        """Las fechas categóricas y de texto se convierten igual que con `pd.to_datetime`"""
+        dates = pd.Series(['2019-01-31', None, '2018-05-01', '2019-01-31'], index=[5, 6, 7, 8])
+        expected = pd.to_datetime(dates)
+        pd.testing.assert_series_equal(parse_dates(dates), expected)
+        pd.testing.assert_series_equal(parse_dates(dates.astype('category')), expected)
+        self.assertEqual(self.processed_data['date_posted'].dtype, 'datetime64[ns]')
+        with self.assertRaises(ValueError):
+            parse_dates(pd.Series(['31/01/2019']))
+
     @classmethod
     def tearDownClass(cls):
         """Limpiar archivos temporales"""
@@ -69,5 +105,311 @@ class TestDataProcessing(unittest.TestCase):
         if os.path.exists(cls.test_file):
             os.remove(cls.test_file)
 
+
+class TestGroupImputation(unittest.TestCase):
+    def setUp(self):
+        self.df = pd.DataFrame({
+            'model': ['a', 'a', 'a', 'a', 'b', 'b', 'c'],
+            'value': [4.0, 6.0, 6.0, np.nan, 8.0, np.nan, np.nan],
+        })
+
+    def _legacy(self, func):
+        return self.df.groupby('model')['value'].transform(func)
+
+    def test_median_matches_groupby_lambda(self):
+        """La mediana vectorizada coincide con la lambda por grupo"""
+        expected = self._legacy(lambda x: x.fillna(x.median()))
+        pd.testing.assert_series_equal(impute_group_median(self.df, 'value'), expected)
+
+    def test_mode_matches_groupby_lambda(self):
+        """La moda vectorizada coincide con la lambda por grupo"""
+        expected = self._legacy(
+            lambda x: x.fillna(x.mode()[0] if not x.mode().empty else x.median())
+        )
+        pd.testing.assert_series_equal(impute_group_mode(self.df, 'value'), expected)
+
+    def test_mode_tie_uses_smallest_value(self):
+        """Ante empates la moda es el valor más pequeño"""
+        df = pd.DataFrame({'model': ['a', 'a', 'a'], 'value': [8.0, 4.0, np.nan]})
+        self.assertEqual(impute_group_mode(df, 'value').iloc[2], 4.0)
+
+    def test_categorical_groups(self):
+        """Los grupos categóricos producen el mismo resultado"""
+        categorical = self.df.assign(model=self.df['model'].astype('category'))
+        pd.testing.assert_series_equal(
+            impute_group_mode(categorical, 'value'),
+            impute_group_mode(self.df, 'value'),
+        )
+
+    def test_counts_quantile_matches_groupby(self):
+        """Los cuantiles de `GroupValueCounts` coinciden con `groupby().quantile`"""
+        counts = GroupValueCounts()
+        counts.update(self.df['model'], self.df['value'])
+        for q in [0.0, 0.3, 0.5, 0.99, 1.0]:
+            with self.subTest(q=q):
+                expected = self.df.groupby('model')['value'].quantile(q).dropna()
+                np.testing.assert_allclose(counts.quantile(q).sort_index(), expected)
+        restored = GroupValueCounts.from_frame(counts.to_frame())
+        pd.testing.assert_series_equal(restored.median(), counts.median())
+
+
+def _text_as_object(df, reference):
+    """Convierte a object las columnas categóricas que en `reference` son texto"""
+    df = df.copy()
+    for column in df.columns:
+        if df[column].dtype.name == 'category' and reference[column].dtype == object:
+            df[column] = df[column].astype(object)
+    return df
+
+
+class TestOdometerImputation(unittest.TestCase):
+    def setUp(self):
+        self.df = pd.DataFrame({
+            'model': ['a', 'a', 'b', 'b', 'a', 'b'],
+            'age_temp': [1.0, 1.0, 1.0, 1.0, 5.0, 9.0],
+            'odometer': [10000.0, np.nan, 30000.0, np.nan, 60000.0, np.nan],
+        }, index=[5, 3, 1, 0, 2, 4])
+
+    def test_age_median(self):
+        """Se usa la mediana de la misma edad y la global como respaldo"""
+        filled = impute_odometer_by_age(self.df)
+        self.assertEqual(filled.loc[3], 20000.0)
+        self.assertEqual(filled.loc[0], 20000.0)
+        self.assertEqual(filled.loc[4], 30000.0)
+        self.assertListEqual(list(filled.index), list(self.df.index))
+
+    def test_model_age_median(self):
+        """Con `by_model` se prioriza la mediana de (modelo, edad)"""
+        filled = impute_odometer_by_age(self.df, by_model=True)
+        self.assertEqual(filled.loc[3], 10000.0)
+        self.assertEqual(filled.loc[0], 30000.0)
+        self.assertEqual(filled.loc[4], 30000.0)
+
+    def test_pipeline_methods(self):
+        """Los métodos por mediana no dejan nulos ni reordenan las filas"""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            csv_path = write_vehicles_csv(os.path.join(tmp_dir, 'vehicles.csv'), 3000)
+            for method in ODOMETER_METHODS[1:]:
+                with self.subTest(method=method):
+                    df = load_and_preprocess_data(csv_path, odometer_method=method)
+                    self.assertEqual(df['odometer'].isna().sum(), 0)
+                    self.assertTrue(df.index.is_monotonic_increasing)
+            with self.assertRaises(ValueError):
+                load_and_preprocess_data(csv_path, odometer_method='knn')
+
+
+class TestStreamingIngestion(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        """Crear un CSV sintético con la forma de vehicles_us.csv"""
+        cls.tmp_dir = tempfile.TemporaryDirectory()
+        cls.csv_path = write_vehicles_csv(os.path.join(cls.tmp_dir.name, 'vehicles.csv'), 40000)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmp_dir.cleanup()
+
+    @staticmethod
+    def _peak_memory(func):
+        """Memoria máxima asignada (tracemalloc) y resultado de `func`"""
+        tracemalloc.start()
+        try:
+            result = func()
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+        return peak, result
+
+    def test_same_content_as_full_read(self):
+        """La lectura por bloques produce las mismas filas y valores"""
+        expected = load_and_preprocess_data(self.csv_path)
+        streamed = load_and_preprocess_data(self.csv_path, chunksize=7000)
+        pd.testing.assert_frame_equal(_text_as_object(streamed, expected), expected)
+
+    def test_text_columns_are_categorical(self):
+        """Las columnas de texto se leen como categóricas"""
+        streamed = load_and_preprocess_data(self.csv_path, chunksize=7000)
+        for column in ['model', 'condition', 'paint_color', 'fuel', 'type', 'manufacturer']:
+            with self.subTest(column=column):
+                self.assertEqual(streamed[column].dtype.name, 'category')
+
+    def test_peak_memory_scales_with_output(self):
+        """La memoria máxima es proporcional al resultado y no al CSV completo"""
+        full_peak, _ = self._peak_memory(lambda: load_and_preprocess_data(self.csv_path))
+        peak, streamed = self._peak_memory(
+            lambda: load_and_preprocess_data(self.csv_path, chunksize=5000)
+        )
+        output_size = streamed.memory_usage(deep=True).sum()
+        self.assertLess(peak, full_peak)
+        self.assertLess(peak, 6 * output_size)
+        self.assertLess(peak, 3 * os.path.getsize(self.csv_path))
+
+
+class TestMultiFileIngestion(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        """Crear varios CSV diarios y su concatenación"""
+        cls.tmp_dir = tempfile.TemporaryDirectory()
+        cls.shard_dir = os.path.join(cls.tmp_dir.name, 'shards')
+        os.makedirs(cls.shard_dir)
+        shards = [
+            write_vehicles_csv(os.path.join(cls.shard_dir, f'vehicles_us_{day:02d}.csv'), 3000, seed=day)
+            for day in range(1, 5)
+        ]
+        cls.combined_path = os.path.join(cls.tmp_dir.name, 'combined.csv')
+        pd.concat([pd.read_csv(path) for path in shards]).to_csv(cls.combined_path, index=False)
+        cls.expected = load_and_preprocess_data(cls.combined_path)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmp_dir.cleanup()
+
+    def test_process_pool_matches_single_file(self):
+        """Los archivos procesados en paralelo equivalen al CSV concatenado"""
+        result = load_and_preprocess_files(self.shard_dir, max_workers=2)
+        pd.testing.assert_frame_equal(_text_as_object(result, self.expected), self.expected)
+
+    def test_glob_pattern_sequential(self):
+        """Un patrón glob con un solo proceso produce el mismo resultado"""
+        pattern = os.path.join(self.shard_dir, 'vehicles_us_*.csv')
+        result = load_and_preprocess_files(pattern, max_workers=1, chunksize=1000)
+        pd.testing.assert_frame_equal(_text_as_object(result, self.expected), self.expected)
+
+    def test_no_files(self):
+        """Un patrón sin coincidencias lanza FileNotFoundError"""
+        with self.assertRaises(FileNotFoundError):
+            load_and_preprocess_files(os.path.join(self.shard_dir, '*.parquet'))
+
+
+class TestPreprocessingOptions(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        """Crear un CSV sintético y un config.ini con otras reglas"""
+        cls.tmp_dir = tempfile.TemporaryDirectory()
+        cls.csv_path = write_vehicles_csv(os.path.join(cls.tmp_dir.name, 'vehicles.csv'), 4000)
+        cls.config_path = os.path.join(cls.tmp_dir.name, 'config.ini')
+        with open(cls.config_path, 'w', encoding='utf-8') as f:
+            f.write(
+                "[preprocessing]\n"
+                "min_price = 2000\n"
+                "price_outlier_quantile = 0.9\n"
+                "age_bins = [0, 10, 100]\n"
+                'age_labels = ["Joven", "Mayor"]\n'
+            )
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmp_dir.cleanup()
+
+    def test_options_from_config(self):
+        """Las reglas de [preprocessing] sustituyen a las fijas"""
+        options = preprocessing_options(load_config(self.config_path))
+        df = load_and_preprocess_data(self.csv_path, **options)
+        self.assertGreater(df['price'].min(), 2000)
+        self.assertListEqual(list(df['age_category'].cat.categories), ['Joven', 'Mayor'])
+        self.assertEqual(df['age_category'].isna().sum(), 0)
+
+    def test_defaults_match_config_ini(self):
+        """El config.ini del proyecto reproduce el comportamiento por defecto"""
+        project_config = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'config.ini')
+        options = preprocessing_options(load_config(project_config))
+        pd.testing.assert_frame_equal(
+            load_and_preprocess_data(self.csv_path, **options),
+            load_and_preprocess_data(self.csv_path),
+        )
+
+    def test_streaming_uses_options(self):
+        """La lectura por bloques aplica las mismas reglas"""
+        options = preprocessing_options(load_config(self.config_path))
+        expected = load_and_preprocess_data(self.csv_path, **options)
+        streamed = load_and_preprocess_data(self.csv_path, chunksize=1500, **options)
+        pd.testing.assert_frame_equal(_text_as_object(streamed, expected), expected)
+
+    def test_invalid_options(self):
+        """Etiquetas o cuantiles incoherentes se rechazan antes de leer"""
+        with self.assertRaises(ValueError):
+            load_and_preprocess_data(self.csv_path, age_bins=[0, 5, 100], age_labels=['a'])
+        with self.assertRaises(ValueError):
+            load_and_preprocess_data(self.csv_path, price_outlier_quantile=1.5)
+
+    def test_stage_events(self):
+        """Cada etapa notifica tiempo, filas y memoria, encadenando las filas"""
+        for chunksize, first in [(None, 'read'), (1500, 'read_blocks')]:
+            with self.subTest(chunksize=chunksize):
+                recorder = StageRecorder()
+                df = load_and_preprocess_data(self.csv_path, chunksize=chunksize, hook=recorder)
+                stages = [event['stage'] for event in recorder.events]
+                self.assertEqual(stages[0], first)
+                self.assertEqual(stages[-3:], ['trim_outliers', 'engineer_features', 'optimize_dtypes'])
+                self.assertEqual(recorder.events[0]['rows_out'], 4000)
+                self.assertEqual(recorder.events[-1]['rows_out'], len(df))
+                for previous, event in zip(recorder.events, recorder.events[1:]):
+                    self.assertLessEqual(event['rows_out'], previous['rows_out'])
+                self.assertTrue(all(event['seconds'] >= 0 for event in recorder.events))
+                self.assertGreater(recorder.events[0]['memory_after'], 0)
+
+
+class TestQuantileSketch(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        """Precios muy asimétricos: lognormal con una cola de Pareto"""
+        rng = np.random.default_rng(7)
+        body = rng.lognormal(9.0, 1.2, size=190_000)
+        tail = 30_000 * (1 + rng.pareto(1.5, size=10_000))
+        cls.prices = pd.Series(np.concatenate([body, tail]).round())
+        cls.groups = pd.Series(rng.choice(['a', 'b', 'c', 'd'], size=len(cls.prices), p=[0.7, 0.2, 0.09, 0.01]))
+
+    def test_quantiles_within_relative_error(self):
+        """Los cuantiles del sketch difieren menos de un 1 % de los exactos"""
+        for q in [0.01, 0.5, 0.9, 0.99, 0.999]:
+            with self.subTest(q=q):
+                exact = self.prices.quantile(q)
+                approx = column_quantile(self.prices, q, statistics='sketch')
+                self.assertLess(abs(approx - exact) / exact, SKETCH_RELATIVE_ACCURACY)
+
+    def test_group_medians_within_relative_error(self):
+        """Las medianas por grupo respetan el mismo error"""
+        sketch = QuantileSketch()
+        sketch.update(self.groups, self.prices)
+        exact = self.prices.groupby(self.groups).median()
+        relative = (sketch.median().sort_index() - exact).abs() / exact
+        self.assertLess(relative.max(), SKETCH_RELATIVE_ACCURACY)
+
+    def test_bounded_memory_and_merge(self):
+        """El tamaño depende de las cubetas, y dos mitades fusionadas dan el mismo sketch"""
+        whole, first, second = QuantileSketch(), QuantileSketch(), QuantileSketch()
+        whole.update(self.groups, self.prices)
+        half = len(self.prices) // 2
+        first.update(self.groups[:half], self.prices[:half])
+        second.update(self.groups[half:], self.prices[half:])
+        first.merge(second)
+        pd.testing.assert_series_equal(first.counts.sort_index(), whole.counts.sort_index())
+
+        gamma = (1 + SKETCH_RELATIVE_ACCURACY) / (1 - SKETCH_RELATIVE_ACCURACY)
+        buckets = np.log(self.prices.max() / self.prices[self.prices > 0].min()) / np.log(gamma) + 2
+        self.assertLessEqual(len(whole.counts), self.groups.nunique() * buckets)
+        with self.assertRaises(ValueError):
+            first.merge(QuantileSketch(relative_accuracy=0.05))
+
+    def test_pipeline_switch(self):
+        """`statistics='sketch'` se aproxima a la ruta exacta y es igual por bloques"""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            csv_path = write_vehicles_csv(os.path.join(tmp_dir, 'vehicles.csv'), 20000)
+            exact = load_and_preprocess_data(csv_path, odometer_method='age_median')
+            approx = load_and_preprocess_data(csv_path, odometer_method='age_median', statistics='sketch')
+            streamed = load_and_preprocess_data(csv_path, odometer_method='age_median',
+                                                statistics='sketch', chunksize=6000)
+            with self.assertRaises(ValueError):
+                load_and_preprocess_data(csv_path, statistics='tdigest')
+
+        self.assertAlmostEqual(len(approx) / len(exact), 1, delta=0.005)
+        common = exact.index.intersection(approx.index)
+        pd.testing.assert_series_equal(approx.loc[common, 'model_year'], exact.loc[common, 'model_year'])
+        odometer = exact.loc[common, 'odometer']
+        relative = (approx.loc[common, 'odometer'] - odometer).abs() / odometer.where(odometer > 0)
+        self.assertLess(relative.max(), SKETCH_RELATIVE_ACCURACY)
+        pd.testing.assert_frame_equal(streamed, approx)
+
+
 if __name__ == '__main__':
-    unittest.main()
\ No newline at end of file
+    unittest.main()
@@ -0,0 +1,101 @@
+import io
+import json
+import time
+import unittest
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.synthetic import make_vehicles_frame
+from src.diagnostics import DIAGNOSTIC_KINDS, SessionProfile, cache_report, column_memory
+from src.instrumentation import JsonLinesHook, timed
+
+
+class TestColumnMemory(unittest.TestCase):
+    def test_columns(self):
+        """Hay una fila por columna más el índice, ordenadas de mayor a menor y sumando el total"""
+        df = make_vehicles_frame(2000, seed=3)
+        table = column_memory(df)
+        self.assertSetEqual(set(table.index), set(df.columns) | {'(index)'})
+        self.assertTrue((np.diff(table['bytes']) <= 0).all())
+        self.assertEqual(table['bytes'].sum(), df.memory_usage(index=True, deep=True).sum())
+        self.assertAlmostEqual(table['share'].sum(), 1.0)
+        self.assertEqual(table.loc['model', 'dtype'], str(df['model'].dtype))
+
+    def test_text_is_counted(self):
+        """Las columnas de texto incluyen la memoria de las cadenas"""
+        df = pd.DataFrame({'text': ['x' * 100] * 10, 'number': np.arange(10)})
+        table = column_memory(df)
+        self.assertGreater(table.loc['text', 'bytes'], 1000)
+        self.assertEqual(table.index[0], 'text')
+
+
+class TestCacheReport(unittest.TestCase):
+    def test_report(self):
+        """Las cachés LRU dan una fila y `SectionCache` otra más una por sección"""
+        report = cache_report({
+            'aggregates': {'hits': 3, 'misses': 1, 'size': 1, 'maxsize': 128},
+            'sections': {'sections': {'metrics': {'hits': 1, 'misses': 1}, 'scatter': {'hits': 0, 'misses': 2}},
+                         'size': 3, 'maxsize': 64},
+            'table_view': {'hits': 0, 'misses': 0, 'size': 0, 'maxsize': 32},
+        })
+        self.assertListEqual(list(report.index),
+                             ['aggregates', 'sections', 'sections.metrics', 'sections.scatter', 'table_view'])
+        self.assertEqual(report.loc['aggregates', 'hit_rate'], 0.75)
+        self.assertEqual((report.loc['sections', 'hits'], report.loc['sections', 'misses']), (1, 3))
+        self.assertEqual(report.loc['sections.scatter', 'hit_rate'], 0.0)
+        self.assertTrue(np.isnan(report.loc['table_view', 'hit_rate']))
+
+
+class TestSessionProfile(unittest.TestCase):
+    def test_events_and_totals(self):
+        """Cada medición lleva el contexto y se suma al total de su tipo"""
+        profile = SessionProfile(session='abc', run=2)
+        with timed(profile, 'metrics', kind='filter'):
+            pass
+        with timed(profile, 'fig_odo', kind='chart'):
+            time.sleep(0.01)
+        frame = profile.to_frame()
+        self.assertListEqual(list(frame['stage']), ['metrics', 'fig_odo'])
+        self.assertTrue(all(event['session'] == 'abc' and event['run'] == 2 for event in profile.events))
+        totals = profile.totals()
+        self.assertSetEqual(set(totals), set(DIAGNOSTIC_KINDS))
+        self.assertGreaterEqual(totals['chart'], 0.01)
+        self.assertEqual(totals['aggregate'], 0.0)
+
+    def test_structured_log(self):
+        """Con un `JsonLinesHook` cada medición y el cierre de la ejecución son una línea JSON"""
+        stream = io.StringIO()
+        profile = SessionProfile(JsonLinesHook(stream), session='abc')
+        with timed(profile, 'manufacturer_stats', kind='aggregate'):
+            pass
+        profile.finish(memory={'price': 8000}, caches={'aggregates': {'hits': 1, 'misses': 0}})
+        lines = [json.loads(line) for line in stream.getvalue().splitlines()]
+        self.assertListEqual([line['stage'] for line in lines], ['manufacturer_stats', 'run'])
+        self.assertEqual(lines[1]['memory'], {'price': 8000})
+        self.assertEqual(lines[1]['session'], 'abc')
+        self.assertAlmostEqual(lines[1]['totals']['aggregate'], lines[0]['seconds'])
+        self.assertGreaterEqual(lines[1]['seconds'], lines[0]['seconds'])
+
+    def test_disabled_does_nothing(self):
+        """Sin perfil, `timed` ejecuta el bloque sin leer el reloj ni enviar eventos"""
+        ran = []
+        with mock.patch('src.instrumentation.time.perf_counter') as clock:
+            with timed(None, 'metrics', kind='filter'):
+                ran.append(True)
+            with self.assertRaises(KeyError):
+                with timed(None, 'metrics', kind='filter'):
+                    raise KeyError('price')
+        clock.assert_not_called()
+        self.assertListEqual(ran, [True])
+
+        profile = SessionProfile()
+        with mock.patch('src.instrumentation.time.perf_counter', side_effect=[1.0, 1.5]) as clock:
+            with timed(profile, 'metrics', kind='filter'):
+                pass
+        self.assertEqual(clock.call_count, 2)
+        self.assertEqual(profile.events, [{'stage': 'metrics', 'kind': 'filter', 'seconds': 0.5}])
+
+if __name__ == '__main__':
+    unittest.main()
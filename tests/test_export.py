@@ -0,0 +1,92 @@
+import gzip
+import io
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from src.export import EXCEL_MAX_ROWS, EXPORT_FORMATS, iter_export, write_export
+
+
+class TestExport(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        """Crear un DataFrame con tipos variados"""
+        n_rows = 1200
+        cls.df = pd.DataFrame({
+            'price': np.arange(n_rows) * 10,
+            'model': pd.Categorical(['ford f-150', 'honda civic'] * (n_rows // 2)),
+            'odometer': np.where(np.arange(n_rows) % 7 == 0, np.nan, 1000.0),
+            'is_4wd': np.arange(n_rows) % 2 == 0,
+            'date_posted': pd.date_range('2019-01-01', periods=n_rows, freq='H'),
+        })
+
+    def _export(self, fmt, chunk_rows=250):
+        buffer = io.BytesIO()
+        stats = write_export(self.df, fmt, buffer, chunk_rows=chunk_rows)
+        return buffer.getvalue(), stats
+
+    def test_csv_matches_to_csv(self):
+        """El CSV por bloques es idéntico a `to_csv` completo"""
+        data, stats = self._export('csv')
+        self.assertEqual(data, self.df.to_csv(index=False).encode('utf-8'))
+        self.assertEqual(stats.bytes_written, len(data))
+        self.assertEqual(stats.rows, len(self.df))
+        self.assertGreater(stats.bytes_per_second, 0)
+
+    def test_compressed_csv(self):
+        """El CSV comprimido se descomprime al mismo contenido"""
+        data, _ = self._export('csv.gz')
+        self.assertEqual(gzip.decompress(data), self.df.to_csv(index=False).encode('utf-8'))
+
+    def test_parquet_round_trip(self):
+        """El Parquet conserva valores y tipos"""
+        data, _ = self._export('parquet')
+        pd.testing.assert_frame_equal(pd.read_parquet(io.BytesIO(data)), self.df)
+
+    def test_excel_round_trip(self):
+        """El libro de Excel contiene todas las filas"""
+        data, _ = self._export('xlsx')
+        result = pd.read_excel(io.BytesIO(data))
+        self.assertEqual(list(result.columns), list(self.df.columns))
+        self.assertEqual(len(result), len(self.df))
+        np.testing.assert_array_equal(result['price'], self.df['price'])
+
+    def test_blocks_are_bounded(self):
+        """Ningún bloque CSV supera el tamaño de un bloque de filas"""
+        blocks = list(iter_export(self.df, 'csv', chunk_rows=100))
+        self.assertEqual(len(blocks), len(self.df) // 100)
+        full_size = len(self.df.to_csv(index=False))
+        self.assertLess(max(len(block) for block in blocks), full_size / 5)
+
+    def test_empty_and_unknown_format(self):
+        """Un DataFrame vacío exporta la cabecera y un formato desconocido falla"""
+        data = b''.join(iter_export(self.df.head(0), 'csv'))
+        self.assertEqual(data, self.df.head(0).to_csv(index=False).encode('utf-8'))
+        with self.assertRaises(ValueError):
+            list(iter_export(self.df, 'json'))
+        self.assertIn('xlsx', EXPORT_FORMATS)
+
+    def test_positions(self):
+        """Con posiciones se exportan esas filas, en su orden, igual que con `take`"""
+        positions = np.array([5, 3, 900, 0, 1199] * 60)
+        selection = self.df.take(positions)
+        buffer = io.BytesIO()
+        stats = write_export(self.df, 'csv', buffer, chunk_rows=70, positions=positions)
+        self.assertEqual(buffer.getvalue(), selection.to_csv(index=False).encode('utf-8'))
+        self.assertEqual(stats.rows, len(positions))
+        buffer = io.BytesIO()
+        write_export(self.df, 'parquet', buffer, chunk_rows=70, positions=positions)
+        pd.testing.assert_frame_equal(pd.read_parquet(io.BytesIO(buffer.getvalue())),
+                                      selection.reset_index(drop=True))
+
+    def test_excel_row_limit(self):
+        """Una exportación a Excel con más filas de las que admite una hoja falla sin escribir nada"""
+        buffer = io.BytesIO()
+        with self.assertRaises(ValueError):
+            write_export(self.df, 'xlsx', buffer, positions=np.zeros(EXCEL_MAX_ROWS, dtype=np.int64))
+        self.assertEqual(buffer.getvalue(), b'')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,178 @@
+import threading
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.synthetic import make_vehicles_frame
+from src.filters import FilterIndex, NameSearch
+
+
+class TestFilterIndex(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        """Crear un DataFrame con las columnas usadas por los filtros"""
+        df = make_vehicles_frame(5000, seed=2).dropna(subset=['model_year'])
+        df['model_year'] = df['model_year'].astype('int16')
+        df['manufacturer'] = df['model'].str.split().str[0].str.title()
+        df.loc[df.index[:10], 'condition'] = np.nan
+        cls.df = df.reset_index(drop=True)
+        cls.index = FilterIndex(cls.df)
+
+    def _expected(self, year_range, conditions, price_range=None, manufacturer='', search=''):
+        """Posiciones obtenidas con las máscaras booleanas del dashboard"""
+        df = self.df
+        mask = (
+            (df['model_year'] >= year_range[0]) &
+            (df['model_year'] <= year_range[1]) &
+            df['condition'].isin(conditions)
+        )
+        if price_range is not None:
+            mask &= (df['price'] >= price_range[0]) & (df['price'] <= price_range[1])
+        if manufacturer:
+            mask &= df['manufacturer'].str.contains(manufacturer, case=False)
+        if search:
+            mask &= (df['manufacturer'].str.contains(search, case=False, regex=False) |
+                     df['model'].str.contains(search, case=False, regex=False))
+        return np.flatnonzero(mask.to_numpy())
+
+    def _assert_same_rows(self, positions, expected):
+        np.testing.assert_array_equal(np.sort(positions), expected)
+
+    def test_year_and_condition(self):
+        """Rango de años y condiciones coinciden con las máscaras"""
+        for year_range, conditions in [((2005, 2012), ['good', 'excellent']),
+                                       ((2010, 2010), ['fair']),
+                                       ((1960, 2019), list(self.index.conditions))]:
+            with self.subTest(year_range=year_range, conditions=conditions):
+                self._assert_same_rows(
+                    self.index.query(year_range=year_range, conditions=conditions),
+                    self._expected(year_range, conditions),
+                )
+
+    def test_price_and_manufacturer(self):
+        """Precio y búsqueda por fabricante coinciden con las máscaras"""
+        conditions = ['good', 'like new', 'excellent']
+        positions = self.index.query(year_range=(2000, 2015), conditions=conditions,
+                                     price_range=(3000, 15000), manufacturer='FOR')
+        self._assert_same_rows(
+            positions, self._expected((2000, 2015), conditions, (3000, 15000), 'FOR')
+        )
+
+    def test_search_manufacturer_or_model(self):
+        """La búsqueda de texto coincide con fabricante o modelo como `str.contains`"""
+        conditions = list(self.index.conditions)
+        for search in ['ford', 'F-1', 'CAMRY', 'o', 'silverado 1500']:
+            with self.subTest(search=search):
+                self._assert_same_rows(
+                    self.index.query(year_range=(1960, 2019), conditions=conditions, search=search),
+                    self._expected((1960, 2019), conditions, search=search),
+                )
+
+    def test_empty_results(self):
+        """Las consultas sin coincidencias devuelven un array vacío"""
+        self.assertEqual(len(self.index.query(year_range=(1800, 1900))), 0)
+        self.assertEqual(len(self.index.query(conditions=[])), 0)
+        self.assertEqual(len(self.index.query(manufacturer='zzz')), 0)
+        self.assertEqual(len(self.index.query(search='zzz')), 0)
+
+    def test_select_returns_rows(self):
+        """`select` devuelve las filas del DataFrame original"""
+        selected = self.index.select(self.df, year_range=(2012, 2014), conditions=['good'])
+        self.assertTrue(selected['model_year'].between(2012, 2014).all())
+        self.assertTrue((selected['condition'] == 'good').all())
+        pd.testing.assert_frame_equal(selected, self.df.loc[selected.index])
+
+    def test_selection_keeps_positions(self):
+        """`selection` guarda posiciones y extrae sólo las columnas pedidas"""
+        filters = dict(year_range=(2012, 2014), conditions=['good'])
+        selection = self.index.selection(self.df, **filters)
+        selected = self.index.select(self.df, **filters)
+        self.assertEqual(len(selection), len(selected))
+        pd.testing.assert_series_equal(selection.column('price'), selected['price'])
+        pd.testing.assert_frame_equal(selection.frame(['price', 'odometer']),
+                                      selected[['price', 'odometer']])
+
+    def test_selection_is_deferred(self):
+        """La consulta de `selection` sólo se ejecuta al usar las posiciones"""
+        calls = []
+        index = FilterIndex(self.df)
+        query = index.query
+        index.query = lambda **filters: calls.append(filters) or query(**filters)
+        selection = index.selection(self.df, year_range=(2012, 2014))
+        self.assertEqual(calls, [])
+        self.assertGreater(len(selection), 0)
+        selection.column('price')
+        self.assertEqual(len(calls), 1)
+
+    def test_complete_selection_is_not_copied(self):
+        """Una selección con todas las filas devuelve las columnas originales"""
+        selection = self.index.selection(self.df)
+        self.assertTrue(selection.is_complete)
+        self.assertIs(selection.column('price'), self.df['price'])
+
+
+class TestNameSearch(unittest.TestCase):
+    def setUp(self):
+        """Crear una búsqueda sobre unos pocos modelos"""
+        self.search = NameSearch(
+            pd.Index(['ford f-150', 'ford focus', 'toyota camry', 'honda civic']),
+            pd.Index(['Ford', 'Ford', 'Toyota', 'Honda']),
+        )
+
+    def test_matches_names(self):
+        """Las coincidencias se indican por código desplazado, sin distinguir mayúsculas"""
+        np.testing.assert_array_equal(self.search.matches('FO'), [False, True, True, False, False])
+        np.testing.assert_array_equal(self.search.matches('civic'), [False, False, False, False, True])
+        np.testing.assert_array_equal(
+            self.search.matches('a', ['manufacturer']), [False, False, False, True, True]
+        )
+
+    def test_narrowed_search_matches_full_search(self):
+        """Ampliar una búsqueda guardada da el mismo resultado que buscar desde cero"""
+        typed = [self.search.matches(text)[1:].copy() for text in ['c', 'ca', 'cam', 'camr']]
+        fresh = NameSearch(
+            pd.Index(['ford f-150', 'ford focus', 'toyota camry', 'honda civic']),
+            pd.Index(['Ford', 'Ford', 'Toyota', 'Honda']),
+        )
+        for text, result in zip(['c', 'ca', 'cam', 'camr'], typed):
+            np.testing.assert_array_equal(result, fresh.matches(text)[1:])
+
+    def test_cache_info(self):
+        """Las búsquedas repetidas cuentan como aciertos y la caché respeta su tamaño"""
+        search = NameSearch(pd.Index(['ford f-150', 'honda civic']), pd.Index(['Ford', 'Honda']), maxsize=2)
+        for text in ['ford', 'ford', 'civic', 'honda']:
+            search.matches(text)
+        self.assertEqual(search.cache_info(), {'hits': 1, 'misses': 3, 'size': 2, 'maxsize': 2})
+
+    def test_concurrent_access(self):
+        """Varias sesiones pueden buscar a la vez aunque la caché expulse búsquedas"""
+        search = NameSearch(pd.Index(['ford f-150', 'ford focus', 'toyota camry', 'honda civic']),
+                            pd.Index(['Ford', 'Ford', 'Toyota', 'Honda']), maxsize=4)
+        expected = {text: search.matches(text).copy() for text in ['f', 'fo', 'c', 'ca', 'o', 'on']}
+        errors = []
+
+        def worker(offset):
+            try:
+                for value in range(300):
+                    text = list(expected)[(offset + value) % len(expected)]
+                    np.testing.assert_array_equal(search.matches(text), expected[text])
+            except Exception as error:
+                errors.append(error)
+
+        threads = [threading.Thread(target=worker, args=(offset,)) for offset in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(errors, [])
+        self.assertLessEqual(search.cache_info()['size'], 4)
+
+    def test_unknown_field(self):
+        """Un campo desconocido lanza ValueError"""
+        with self.assertRaises(ValueError):
+            self.search.matches('ford', ['color'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,108 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import pandas as pd
+
+from benchmarks.synthetic import write_vehicles_csv
+from src.aggregations import AggregateCache
+from src.data_processing import load_and_preprocess_data
+from src.incremental import ODOMETER_RESOLUTION, IncrementalDataset
+
+
+class TestIncrementalDataset(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        """Crear un histórico en varias entregas y su concatenación"""
+        cls.tmp_dir = tempfile.TemporaryDirectory()
+        cls.deliveries = [
+            write_vehicles_csv(os.path.join(cls.tmp_dir.name, f'vehicles_{day}.csv'), 3000, seed=day)
+            for day in range(4)
+        ]
+        cls.combined_path = os.path.join(cls.tmp_dir.name, 'combined.csv')
+        pd.concat([pd.read_csv(path) for path in cls.deliveries]).to_csv(cls.combined_path, index=False)
+        cls.full = load_and_preprocess_data(cls.combined_path, odometer_method='age_median')
+
+        cls.incremental = IncrementalDataset('age_median')
+        for path in cls.deliveries:
+            cls.incremental.append(path)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmp_dir.cleanup()
+
+    def test_single_append_matches_full(self):
+        """Un único anexo reproduce el procesamiento completo (odómetro redondeado)"""
+        dataset = IncrementalDataset('age_median')
+        dataset.append(self.combined_path)
+        result = dataset.dataset
+        pd.testing.assert_frame_equal(result.drop(columns='odometer'), self.full.drop(columns='odometer'))
+        self.assertLessEqual((result['odometer'] - self.full['odometer']).abs().max(),
+                             ODOMETER_RESOLUTION / 2)
+
+    def test_appends_agree_with_full(self):
+        """Varios anexos coinciden con el procesamiento completo dentro de una tolerancia"""
+        result = self.incremental.dataset
+        self.assertAlmostEqual(len(result) / len(self.full), 1, delta=0.01)
+        self.assertTrue(result.index.is_unique)
+
+        expected = AggregateCache(self.full).manufacturer_stats()
+        stats = self.incremental.aggregates().manufacturer_stats().reindex(expected.index)
+        relative = (stats[('price', 'mean')] - expected[('price', 'mean')]).abs() / expected[('price', 'mean')]
+        self.assertLess(relative.max(), 0.02)
+        self.assertEqual(self.incremental.cube['price_count'].sum(), len(result))
+
+    def test_version_changes_on_append(self):
+        """Cada anexo cambia la versión de los datos y la de sus agregados"""
+        dataset = IncrementalDataset('age_median')
+        dataset.append(self.deliveries[0])
+        first = dataset.version
+        dataset.append(self.deliveries[1])
+        self.assertNotEqual(dataset.version, first)
+        self.assertEqual(dataset.aggregates().version, dataset.version)
+        self.assertEqual(dataset.dataset.attrs['data_version'], dataset.version)
+
+    def test_save_and_resume(self):
+        """Un estado guardado y recuperado continúa igual que sin interrupción"""
+        state_dir = os.path.join(self.tmp_dir.name, 'state')
+        dataset = IncrementalDataset('age_median')
+        for path in self.deliveries[:2]:
+            dataset.append(path)
+        dataset.save(state_dir)
+
+        resumed = IncrementalDataset.load(state_dir)
+        for path in self.deliveries[2:]:
+            resumed.append(path)
+        resumed.save(state_dir)
+        pd.testing.assert_frame_equal(resumed.dataset, self.incremental.dataset)
+        self.assertEqual(resumed.version, self.incremental.version)
+        self.assertEqual(IncrementalDataset.load(state_dir).version, resumed.version)
+
+    def test_failed_append_keeps_state(self):
+        """Si una etapa del anexo falla, los conteos, las filas y el cubo no cambian"""
+        dataset = IncrementalDataset('age_median')
+        dataset.append(self.deliveries[0])
+        counts = {name: group_counts.counts for name, group_counts in dataset.counts.items()}
+        rows, cube, version = dataset.rows, dataset.cube, dataset.version
+        with mock.patch('src.incremental._optimize_dtypes', side_effect=RuntimeError('fallo')):
+            with self.assertRaises(RuntimeError):
+                dataset.append(self.deliveries[1])
+        for name, group_counts in dataset.counts.items():
+            with self.subTest(counts=name):
+                self.assertIs(group_counts.counts, counts[name])
+        self.assertEqual((dataset.rows, dataset.version, len(dataset.parts)), (rows, version, 1))
+        self.assertIs(dataset.cube, cube)
+
+        for path in self.deliveries[1:]:
+            dataset.append(path)
+        pd.testing.assert_frame_equal(dataset.dataset, self.incremental.dataset)
+
+    def test_interpolation_is_rejected(self):
+        """La interpolación depende del orden global y no es incremental"""
+        with self.assertRaises(ValueError):
+            IncrementalDataset('interpolate')
+
+
+if __name__ == '__main__':
+    unittest.main()
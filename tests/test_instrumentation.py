@@ -0,0 +1,122 @@
+import io
+import json
+import logging
+import os
+import tempfile
+import unittest
+
+import pandas as pd
+
+from src.instrumentation import (
+    JsonLinesHook,
+    LoggingHook,
+    StageRecorder,
+    combine_hooks,
+    memory_bytes,
+    run_stage,
+    timed,
+)
+
+
+def _drop_half(df):
+    return df.iloc[:len(df) // 2]
+
+
+class TestRunStage(unittest.TestCase):
+    def setUp(self):
+        self.df = pd.DataFrame({'a': range(100), 'b': ['x'] * 100})
+
+    def test_without_hook(self):
+        """Sin hook sólo se llama a la función"""
+        result = run_stage(None, 'half', _drop_half, self.df)
+        self.assertEqual(len(result), 50)
+
+    def test_event(self):
+        """El evento describe filas, memoria y tiempo de la etapa"""
+        recorder = StageRecorder()
+        result = run_stage(recorder, 'half', _drop_half, self.df)
+        event = recorder.events[0]
+        self.assertEqual(event['stage'], 'half')
+        self.assertEqual((event['rows_in'], event['rows_out']), (100, 50))
+        self.assertEqual(event['memory_before'], memory_bytes(self.df))
+        self.assertEqual(event['memory_after'], memory_bytes(result))
+        self.assertLess(event['memory_delta'], 0)
+        self.assertGreaterEqual(event['seconds'], 0)
+
+    def test_path_input(self):
+        """Una ruta de archivo como entrada cuenta como cero filas"""
+        recorder = StageRecorder()
+        run_stage(recorder, 'read', lambda path: self.df, 'vehicles.csv')
+        self.assertEqual(recorder.events[0]['rows_in'], 0)
+        self.assertEqual(recorder.events[0]['memory_before'], 0)
+
+
+class TestTimed(unittest.TestCase):
+    def test_without_hook(self):
+        """Sin hook el bloque se ejecuta sin enviar eventos"""
+        with timed(None, 'metrics', kind='filter'):
+            value = 1
+        self.assertEqual(value, 1)
+
+    def test_event(self):
+        """El evento lleva el nombre, los segundos y los campos adicionales"""
+        recorder = StageRecorder()
+        with timed(recorder, 'metrics', kind='filter'):
+            pass
+        self.assertEqual(len(recorder.events), 1)
+        event = recorder.events[0]
+        self.assertEqual((event['stage'], event['kind']), ('metrics', 'filter'))
+        self.assertGreaterEqual(event['seconds'], 0)
+
+    def test_error(self):
+        """Si el bloque falla la excepción se propaga y no se envía ningún evento"""
+        recorder = StageRecorder()
+        with self.assertRaises(ValueError):
+            with timed(recorder, 'metrics'):
+                raise ValueError('fallo')
+        self.assertEqual(recorder.events, [])
+
+
+class TestHooks(unittest.TestCase):
+    event = {'stage': 'read', 'seconds': 0.5, 'rows_in': 0, 'rows_out': 10,
+             'memory_before': 0, 'memory_after': 2 ** 20, 'memory_delta': 2 ** 20}
+
+    def test_json_lines_file(self):
+        """Cada evento se añade como una línea JSON"""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, 'stages.jsonl')
+            hook = JsonLinesHook(path)
+            hook(self.event)
+            hook(self.event)
+            with open(path, encoding='utf-8') as f:
+                lines = [json.loads(line) for line in f]
+        self.assertEqual(len(lines), 2)
+        self.assertEqual(lines[0]['stage'], 'read')
+        self.assertIn('timestamp', lines[0])
+
+    def test_json_lines_stream(self):
+        """También se puede escribir en un objeto de texto abierto"""
+        stream = io.StringIO()
+        JsonLinesHook(stream)(self.event)
+        self.assertEqual(json.loads(stream.getvalue())['rows_out'], 10)
+
+    def test_logging(self):
+        """El hook de logging escribe una línea por etapa"""
+        logger = logging.getLogger('test.instrumentation')
+        with self.assertLogs(logger, level='INFO') as logs:
+            LoggingHook(logger)(self.event)
+        self.assertIn('read: 0.500 s, 0 -> 10 filas, +1.0 MB', logs.output[0])
+
+    def test_combine(self):
+        """Los eventos se reparten entre todos los hooks"""
+        first, second = StageRecorder(), StageRecorder()
+        hook = combine_hooks(first, None, second)
+        hook(self.event)
+        self.assertEqual(len(first.events), 1)
+        self.assertEqual(len(second.events), 1)
+        self.assertIsNone(combine_hooks(None))
+        self.assertIs(combine_hooks(first), first)
+
+
+if __name__ == '__main__':
+    unittest.main()
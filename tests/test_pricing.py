@@ -0,0 +1,144 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.synthetic import write_vehicles_csv
+from src.data_processing import load_and_preprocess_data
+from src.pricing import PRICE_QUANTILES, KDTree, PriceEstimator
+
+
+def brute_force(points, queries, k):
+    """Distancias (al cuadrado) de los k vecinos más cercanos recorriendo todos los puntos"""
+    distances = ((queries[:, None, :] - points[None, :, :]) ** 2).sum(axis=2)
+    return np.sort(distances, axis=1)[:, :k]
+
+
+class TestKDTree(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(4)
+        self.points = rng.normal(size=(3000, 5)).astype(np.float32)
+        self.queries = rng.normal(size=(200, 5)).astype(np.float32)
+
+    def test_matches_brute_force(self):
+        """Los vecinos coinciden con los de la búsqueda exhaustiva para varios k y tamaños de hoja"""
+        for leaf_size in (8, 64, 128):
+            for k in (1, 10, 150):
+                with self.subTest(leaf_size=leaf_size, k=k):
+                    distances, positions = KDTree(self.points, leaf_size).query(self.queries, k)
+                    expected = brute_force(self.points, self.queries, k)
+                    np.testing.assert_allclose(distances ** 2, expected, rtol=1e-4, atol=1e-5)
+                    found = ((self.points[positions] - self.queries[:, None, :]) ** 2).sum(axis=2)
+                    np.testing.assert_allclose(found, expected, rtol=1e-4, atol=1e-5)
+
+    def test_input_is_not_modified(self):
+        """Construir el árbol no reordena la matriz recibida (tampoco en orden de Fortran)"""
+        points = np.asfortranarray(self.points)
+        KDTree(points, leaf_size=16)
+        np.testing.assert_array_equal(points, self.points)
+
+    def test_repeated_points(self):
+        """Los puntos repetidos se reparten entre hojas y se encuentran todos"""
+        points = np.repeat(self.points[:5], 100, axis=0)
+        distances, positions = KDTree(points, leaf_size=16).query(self.points[:1], k=100)
+        np.testing.assert_array_equal(distances, 0)
+        self.assertEqual(len(set(positions[0])), 100)
+
+    def test_invalid_k(self):
+        """Un k fuera de rango lanza ValueError"""
+        tree = KDTree(self.points[:20])
+        for k in (0, 21):
+            with self.assertRaises(ValueError):
+                tree.query(self.queries, k)
+
+
+class TestPriceEstimator(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        """Procesar un CSV sintético y separar un 10 % de los anuncios para validar"""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            csv_path = write_vehicles_csv(os.path.join(tmp_dir, 'vehicles.csv'), 20000, seed=8)
+            df = load_and_preprocess_data(csv_path)
+        # En los datos sintéticos el precio es casi todo ruido; aquí depende de las características
+        rng = np.random.default_rng(1)
+        df['price'] = (40000 * np.exp(-df['age'] / 8) * (0.8 + 0.1 * df['condition_score'])
+                       * rng.lognormal(0, 0.1, size=len(df))).round()
+        holdout = np.random.default_rng(0).random(len(df)) < 0.1
+        cls.df = df[~holdout].reset_index(drop=True)
+        cls.holdout = df[holdout]
+        cls.estimator = PriceEstimator(cls.df, k=10)
+
+    def test_neighbors_share_manufacturer_and_type(self):
+        """Los comparables son los más cercanos entre los anuncios del mismo fabricante y tipo"""
+        listings = self.holdout.head(50)
+        distances, positions = self.estimator.neighbors(listings)
+        for row, (_, listing) in enumerate(listings.iterrows()):
+            same = ((self.df['manufacturer'] == listing['manufacturer'])
+                    & (self.df['type'] == listing['type'])).to_numpy()
+            self.assertTrue(same[positions[row]].all())
+            points = self.estimator.features[same]
+            query = self.estimator.feature_matrix(listings.iloc[[row]])
+            np.testing.assert_allclose(distances[row] ** 2, brute_force(points, query, 10)[0],
+                                       rtol=1e-4, atol=1e-5)
+
+    def test_unknown_category_uses_all_listings(self):
+        """Un fabricante desconocido busca sus comparables entre todos los anuncios"""
+        listing = self.holdout.head(1).assign(manufacturer='desconocido')
+        distances, _ = self.estimator.neighbors(listing)
+        query = self.estimator.feature_matrix(listing)
+        np.testing.assert_allclose(distances[0] ** 2, brute_force(self.estimator.features, query, 10)[0],
+                                   rtol=1e-4, atol=1e-5)
+
+    def test_model_year_and_condition_inputs(self):
+        """`model_year` y `condition` dan las mismas características que `age` y `condition_score`"""
+        listings = self.holdout.head(20)
+        raw = listings[['manufacturer', 'type', 'odometer', 'cylinders', 'is_4wd', 'condition']].assign(
+            model_year=self.estimator.reference_year - listings['age'])
+        np.testing.assert_array_equal(self.estimator.feature_matrix(raw),
+                                      self.estimator.feature_matrix(listings))
+
+    def test_prediction_beats_global_median(self):
+        """Con anuncios no vistos, la estimación se equivoca menos que la mediana global"""
+        prediction = self.estimator.predict(self.holdout)
+        self.assertListEqual(list(prediction.columns), list(PRICE_QUANTILES))
+        self.assertTrue((prediction['price_low'] <= prediction['price_estimate']).all())
+        self.assertTrue((prediction['price_estimate'] <= prediction['price_high']).all())
+        error = (prediction['price_estimate'] - self.holdout['price']).abs().mean()
+        baseline = (self.df['price'].median() - self.holdout['price']).abs().mean()
+        self.assertLess(error, baseline / 2)
+
+    def test_similar(self):
+        """`similar` devuelve los comparables de un anuncio descrito con un diccionario (sin distinguir mayúsculas)"""
+        listing = {'manufacturer': 'FORD', 'type': 'pickup', 'model_year': 2012, 'odometer': 90000,
+                   'condition': 'good', 'cylinders': 8, 'is_4wd': True}
+        positions, distances = self.estimator.similar(listing, k=5)
+        self.assertEqual(len(positions), 5)
+        self.assertTrue((np.diff(distances) >= 0).all())
+        self.assertTrue((self.df['manufacturer'].iloc[positions] == 'Ford').all())
+        self.assertTrue((self.df['type'].iloc[positions] == 'pickup').all())
+
+    def test_batch_matches_single_listings(self):
+        """Valorar por lotes da lo mismo que valorar cada anuncio por separado"""
+        listings = self.holdout.head(25)
+        batch = self.estimator.predict(listings)
+        single = pd.concat([self.estimator.predict(listings.iloc[[row]]) for row in range(len(listings))])
+        pd.testing.assert_frame_equal(batch, single)
+
+    def test_mixed_case_categories(self):
+        """Las categorías que sólo difieren en mayúsculas forman un mismo grupo"""
+        df = self.df.assign(manufacturer=self.df['manufacturer'].astype(str))
+        ford = (df['manufacturer'] == 'Ford').to_numpy()
+        df.loc[ford & (np.arange(len(df)) % 2 == 0), 'manufacturer'] = 'ford'
+        estimator = PriceEstimator(df, k=10)
+        self.assertEqual(len(estimator.categories['manufacturer']), df['manufacturer'].str.lower().nunique())
+        listing = {'manufacturer': 'FORD', 'type': 'pickup', 'model_year': 2012, 'odometer': 90000,
+                   'condition': 'good', 'cylinders': 8, 'is_4wd': True}
+        positions, _ = estimator.similar(listing, k=10)
+        self.assertTrue(ford[positions].all())
+        np.testing.assert_array_equal(positions, self.estimator.similar(listing, k=10)[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+import threading
+import unittest
+
+from src.sections import SectionCache
+
+
+class TestSectionCache(unittest.TestCase):
+    def setUp(self):
+        self.cache = SectionCache(maxsize=3)
+        self.calls = []
+
+    def _compute(self, value):
+        def compute():
+            self.calls.append(value)
+            return value * 2
+        return compute
+
+    def test_results_are_keyed_by_section_inputs(self):
+        """Cada sección sólo se recalcula cuando cambian sus propias entradas"""
+        self.assertEqual(self.cache.get('metrics', ('v1', (2000, 2010)), self._compute(1)), 2)
+        self.assertEqual(self.cache.get('metrics', ('v1', (2000, 2010)), self._compute(1)), 2)
+        self.assertEqual(self.cache.get('scatter', ('v1', (2000, 2010)), self._compute(2)), 4)
+        self.assertEqual(self.cache.get('metrics', ('v1', (2005, 2010)), self._compute(3)), 6)
+        self.assertEqual(self.calls, [1, 2, 3])
+        info = self.cache.cache_info()
+        self.assertEqual(info['sections']['metrics'], {'hits': 1, 'misses': 2})
+        self.assertEqual(info['sections']['scatter'], {'hits': 0, 'misses': 1})
+
+    def test_lru_eviction(self):
+        """La caché conserva como mucho `maxsize` resultados, descartando el menos usado"""
+        for value in range(3):
+            self.cache.get('metrics', value, self._compute(value))
+        self.cache.get('metrics', 0, self._compute(0))
+        self.cache.get('metrics', 3, self._compute(3))
+        self.assertEqual(len(self.cache), 3)
+        self.cache.get('metrics', 1, self._compute(1))
+        self.assertEqual(self.calls, [0, 1, 2, 3, 1])
+
+    def test_invalidate_one_section(self):
+        """`invalidate` elimina sólo los resultados de la sección indicada"""
+        self.cache.get('metrics', 1, self._compute(1))
+        self.cache.get('scatter', 1, self._compute(2))
+        self.cache.invalidate('metrics')
+        self.cache.get('metrics', 1, self._compute(1))
+        self.cache.get('scatter', 1, self._compute(2))
+        self.assertEqual(self.calls, [1, 2, 1])
+        self.cache.invalidate()
+        self.assertEqual(len(self.cache), 0)
+
+    def test_concurrent_access(self):
+        """Varias sesiones pueden pedir resultados a la vez"""
+        cache = SectionCache(maxsize=8)
+        results = []
+
+        def worker(offset):
+            for value in range(50):
+                results.append(cache.get('metrics', (offset + value) % 10, lambda: 1))
+
+        threads = [threading.Thread(target=worker, args=(offset,)) for offset in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(results, [1] * 200)
+        self.assertLessEqual(len(cache), 8)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,84 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.synthetic import write_vehicles_csv
+from src.aggregations import AggregateCache
+from src.data_processing import load_and_preprocess_data
+from src.filters import FilterIndex
+from src.shared import attach_dataset, publish_dataset, shared_dataset, shared_path
+from src.table import TableView
+
+
+class TestSharedDataset(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        """Procesar un CSV sintético con algunos odómetros nulos"""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            csv_path = write_vehicles_csv(os.path.join(tmp_dir, 'vehicles.csv'), 3000, seed=6)
+            cls.df = load_and_preprocess_data(csv_path)
+        cls.df.loc[cls.df.index[:5], 'odometer'] = np.nan
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.directory = self.tmp_dir.name
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_round_trip(self):
+        """Los datos publicados se leen con el mismo contenido, tipos, índice y versión"""
+        path = publish_dataset(self.df, self.directory, 'v1')
+        attached = attach_dataset(path)
+        pd.testing.assert_frame_equal(attached, self.df)
+        self.assertEqual(attached.attrs['data_version'], 'v1')
+
+    def test_columns_are_mapped_without_copy(self):
+        """Las columnas numéricas y categóricas apuntan al archivo mapeado"""
+        attached = attach_dataset(publish_dataset(self.df, self.directory, 'v1'))
+        for column in ['price', 'odometer', 'model_year', 'date_posted', 'model', 'condition']:
+            with self.subTest(column=column):
+                values = attached[column]
+                array = (values.cat.codes if isinstance(values.dtype, pd.CategoricalDtype)
+                         else values).to_numpy()
+                self.assertFalse(array.flags.owndata)
+                self.assertFalse(array.flags.writeable)
+
+    def test_publish_once_and_attach(self):
+        """`shared_dataset` sólo genera los datos si la versión no está publicada"""
+        calls = []
+
+        def load():
+            calls.append(1)
+            return self.df
+
+        first = shared_dataset(self.directory, 'v1', load)
+        second = shared_dataset(self.directory, 'v1', load)
+        self.assertEqual(len(calls), 1)
+        pd.testing.assert_frame_equal(first, second)
+
+        shared_dataset(self.directory, 'v2', load)
+        self.assertEqual(len(calls), 2)
+        self.assertFalse(os.path.exists(shared_path(self.directory, 'v1')))
+        self.assertTrue(os.path.exists(shared_path(self.directory, 'v2')))
+
+    def test_derived_structures_on_read_only_data(self):
+        """Índice de filtros, tabla y agregados funcionan sobre los datos de sólo lectura"""
+        attached = attach_dataset(publish_dataset(self.df, self.directory, 'v1'))
+        filters = dict(year_range=(2005, 2015), conditions=['good', 'excellent'])
+        np.testing.assert_array_equal(
+            np.sort(FilterIndex(attached).query(**filters)),
+            np.sort(FilterIndex(self.df).query(**filters)),
+        )
+        positions = np.arange(0, len(attached), 3)
+        pd.testing.assert_frame_equal(TableView(attached).page(positions, 1, 20, 'price'),
+                                      TableView(self.df).page(positions, 1, 20, 'price'))
+        pd.testing.assert_frame_equal(AggregateCache(attached).manufacturer_stats(**filters),
+                                      AggregateCache(self.df).manufacturer_stats(**filters))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.synthetic import make_vehicles_frame
+from src.table import TableView
+
+
+class TestTableView(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        """Crear un DataFrame con nulos y valores repetidos"""
+        df = make_vehicles_frame(3000, seed=4)
+        df['condition'] = df['condition'].astype('category')
+        cls.df = df.set_index(df.index * 10)
+        cls.view = TableView(cls.df)
+        rng = np.random.default_rng(0)
+        cls.positions = np.sort(rng.choice(len(df), size=1200, replace=False))
+
+    def test_unsorted_page_keeps_selection_order(self):
+        """Sin ordenación la página es un tramo de la selección"""
+        page = self.view.page(self.positions, number=2, page_size=100)
+        pd.testing.assert_frame_equal(page, self.df.take(self.positions[200:300]))
+
+    def test_sorted_pages_match_sort_values(self):
+        """Las páginas ordenadas coinciden con `sort_values` de la selección"""
+        selection = self.df.take(self.positions)
+        for column, ascending in [('price', True), ('price', False), ('odometer', True),
+                                  ('odometer', False), ('condition', True), ('model', False)]:
+            expected = selection.sort_values(column, ascending=ascending, kind='stable',
+                                             na_position='last')
+            for number in (0, 3, 11):
+                with self.subTest(column=column, ascending=ascending, number=number):
+                    page = self.view.page(self.positions, number, 100, column, ascending)
+                    expected_page = expected.iloc[number * 100:(number + 1) * 100]
+                    self.assertEqual(len(page), len(expected_page))
+                    pd.testing.assert_series_equal(page[column].reset_index(drop=True),
+                                                   expected_page[column].reset_index(drop=True))
+
+    def test_page_past_the_end(self):
+        """Una página fuera de rango está vacía y el recuento de páginas es al menos uno"""
+        self.assertEqual(len(self.view.page(self.positions, 12, 100, 'price')), 0)
+        self.assertEqual(TableView.page_count(1200, 100), 12)
+        self.assertEqual(TableView.page_count(1201, 100), 13)
+        self.assertEqual(TableView.page_count(0, 100), 1)
+
+    def test_describe_matches_pandas(self):
+        """`describe` coincide con `DataFrame.describe()` de la selección"""
+        expected = self.df.take(self.positions).describe()
+        pd.testing.assert_frame_equal(self.view.describe(self.positions), expected)
+
+    def test_describe_is_cached_by_key(self):
+        """Los resúmenes con la misma clave se sirven desde la caché"""
+        view = TableView(self.df)
+        first = view.describe(self.positions, key=('consulta', 1))
+        second = view.describe(self.positions, key=('consulta', 1))
+        self.assertIs(first, second)
+        self.assertEqual(view.cache_info()['hits'], 1)
+        empty = view.describe(np.array([], dtype=np.int64), columns=['price'])
+        self.assertEqual(empty.loc['count', 'price'], 0)
+        self.assertTrue(np.isnan(empty.loc['mean', 'price']))
+
+
+if __name__ == '__main__':
+    unittest.main()
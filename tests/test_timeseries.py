@@ -0,0 +1,87 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.synthetic import write_vehicles_csv
+from src.aggregations import AggregateCache
+from src.data_processing import load_and_preprocess_data
+from src.timeseries import MISSING_DAY, TimeSeriesStore, day_numbers
+
+# Periodo de pandas equivalente a cada granularidad
+PERIODS = {'day': 'D', 'week': 'W', 'month': 'M'}
+
+
+class TestTimeSeriesStore(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        """Procesar un CSV sintético y construir el almacén"""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            csv_path = write_vehicles_csv(os.path.join(tmp_dir, 'vehicles.csv'), 4000, seed=11)
+            cls.df = load_and_preprocess_data(csv_path)
+        cls.store = TimeSeriesStore(cls.df)
+
+    def _expected(self, granularity, year_range=None, conditions=None):
+        df = self.df
+        if year_range is not None:
+            df = df[df['model_year'].between(*year_range)]
+        if conditions is not None:
+            df = df[df['condition'].isin(conditions)]
+        period = df['date_posted'].dt.to_period(PERIODS[granularity]).dt.start_time.rename('period')
+        stats = df.groupby(period).agg(price_mean=('price', 'mean'), price_count=('price', 'count'),
+                                       condition_score=('condition_score', 'mean'))
+        return stats.reset_index()
+
+    def test_trend_matches_groupby(self):
+        """Cada granularidad coincide con agrupar las filas filtradas por periodo"""
+        filters = [{}, {'year_range': (2005, 2015)},
+                   {'year_range': (2000, 2018), 'conditions': ['good', 'excellent']}]
+        for granularity in PERIODS:
+            for kwargs in filters:
+                with self.subTest(granularity=granularity, **kwargs):
+                    pd.testing.assert_frame_equal(self.store.trend(granularity, **kwargs),
+                                                  self._expected(granularity, **kwargs),
+                                                  check_dtype=False)
+
+    def test_monthly_trend_matches_aggregates(self):
+        """La tendencia mensual da los mismos valores que `AggregateCache.monthly_stats`"""
+        filters = dict(year_range=(2000, 2018), conditions=['good', 'like new'])
+        trend = self.store.trend('month', **filters)
+        monthly = AggregateCache(self.df).monthly_stats(**filters)
+        self.assertEqual(trend['period'].dt.strftime('%Y-%m').tolist(), monthly['year_month'].tolist())
+        np.testing.assert_allclose(trend['price_mean'], monthly['price_mean'])
+        np.testing.assert_array_equal(trend['price_count'], monthly['price_count'])
+
+    def test_weeks_start_on_monday(self):
+        """Las semanas empiezan en lunes"""
+        self.assertTrue((self.store.trend('week')['period'].dt.dayofweek == 0).all())
+
+    def test_empty_selection(self):
+        """Una selección sin anuncios da una tabla vacía con las mismas columnas"""
+        trend = self.store.trend('month', conditions=['inexistente'])
+        self.assertEqual(len(trend), 0)
+        self.assertEqual(list(trend.columns), ['period', 'price_mean', 'price_count', 'condition_score'])
+
+    def test_invalid_granularity(self):
+        """Una granularidad desconocida lanza ValueError"""
+        with self.assertRaises(ValueError):
+            self.store.trend('year')
+
+    def test_day_numbers(self):
+        """Las fechas se convierten a días desde 1970 en int32 y las nulas a `MISSING_DAY`"""
+        days = day_numbers(pd.Series(pd.to_datetime(['1970-01-01', '2019-01-31', None, '1969-12-31'])))
+        self.assertEqual(days.dtype, np.int32)
+        np.testing.assert_array_equal(days, [0, 17927, MISSING_DAY, -1])
+
+    def test_rows_without_date_are_skipped(self):
+        """Las filas sin fecha de publicación no cuentan en ninguna serie"""
+        df = self.df.copy()
+        df.loc[df.index[:10], 'date_posted'] = pd.NaT
+        store = TimeSeriesStore(df)
+        self.assertEqual(store.trend('day')['price_count'].sum(), len(df) - 10)
+
+
+if __name__ == '__main__':
+    unittest.main()
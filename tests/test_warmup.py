@@ -0,0 +1,149 @@
+import functools
+import os
+import tempfile
+import threading
+import time
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.synthetic import write_vehicles_csv
+from src.aggregations import AggregateCache
+from src.data_processing import load_and_preprocess_data
+from src.filters import FilterIndex, Selection
+from src.warmup import (
+    SNAPSHOT_FILE,
+    BackgroundLoader,
+    build_snapshot,
+    failed_load,
+    read_snapshot,
+    summary_metrics,
+    write_snapshot,
+)
+
+
+class TestSnapshot(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        """Procesar un CSV sintético"""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            csv_path = write_vehicles_csv(os.path.join(tmp_dir, 'vehicles.csv'), 3000, seed=8)
+            cls.df = load_and_preprocess_data(csv_path)
+        cls.df.attrs['data_version'] = 'v1'
+
+    def test_round_trip(self):
+        """El resumen se escribe y se lee con las métricas e histogramas del conjunto completo"""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = write_snapshot(build_snapshot(self.df, nbins=20), os.path.join(tmp_dir, SNAPSHOT_FILE))
+            snapshot = read_snapshot(path)
+        self.assertEqual(snapshot['data_version'], 'v1')
+        self.assertEqual(snapshot['metrics'], summary_metrics(Selection(self.df, np.arange(len(self.df)))))
+        self.assertEqual(snapshot['metrics']['rows'], len(self.df))
+        self.assertEqual(int(snapshot['histograms']['price']['count'].sum()), len(self.df))
+        self.assertEqual(len(snapshot['histograms']['odometer']), 20)
+        self.assertEqual(sum(snapshot['manufacturers'].values()),
+                         int(self.df['manufacturer'].value_counts().head(10).sum()))
+
+    def test_missing_snapshot(self):
+        """Sin resumen guardado `read_snapshot` devuelve None"""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            self.assertIsNone(read_snapshot(os.path.join(tmp_dir, SNAPSHOT_FILE)))
+
+
+class TestBackgroundLoader(unittest.TestCase):
+    def test_steps_progress_and_results(self):
+        """Los pasos se ejecutan en orden y el progreso incluye sus etapas internas"""
+        release = threading.Event()
+
+        def load(results, hook):
+            hook({'stage': 'read', 'seconds': 0.0})
+            release.wait(5)
+            return 3
+
+        loader = BackgroundLoader([('data', load),
+                                   ('double', lambda results, hook: results['data'] * 2)]).start()
+        while not loader.progress()['events']:
+            time.sleep(0.001)
+        progress = loader.progress()
+        self.assertFalse(loader.done)
+        self.assertEqual(progress['current'], 'data')
+        self.assertEqual(progress['completed'], 0)
+        self.assertEqual(progress['events'][0]['stage'], 'read')
+        self.assertEqual(progress['events'][0]['step'], 'data')
+
+        release.set()
+        self.assertTrue(loader.wait(5))
+        self.assertEqual(loader.result('double'), 6)
+        progress = loader.progress()
+        self.assertEqual((progress['completed'], progress['total'], progress['fraction']), (2, 2, 1.0))
+        self.assertEqual([event['stage'] for event in progress['events']], ['read', 'data', 'double'])
+
+    def test_error_is_reported(self):
+        """Un error en un paso detiene la carga y se devuelve al pedir los resultados"""
+        def fail(results, hook):
+            raise ValueError('CSV dañado')
+
+        loader = BackgroundLoader([('data', fail), ('never', lambda results, hook: 1)]).start()
+        loader.wait(5)
+        self.assertIn('CSV dañado', loader.progress()['error'])
+        with self.assertRaises(RuntimeError):
+            loader.result('data')
+        self.assertNotIn('never', loader.results)
+
+    def test_retry_after_error(self):
+        """Un cargador fallido se descarta de la caché y el siguiente intento vuelve a cargar"""
+        attempts = []
+
+        def load(results, hook):
+            attempts.append(1)
+            if len(attempts) == 1:
+                raise OSError('CSV bloqueado')
+            return 3
+
+        # Como `st.cache_resource`, `lru_cache` guarda el cargador aunque falle
+        cached = functools.lru_cache(maxsize=None)(lambda: BackgroundLoader([('data', load)]).start())
+        loader = cached()
+        loader.wait(5)
+        self.assertIs(cached(), loader)
+        self.assertIn('CSV bloqueado', failed_load(loader, cached.cache_clear))
+
+        retry = cached()
+        self.assertIsNot(retry, loader)
+        retry.wait(5)
+        self.assertIsNone(failed_load(retry, cached.cache_clear))
+        self.assertIs(cached(), retry)
+        self.assertEqual(retry.result('data'), 3)
+        self.assertEqual(len(attempts), 2)
+
+    def test_snapshot_before_load(self):
+        """El progreso y el resumen se pueden leer mientras la carga sigue en marcha"""
+        release = threading.Event()
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            csv_path = write_vehicles_csv(os.path.join(tmp_dir, 'vehicles.csv'), 3000, seed=9)
+            snapshot_path = os.path.join(tmp_dir, SNAPSHOT_FILE)
+            write_snapshot(build_snapshot(load_and_preprocess_data(csv_path)), snapshot_path)
+
+            def load(results, hook):
+                release.wait(5)
+                return load_and_preprocess_data(csv_path, hook=hook)
+
+            loader = BackgroundLoader([
+                ('data', load),
+                ('filter_index', lambda results, hook: FilterIndex(results['data'])),
+                ('aggregates', lambda results, hook: AggregateCache(results['data'])),
+            ]).start()
+            # Primera pintura: progreso y resumen precalculado
+            progress = loader.progress()
+            snapshot = read_snapshot(snapshot_path)
+            self.assertFalse(loader.done)
+            release.set()
+            self.assertTrue(loader.wait(60))
+
+        self.assertIsNone(progress['error'])
+        self.assertEqual(progress['completed'], 0)
+        self.assertEqual(snapshot['metrics']['rows'], len(loader.result('data')))
+        self.assertIsInstance(snapshot['histograms']['price'], pd.DataFrame)
+
+if __name__ == '__main__':
+    unittest.main()